@@ -0,0 +1,134 @@
+"""
+Exécution asynchrone des actions de présentation
+
+L'injection de touches (pyautogui) peut prendre des centaines de
+millisecondes (pauses entre appels, boîte de dialogue "Aller à la slide").
+Les actions sont donc placées dans une file servie par un thread dédié :
+la boucle de détection ne fait qu'ajouter un élément à la file.
+"""
+import time
+from collections import deque
+from threading import Condition, Thread
+from typing import Callable, Dict, Iterable, Optional
+from utils import LatencyHistogram
+
+class ActionDispatcher:
+    """File FIFO d'actions exécutées une par une, dans l'ordre de soumission
+
+    Regroupement des actions encore en attente (jamais de celle en cours) :
+    - groups  : geste -> groupe d'actions absolues ("aller à la slide N") ;
+      une nouvelle action du groupe remplace celles qui attendent encore
+    - toggles : gestes de bascule ; deux bascules consécutives en attente s'annulent
+    Les autres actions (slide suivante / précédente) ne sont jamais fusionnées.
+    """
+
+    def __init__(self, handler: Callable[[str, Optional[float]], None],
+                 groups: Optional[Dict[str, str]] = None, toggles: Iterable[str] = (),
+                 max_pending: int = 16, on_error: Optional[Callable[[str, Exception], None]] = None):
+        self.handler = handler
+        self.groups = dict(groups or {})
+        self.toggles = frozenset(toggles)
+        self.max_pending = max_pending
+        self.on_error = on_error
+        self._pending = deque()  # (geste, apparition du geste, instant de soumission)
+        self._condition = Condition()
+        self._busy = False
+        self._is_running = False
+        self._thread = None
+
+        # Statistiques
+        self.submitted = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.wait_latency = LatencyHistogram(bin_ms=5.0)  # Soumission -> début d'exécution
+        self.timings: Dict[str, LatencyHistogram] = {}  # Durée d'exécution par action
+
+    def start(self):
+        if self._is_running:
+            return self
+        self._is_running = True
+        self._thread = Thread(target=self._run, name="actions", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        """Termine l'action en cours ; celles encore en attente sont abandonnées"""
+        with self._condition:
+            self._is_running = False
+            self._pending.clear()
+            self._condition.notify_all()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def submit(self, gesture: str, onset: Optional[float] = None) -> bool:
+        """Ajoute une action sans jamais bloquer ; False si elle est annulée ou rejetée"""
+        with self._condition:
+            self.submitted += 1
+            if gesture in self.toggles and self._pending and self._pending[-1][0] == gesture:
+                # Deux bascules consécutives en attente = aucun effet
+                self._pending.pop()
+                self.coalesced += 2
+                return False
+            group = self.groups.get(gesture)
+            if group is not None:
+                superseded = [item for item in self._pending if self.groups.get(item[0]) == group]
+                for item in superseded:
+                    self._pending.remove(item)
+                self.coalesced += len(superseded)
+            if len(self._pending) >= self.max_pending:
+                self.rejected += 1
+                return False
+            self._pending.append((gesture, onset, time.perf_counter()))
+            self._condition.notify_all()
+            return True
+
+    def wait_idle(self, timeout: float = 2.0) -> bool:
+        """Attend que la file soit vide et l'action en cours terminée (tests, arrêt propre)"""
+        deadline = time.perf_counter() + timeout
+        with self._condition:
+            while self._pending or self._busy:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._is_running and not self._pending:
+                    self._condition.wait()
+                if not self._is_running:
+                    return
+                gesture, onset, submitted = self._pending.popleft()
+                self._busy = True
+
+            start = time.perf_counter()
+            self.wait_latency.record((start - submitted) * 1000)
+            try:
+                self.handler(gesture, onset)
+            except Exception as e:
+                print(f"❌ Action {gesture} en échec: {e}", flush=True)
+                if self.on_error:
+                    self.on_error(gesture, e)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            with self._condition:
+                self.timings.setdefault(gesture, LatencyHistogram(bin_ms=10.0)).record(elapsed_ms)
+                self.executed += 1
+                self._busy = False
+                self._condition.notify_all()
+
+    def summary(self) -> str:
+        """Durée moyenne / max d'exécution par action et attente dans la file"""
+        with self._condition:
+            actions = ", ".join(f"{gesture} {timing.mean_ms:.0f} ms (max {timing.max_ms:.0f})"
+                                for gesture, timing in sorted(self.timings.items()))
+        return (f"actions: {self.executed} exécutées, {self.coalesced} regroupées, {self.rejected} rejetées | "
+                f"attente moy. {self.wait_latency.mean_ms:.1f} ms | {actions or 'aucune'}")
@@ -0,0 +1,1004 @@
+"""
+Benchmarks du pipeline de détection - exécutables sans caméra
+
+Exemples:
+    python benchmarks.py detector --source synthetic:300
+    python benchmarks.py detector --source session.mp4
+    python benchmarks.py scales --source session.mp4 --scales 1.0,0.75,0.5
+    python benchmarks.py allocations --frames 200
+    python benchmarks.py classify --frames 20000
+    python benchmarks.py engines --tilt 30 --left 0.5
+    python benchmarks.py stability --seconds 10 --noise 0.01
+    python benchmarks.py debouncer --updates 200000
+    python benchmarks.py smoothing --jitter 0.012
+    python benchmarks.py smoothing --source session.mp4
+    python benchmarks.py swipes --swipes 200
+    python benchmarks.py hands --max-hands 4
+    python benchmarks.py hands --source session.mp4 --frames 300
+    python benchmarks.py tuning --source session.mp4 --budget 20
+    python benchmarks.py motion --seconds 60 --noise 3
+    python benchmarks.py idle --seconds 20 --idle-after 5
+    python benchmarks.py actions --seconds 20
+    python benchmarks.py backends --presses 200
+    python benchmarks.py backends --backends pyautogui,xtest --pause 0.1
+    python benchmarks.py mapping --calls 200000
+    python benchmarks.py coalescing --max-burst 8 --redraw-cost 0.05
+"""
+import argparse
+import math
+import time
+from config import GestureConfig
+from frame_sources import open_frame_source
+
+def print_timings(title: str, timings_ms):
+    """Affiche un résumé des temps mesurés (en ms)"""
+    if not timings_ms:
+        print(f"{title}: aucune mesure")
+        return
+    ordered = sorted(timings_ms)
+    mean = sum(ordered) / len(ordered)
+    p50 = ordered[len(ordered) // 2]
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{title}: {len(ordered)} mesures | moyenne {mean:.3f} ms | p50 {p50:.3f} ms | "
+          f"p95 {p95:.3f} ms | max {ordered[-1]:.3f} ms | {1000.0 / mean if mean > 0 else 0:.1f}/s")
+
+def bench_detector(args):
+    """Débit de GestureDetector (get_landmarks + detect_gesture) sur une source rejouée"""
+    from gesture_detector import GestureDetector
+
+    config = GestureConfig(roi_tracking=args.roi,
+                           inference_interval=args.interval,
+                           adaptive_inference_interval=args.adaptive)
+    detector = GestureDetector(config)
+    source = open_frame_source(args.source, realtime=False)
+    if not source.isOpened():
+        print(f"❌ Source illisible: {args.source}")
+        return
+
+    landmark_source = detector
+    if args.process:
+        from inference_worker import InferenceWorker
+        landmark_source = InferenceWorker(config).start()
+
+    timings = []
+    gestures = {}
+    while args.frames <= 0 or len(timings) < args.frames:
+        ret, frame = source.read()
+        if not ret:
+            break
+        start = time.perf_counter()
+        landmarks = landmark_source.get_landmarks(frame)
+        gesture = detector.detect_gesture(landmarks)
+        timings.append((time.perf_counter() - start) * 1000)
+        gestures[gesture] = gestures.get(gesture, 0) + 1
+    source.release()
+    if args.process:
+        landmark_source.stop()
+
+    print_timings("GestureDetector" + (" (ROI)" if args.roi else ""), timings)
+    if args.roi:
+        print(f"Frames recadrées: {detector.roi_frames} | replis image complète: {detector.roi_fallbacks}")
+    if detector.interpolated_count:
+        print(f"Inférences: {detector.keyframe_count} | frames extrapolées: {detector.interpolated_count}")
+    print(f"Gestes: {gestures}")
+
+def bench_scales(args):
+    """Temps d'inférence selon l'échelle et concordance avec l'échelle 1.0 (pas une vérité terrain)"""
+    from gesture_detector import GestureDetector
+
+    scales = [float(value) for value in args.scales.split(",")]
+    if 1.0 not in scales:
+        scales.insert(0, 1.0)
+
+    runs = {}
+    for scale in scales:
+        detector = GestureDetector(GestureConfig(inference_scale=scale))
+        source = open_frame_source(args.source, realtime=False)
+        if not source.isOpened():
+            print(f"❌ Source illisible: {args.source}")
+            return
+        timings, gestures, positions = [], [], []
+        while args.frames <= 0 or len(timings) < args.frames:
+            ret, frame = source.read()
+            if not ret:
+                break
+            start = time.perf_counter()
+            landmarks = detector.get_landmarks(frame)
+            gestures.append(detector.detect_gesture(landmarks))
+            timings.append((time.perf_counter() - start) * 1000)
+            positions.append(landmarks[:, :2].tolist() if landmarks is not None else None)
+        source.release()
+        runs[scale] = (timings, gestures, positions)
+
+    _, reference_gestures, reference_positions = runs[1.0]
+    for scale in scales:
+        timings, gestures, positions = runs[scale]
+        print_timings(f"Échelle {scale:.2f}", timings)
+
+        agreement = sum(g == r for g, r in zip(gestures, reference_gestures)) / max(len(gestures), 1)
+        detected = sum(p is not None for p in positions) / max(len(positions), 1)
+        errors = [
+            math.dist(point, reference_point)
+            for frame_points, reference_points in zip(positions, reference_positions)
+            if frame_points and reference_points
+            for point, reference_point in zip(frame_points, reference_points)
+        ]
+        mean_error = sum(errors) / len(errors) if errors else 0.0
+        print(f"    concordance avec 1.0 - gestes identiques: {agreement:.1%} | main détectée: {detected:.1%} | "
+              f"écart landmarks moyen: {mean_error:.4f}")
+
+def bench_allocations(args):
+    """Octets alloués par frame (tracemalloc) : capture -> miroir -> conversion couleur"""
+    import tracemalloc
+    import cv2
+    from frame_sources import SyntheticSource
+    from gesture_detector import GestureDetector
+    from utils import FrameBufferRing
+
+    for reuse in (False, True):
+        detector = GestureDetector(GestureConfig(reuse_frame_buffers=reuse, inference_scale=args.scale))
+        source = SyntheticSource(frame_count=0)
+        capture_buffers = FrameBufferRing(3) if reuse else None
+        flip_buffers = FrameBufferRing(3) if reuse else None
+        shape = (source.height, source.width, 3)
+
+        def process_frame():
+            ret, frame = source.read(capture_buffers.next(shape) if reuse else None)
+            frame = cv2.flip(frame, 1, flip_buffers.next(shape) if reuse else None)
+            rgb = detector.prepare_image(frame)
+            if args.inference:
+                detector.hands.process(rgb)
+
+        # Préchauffage : allocation des tampons et initialisation de MediaPipe
+        for _ in range(10):
+            process_frame()
+
+        tracemalloc.start()
+        allocated = []
+        for _ in range(args.frames):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            process_frame()
+            allocated.append(tracemalloc.get_traced_memory()[1] - baseline)
+        tracemalloc.stop()
+
+        # Le résidu éventuel vient de petits objets Python (tuples, flottants) ;
+        # une allocation de tampon image dépasse forcément la taille d'une ligne
+        row_bytes = source.width * 3
+        image_allocations = sum(size >= row_bytes for size in allocated)
+        mode = "tampons réutilisés" if reuse else "allocation par frame"
+        print(f"{mode:>22}: {sum(allocated) / len(allocated):10.0f} octets/frame en moyenne | "
+              f"max {max(allocated)} | frames allouant un tampon image: {image_allocations}/{len(allocated)}")
+
+def bench_classify(args):
+    """Coût de classification par frame (protobuf MediaPipe vs tableau (21, 3)) et par lot"""
+    import numpy as np
+    from mediapipe.framework.formats import landmark_pb2
+    from gesture_detector import GESTURE_NAMES, GestureDetector
+
+    detector = GestureDetector(GestureConfig())
+    rng = np.random.default_rng(0)
+    hands = rng.random((args.frames, 21, 3)).astype(np.float32)
+    protobufs = []
+    for points in hands:
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z in points:
+            landmark_list.landmark.add(x=float(x), y=float(y), z=float(z))
+        protobufs.append(landmark_list.landmark)
+
+    for title, inputs in (("protobuf (conversion incluse)", protobufs), ("tableau (21, 3)", hands)):
+        timings = []
+        for landmarks in inputs:
+            start = time.perf_counter()
+            detector.detect_gesture(landmarks)
+            timings.append((time.perf_counter() - start) * 1000)
+        print_timings(f"detect_gesture, {title}", timings)
+
+    # Lot complet (sessions enregistrées) : coût ramené à une main
+    start = time.perf_counter()
+    codes = detector.classify_batch(hands)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    labels = [GESTURE_NAMES[code] for code in codes]
+    identical = sum(label == detector.detect_gesture(hand) for label, hand in zip(labels, hands))
+    print(f"classify_batch, {len(hands)} mains: {elapsed_ms:.3f} ms | {elapsed_ms * 1000 / len(hands):.3f} us/main | "
+          f"libellés identiques à detect_gesture: {identical}/{len(hands)}")
+
+def bench_engines(args):
+    """Règles vs classifieurs entraînés (kNN, MLP) : précision et coût par frame sur des mains synthétiques"""
+    import numpy as np
+    from gesture_classifier import ENGINES, create_classifier, synthetic_hands
+    from gesture_detector import GESTURE_NAMES, GestureDetector
+
+    train_hands, train_labels = synthetic_hands(args.train, args.tilt, args.left, seed=0)
+    test_hands, test_labels = synthetic_hands(args.test, args.tilt, args.left, seed=1)
+    print(f"Mains synthétiques: {args.train} entraînement / {args.test} test | "
+          f"inclinaison ±{args.tilt:.0f}° | mains gauches {args.left:.0%}")
+
+    engines = [("rules", None)]
+    for engine in ENGINES:
+        start = time.perf_counter()
+        engines.append((engine, create_classifier(engine).fit(train_hands, train_labels)))
+        print(f"Entraînement {engine}: {time.perf_counter() - start:.2f} s")
+
+    detector = GestureDetector(GestureConfig(min_gesture_probability=0.0))
+    for name, classifier in engines:
+        detector.classifier = classifier
+        timings, predicted = [], []
+        for hand in test_hands:
+            start = time.perf_counter()
+            predicted.append(detector.detect_gesture(hand))
+            timings.append((time.perf_counter() - start) * 1000)
+        print_timings(f"{name:>5} par frame", timings)
+
+        start = time.perf_counter()
+        codes = detector.classify_batch(test_hands)
+        batch_us = (time.perf_counter() - start) * 1e6 / len(test_hands)
+        accuracy = np.mean(np.array(predicted) == test_labels)
+        batch_accuracy = np.mean(np.array(GESTURE_NAMES)[codes] == test_labels)
+        print(f"      précision: {accuracy:.1%} (lot: {batch_accuracy:.1%}) | lot: {batch_us:.2f} us/main")
+
+def bench_stability(args):
+    """Latence geste -> action : fenêtre de stabilité fixe vs adaptative (pipeline réel, landmarks scriptés)"""
+    import numpy as np
+    from frame_grabber import FrameGrabber
+    from frame_sources import SyntheticSource
+    from gesture_classifier import synthetic_hands
+    from gesture_detector import GestureDetector
+    from pipeline import GesturePipeline
+
+    # Alternance geste / main absente, chaque segment dure segment_s secondes
+    script = ["fist", None, "open_hand", None, "three", None]
+    rng = np.random.default_rng(0)
+    pools = {}
+    for gesture in filter(None, script):
+        hands, _ = synthetic_hands(200, max_tilt_degrees=0, left_fraction=0, gestures=[gesture], seed=len(pools))
+        pools[gesture] = hands + rng.normal(0, args.noise, hands.shape).astype(np.float32)
+
+    class ScriptedLandmarks:
+        def __init__(self):
+            self.start = time.time()
+
+        def get_landmarks(self, frame):
+            gesture = script[int((time.time() - self.start) / args.segment) % len(script)]
+            return None if gesture is None else pools[gesture][rng.integers(200)]
+
+    class RecordingController:
+        def execute_gesture_action(self, gesture, cooldown=1.0):
+            pass
+
+    for adaptive in (False, True):
+        config = GestureConfig(gesture_cooldown=0.3, adaptive_stability=adaptive)
+        source = SyntheticSource(frame_count=int(args.seconds * args.fps), width=64, height=48,
+                                 fps=args.fps, realtime=True)
+        grabber = FrameGrabber(source).start()
+        pipeline = GesturePipeline(config, GestureDetector(config), RecordingController(), grabber,
+                                   landmark_source=ScriptedLandmarks()).start()
+        while pipeline.is_running:
+            time.sleep(0.1)
+        pipeline.stop()
+        grabber.stop()
+
+        mode = (f"adaptative ({config.min_stability_frames}-{config.max_stability_frames} frames)"
+                if adaptive else f"fixe ({pipeline.required_stability} frames)")
+        print(f"Stabilité {mode}, {args.fps:.0f} FPS: {pipeline.action_latency.summary()}")
+        print(pipeline.action_latency.format())
+
+def bench_debouncer(args):
+    """Coût par update() de GestureDebouncer et mémoire allouée (horloge simulée, sans caméra)"""
+    import random
+    import tracemalloc
+    from gesture_debouncer import GestureDebouncer
+
+    rng = random.Random(0)
+    # Séquence réaliste : segments de gestes avec quelques frames parasites
+    gestures = []
+    while len(gestures) < args.updates:
+        gesture = rng.choice(["fist", "open_hand", "three", "none"])
+        gestures.extend(rng.choice(["point", "none"]) if rng.random() < 0.1 else gesture
+                        for _ in range(rng.randint(5, 40)))
+    gestures = gestures[:args.updates]
+    times = [index / 30.0 for index in range(len(gestures))]
+
+    for window in (8, 64):
+        debouncer = GestureDebouncer(window=window, required=5, cooldown=1.0,
+                                     allowed=("fist", "open_hand", "three"))
+        update = debouncer.update
+        for gesture, now in zip(gestures[:1000], times[:1000]):  # Préchauffage : gestes rencontrés
+            update(gesture, None, now)
+
+        start = time.perf_counter()
+        fired = sum(update(gesture, None, now) is not None for gesture, now in zip(gestures, times))
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        for gesture, now in zip(gestures[:10000], times[:10000]):
+            update(gesture, None, now)
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+        print(f"fenêtre {window:>3}: {elapsed * 1e6 / len(gestures):.3f} us/update | {fired} actions | "
+              f"mémoire retenue après 10000 updates: {retained} octets")
+
+def _synthetic_session(seconds: float, fps: float, jitter: float):
+    """Session scriptée : gestes de 1 s séparés par 0.3 s sans main, main qui dérive, gigue gaussienne"""
+    import numpy as np
+    from gesture_classifier import synthetic_hands
+
+    rng = np.random.default_rng(0)
+    script = [("fist", 1.0), (None, 0.3), ("open_hand", 1.0), (None, 0.3), ("three", 1.0), (None, 0.3)]
+    poses = {gesture: synthetic_hands(1, 0, 0, gestures=[gesture], seed=index)[0][0]
+             for index, (gesture, _) in enumerate(script) if gesture}
+    period = sum(duration for _, duration in script)
+
+    landmarks, truth, times = [], [], []
+    for index in range(int(seconds * fps)):
+        now = index / fps
+        offset = now % period
+        for gesture, duration in script:
+            if offset < duration:
+                break
+            offset -= duration
+        times.append(now)
+        truth.append(gesture or "none")
+        if gesture is None:
+            landmarks.append(None)
+            continue
+        drift = np.float32([0.05 * math.sin(now), 0.03 * math.cos(1.3 * now), 0])
+        landmarks.append(poses[gesture] + drift + rng.normal(0, jitter, (21, 3)).astype(np.float32))
+    return landmarks, truth, times
+
+def bench_smoothing(args):
+    """Effet du filtre One-Euro : ruptures de stabilité et délai de déclenchement"""
+    import cv2
+    from gesture_debouncer import GestureDebouncer
+    from gesture_detector import GESTURE_NAMES, GestureDetector
+    from landmark_filter import LandmarkSmoother
+
+    detector = GestureDetector(GestureConfig())
+    if args.source:
+        # Session enregistrée : landmarks MediaPipe bruts, horodatés au FPS de la source
+        source = open_frame_source(args.source, realtime=False)
+        landmarks, times = [], []
+        while True:
+            ret, frame = source.read()
+            if not ret:
+                break
+            landmarks.append(detector.get_landmarks(cv2.flip(frame, 1)))
+            times.append(len(times) / source.fps)
+        source.release()
+        truth = None
+        print(f"Session {args.source}: {len(landmarks)} frames, main détectée sur "
+              f"{sum(points is not None for points in landmarks)}")
+    else:
+        landmarks, truth, times = _synthetic_session(args.seconds, args.fps, args.jitter)
+        print(f"Session synthétique: {len(landmarks)} frames à {args.fps:.0f} FPS, gigue σ={args.jitter}")
+
+    allowed = ("fist", "open_hand", "three")
+    for min_cutoff in [None] + [float(value) for value in args.cutoffs.split(",")]:
+        smoother = LandmarkSmoother(min_cutoff, args.beta) if min_cutoff is not None else None
+        labels, start = [], time.perf_counter()
+        for points, now in zip(landmarks, times):
+            if smoother is not None:
+                points = smoother(points, now)
+            labels.append("none" if points is None else GESTURE_NAMES[detector.classify_batch(points)[0]])
+        filter_us = (time.perf_counter() - start) * 1e6 / len(labels)
+
+        # Ruptures : un geste autorisé en cours est interrompu par un autre geste (main toujours visible)
+        resets = sum(previous in allowed and label not in (previous, "none")
+                     for previous, label in zip(labels, labels[1:]))
+
+        # Cooldown plus long qu'un segment : au plus une action par segment
+        debouncer = GestureDebouncer(required=5, cooldown=1.5, allowed=allowed)
+        actions = [(now, debouncer.update(label, now=now)) for label, now in zip(labels, times)]
+        fired = [(now, action) for now, action in actions if action]
+        line = f"{'brut' if smoother is None else f'One-Euro (fc={min_cutoff}, β={args.beta})':>28}: " \
+               f"ruptures {resets:4d} | actions {len(fired):3d}"
+        if truth is not None:
+            # Délai entre le début de chaque segment et le déclenchement du bon geste
+            onsets = [times[index] for index, gesture in enumerate(truth)
+                      if gesture != "none" and (index == 0 or truth[index - 1] != gesture)]
+            delays, wrong = [], 0
+            for now, action in fired:
+                onset = max((t for t in onsets if t <= now), default=None)
+                if onset is None or truth[times.index(onset)] != action:
+                    wrong += 1
+                else:
+                    delays.append((now - onset) * 1000)
+            line += (f" | déclenchement moyen {sum(delays) / max(len(delays), 1):5.0f} ms | "
+                     f"manqués {len(onsets) - len(delays)} | erronés {wrong}")
+        print(line + f" | {filter_us:.1f} us/frame")
+
+def bench_swipes(args):
+    """Balayages : délai de reconnaissance, faux positifs sur une session sans balayage, coût par frame"""
+    import numpy as np
+    from gesture_classifier import synthetic_hands
+    from swipe_detector import SwipeDetector
+
+    rng = np.random.default_rng(0)
+    hand = synthetic_hands(1, 0, 0, gestures=["open_hand"], seed=0)[0][0]
+    hand[:, 0] -= hand[0, 0] - 0.5
+    frame_period = 1.0 / args.fps
+
+    # Balayages : repos 0.3 s, puis 45% de la largeur en 0.2 à 0.4 s, avec gigue
+    detector = SwipeDetector()
+    delays, wrong, missed, timings, now = [], 0, 0, [], 0.0
+    for index in range(args.swipes):
+        direction = 1 if index % 2 else -1
+        duration = rng.uniform(0.2, 0.4)
+        frames = [0.0] * int(0.3 * args.fps) + list(np.linspace(0, 0.45, int(duration * args.fps)))
+        motion_start, result = now + int(0.3 * args.fps) * frame_period, None
+        for offset in frames:
+            points = hand.copy()
+            points[:, 0] += direction * (offset - 0.225)
+            points += rng.normal(0, args.jitter, points.shape).astype(np.float32)
+            start = time.perf_counter()
+            event = detector.update(points, now)
+            timings.append((time.perf_counter() - start) * 1000)
+            if event and result is None:
+                result = event
+                delays.append((now - motion_start) * 1000)
+            now += frame_period
+        detector.update(None, now)
+        if result is None:
+            missed += 1
+        elif result != ("swipe_right" if direction > 0 else "swipe_left"):
+            wrong += 1
+
+    print_timings("SwipeDetector.update", timings)
+    print(f"{args.swipes} balayages: reconnus {len(delays) - wrong} | erronés {wrong} | manqués {missed} | "
+          f"délai moyen après le début du mouvement {sum(delays) / max(len(delays), 1):.0f} ms")
+
+    # Faux positifs : session de poses statiques avec dérive et gigue
+    landmarks, _, times = _synthetic_session(60.0, args.fps, args.jitter)
+    detector = SwipeDetector()
+    false_swipes = sum(detector.update(points, now) is not None for points, now in zip(landmarks, times))
+    print(f"Session de 60 s sans balayage: {false_swipes} faux balayages")
+
+def bench_hands(args):
+    """Multi-mains : coût de conversion + suivi par main supplémentaire, stabilité de la main de contrôle"""
+    import numpy as np
+    from types import SimpleNamespace
+    from mediapipe.framework.formats import landmark_pb2
+    from gesture_classifier import synthetic_hands
+    from gesture_detector import GestureDetector
+
+    rng = np.random.default_rng(0)
+    poses = synthetic_hands(args.max_hands, 0, 0.5, gestures=["open_hand"], seed=0)[0]
+    frame = np.zeros((48, 64, 3), np.uint8)
+
+    class ReplayedHands:
+        """Résultats MediaPipe rejoués : N mains qui dérivent, ordre de détection mélangé"""
+        def __init__(self, count):
+            self.count = count
+            self.offsets = np.linspace(0.15, 0.85, count) if count > 1 else np.array([0.5])
+            self.results = None
+
+        def process(self, image):
+            return self.results
+
+        def prepare(self):
+            """Résultat de la prochaine frame, construit hors de la mesure"""
+            hands, labels = [], []
+            for index in rng.permutation(self.count):
+                points = poses[index] - poses[index][0] + (self.offsets[index], 0.7, 0.0)
+                points[:, :2] += rng.normal(0, 0.01, 2)
+                landmark_list = landmark_pb2.NormalizedLandmarkList()
+                for x, y, z in points:
+                    landmark_list.landmark.add(x=float(x), y=float(y), z=float(z))
+                hands.append(landmark_list)
+                labels.append(SimpleNamespace(classification=[SimpleNamespace(label="Right" if index % 2 else "Left")]))
+            self.results = SimpleNamespace(multi_hand_landmarks=hands, multi_handedness=labels)
+
+    for count in range(1, args.max_hands + 1):
+        detector = GestureDetector(GestureConfig(max_num_hands=max(count, args.min_tracked)))
+        detector.hands = ReplayedHands(count)
+        timings, switches, previous = [], 0, None
+        for _ in range(args.frames):
+            detector.hands.prepare()
+            start = time.perf_counter()
+            detector.get_landmarks(frame)
+            timings.append((time.perf_counter() - start) * 1000)
+            if previous is not None and detector.control_hand_id != previous:
+                switches += 1
+            previous = detector.control_hand_id
+        tracked = "suivi" if detector.tracker is not None else "sans suivi"
+        print_timings(f"{count} main(s), {tracked}", timings)
+        print(f"    changements de main de contrôle: {switches}")
+
+    if args.source:
+        # Inférence réelle : coût de max_num_hands sur une session enregistrée
+        for count in range(1, args.max_hands + 1):
+            detector = GestureDetector(GestureConfig(max_num_hands=count))
+            source = open_frame_source(args.source, realtime=False)
+            timings, found = [], 0
+            while args.frames <= 0 or len(timings) < args.frames:
+                ret, frame = source.read()
+                if not ret:
+                    break
+                start = time.perf_counter()
+                detector.get_landmarks(frame)
+                timings.append((time.perf_counter() - start) * 1000)
+                found += len(detector.candidates)
+            source.release()
+            print_timings(f"MediaPipe max_num_hands={count}", timings)
+            print(f"    mains détectées par frame: {found / max(len(timings), 1):.2f}")
+
+def bench_tuning(args):
+    """Temps d'inférence de chaque niveau de réglage MediaPipe, puis réglage automatique sur un budget"""
+    from gesture_detector import GestureDetector
+    from inference_tuner import tuning_levels
+
+    def replay(detector):
+        source = open_frame_source(args.source, realtime=False)
+        timings = []
+        while args.frames <= 0 or len(timings) < args.frames:
+            ret, frame = source.read()
+            if not ret:
+                break
+            start = time.perf_counter()
+            detector.get_landmarks(frame)
+            timings.append((time.perf_counter() - start) * 1000)
+        source.release()
+        return timings
+
+    config = GestureConfig(model_complexity=1, min_detection_confidence=0.8, min_tracking_confidence=0.8)
+    for level in tuning_levels(config):
+        detector = GestureDetector(config)
+        detector.hands.close()
+        detector.hands = detector._create_hands(level)
+        print_timings(f"Niveau {level.describe()}", replay(detector)[5:])
+
+    config.auto_tune_inference = True
+    config.inference_budget_ms = args.budget
+    detector = GestureDetector(config)
+    timings = replay(detector)
+    print_timings(f"Réglage automatique (budget {args.budget:.1f} ms)", timings)
+    print(f"    niveau final: {detector.tuner.current.name} | changements: {len(detector.tuner.switches)}")
+
+def bench_motion(args):
+    """Filtrage des frames statiques : part de frames sautées, délai de réveil, coût du filtre"""
+    import cv2
+    import numpy as np
+    from gesture_detector import GestureDetector
+    from motion_gate import MotionGate
+
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(40, 160, 640, dtype=np.uint8)
+    background = np.repeat(np.tile(gradient, (480, 1))[:, :, None], 3, axis=2)
+
+    # Pièce vide avec bruit capteur ; une "main" traverse l'image 2 s toutes les `period` secondes
+    total = int(args.seconds * args.fps)
+    period, passage = int(args.period * args.fps), int(2 * args.fps)
+    gate = MotionGate(heartbeat=args.heartbeat)
+    timings, wake_delays, waiting_since = [], [], None
+    for index in range(total):
+        frame = background.copy()
+        phase = index % period
+        present = phase < passage
+        if present:
+            x = int(100 + 440 * phase / passage)
+            cv2.ellipse(frame, (x, 240), (60, 80), 0, 0, 360, (120, 160, 210), -1)
+        noise = rng.normal(0, args.noise, frame.shape)
+        frame = np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+        if present and phase == 0:
+            waiting_since = index
+        start = time.perf_counter()
+        opened = gate.update(frame, hand_tracked=False, timestamp=index / args.fps)
+        timings.append((time.perf_counter() - start) * 1000)
+        if waiting_since is not None and opened:
+            wake_delays.append(index - waiting_since)
+            waiting_since = None
+
+    print_timings("MotionGate.update (640x480)", timings)
+    print(f"{total} frames, main présente {passage / period:.0%} du temps: sautées {gate.skip_fraction:.1%} | "
+          f"délai de réveil max {max(wake_delays, default=0)} frame(s) sur {len(wake_delays)} passages")
+
+    detector = GestureDetector(GestureConfig())
+    inference = []
+    for _ in range(30):
+        start = time.perf_counter()
+        detector.get_landmarks(background)
+        inference.append((time.perf_counter() - start) * 1000)
+    inference_ms = sorted(inference)[len(inference) // 2]
+    saved = gate.skipped * inference_ms - sum(timings)
+    print(f"Inférence MediaPipe sur scène vide: {inference_ms:.1f} ms | temps CPU économisé: "
+          f"{saved / 1000:.1f} s sur {args.seconds:.0f} s ({saved / (total * inference_ms):.0%})")
+
+def bench_idle(args):
+    """Mode veille : CPU du processus sur une scène vide (pipeline réel, MediaPipe inclus), avec et sans veille"""
+    import numpy as np
+    from frame_grabber import FrameGrabber
+    from frame_sources import SyntheticSource
+    from gesture_detector import GestureDetector
+    from pipeline import GesturePipeline
+
+    class NullController:
+        def execute_gesture_action(self, gesture, cooldown=1.0):
+            pass
+
+    # Fond fixe sans main : le cas d'une salle vide entre deux présentations
+    empty = np.full((480, 640, 3), 90, np.uint8)
+
+    for idle_mode in (False, True):
+        config = GestureConfig(idle_mode=idle_mode, idle_after=args.idle_after, idle_fps=args.idle_fps)
+        source = SyntheticSource(frame_count=0, fps=args.fps, realtime=True, generator=lambda index: empty)
+        grabber = FrameGrabber(source).start()
+        pipeline = GesturePipeline(config, GestureDetector(config), NullController(), grabber)
+        wall_start, cpu_start = time.time(), time.process_time()
+        pipeline.start()
+        time.sleep(args.seconds)
+        pipeline.stop()
+        grabber.stop()
+        wall, cpu = time.time() - wall_start, time.process_time() - cpu_start
+
+        captured = grabber.get_stats()["captured"]
+        print(f"Veille {'activée' if idle_mode else 'désactivée'}: {wall:.1f} s | CPU {cpu / wall:.0%} | "
+              f"frames capturées {captured} ({captured / wall:.1f}/s)")
+        if pipeline.idle is not None:
+            print(f"    {pipeline.idle.format()}")
+
+def bench_actions(args):
+    """Temps de classification par frame avec actions synchrones vs file d'actions (pyautogui simulé)"""
+    import numpy as np
+    from gesture_classifier import synthetic_hands
+    from gesture_detector import GestureDetector
+    from pipeline import FramePacket, GesturePipeline
+
+    class SimulatedController:
+        """Coût de pyautogui : PAUSE après chaque appel ; Ctrl+G, saisie et Entrée + 0.2 s pour aller à une slide"""
+        ACTION_GROUPS = {"two": "go_to_slide", "four": "go_to_slide"}
+        TOGGLE_ACTIONS = ("three",)
+        costs = {"two": 0.2 + 3 * args.pause, "four": 0.2 + 3 * args.pause}
+
+        def execute_gesture_action(self, gesture, cooldown=1.0):
+            time.sleep(self.costs.get(gesture, args.pause))
+
+    script = ["fist", None, "open_hand", None, "four", None, "three", None]
+    pools = {gesture: synthetic_hands(50, 0, 0, gestures=[gesture], seed=index)[0]
+             for index, gesture in enumerate(filter(None, script))}
+    frames = int(args.seconds * args.fps)
+    segment = int(args.segment * args.fps)
+
+    for async_actions in (False, True):
+        config = GestureConfig(gesture_cooldown=0.3, async_actions=async_actions)
+        pipeline = GesturePipeline(config, GestureDetector(config), SimulatedController(), grabber=None,
+                                   allowed_gestures=["fist", "open_hand", "three", "four"])
+        if pipeline.dispatcher is not None:
+            pipeline.dispatcher.start()
+        timings, next_frame = [], time.perf_counter()
+        for index in range(frames):
+            # Rythme réel de la caméra : une frame en retard est traitée aussitôt
+            next_frame += 1.0 / args.fps
+            time.sleep(max(0.0, next_frame - time.perf_counter()))
+            gesture = script[(index // segment) % len(script)]
+            packet = FramePacket(index, None, index / args.fps)
+            packet.landmarks = None if gesture is None else pools[gesture][index % 50]
+            start = time.perf_counter()
+            pipeline._classify(packet)
+            timings.append((time.perf_counter() - start) * 1000)
+        if pipeline.dispatcher is not None:
+            pipeline.dispatcher.wait_idle(timeout=10.0)
+            pipeline.dispatcher.stop()
+
+        late = sum(timing > 1000 / args.fps for timing in timings)
+        print_timings(f"_classify, actions {'en file' if async_actions else 'synchrones'}", timings)
+        print(f"    {pipeline.gesture_count} actions | frames au-delà de {1000 / args.fps:.0f} ms: {late}")
+        if pipeline.dispatcher is not None:
+            print(f"    {pipeline.dispatcher.summary()}")
+
+def _x11_key_probe():
+    """Fenêtre X11 ayant le focus ; retourne (attente du prochain KeyPress, fermeture)"""
+    import select
+    from Xlib import X, display as xdisplay
+    display = xdisplay.Display()
+    screen = display.screen()
+    window = screen.root.create_window(0, 0, 200, 100, 0, screen.root_depth,
+                                       event_mask=X.KeyPressMask | X.StructureNotifyMask)
+    window.map()
+    while display.next_event().type != X.MapNotify:
+        pass
+    window.set_input_focus(X.RevertToParent, X.CurrentTime)
+    display.sync()
+
+    def wait(timeout: float = 1.0):
+        deadline = time.perf_counter() + timeout
+        while True:
+            while display.pending_events():
+                if display.next_event().type == X.KeyPress:
+                    return time.perf_counter()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            select.select([display], [], [], remaining)
+    return wait, display.close
+
+def _uinput_key_probe(backend):
+    """Lecture directe du périphérique evdev créé par le backend uinput"""
+    import select
+    from evdev import ecodes
+    device = backend.device.device
+
+    def wait(timeout: float = 1.0):
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not select.select([device.fd], [], [], remaining)[0]:
+                return None
+            for event in device.read():
+                if event.type == ecodes.EV_KEY and event.value == 1:
+                    return time.perf_counter()
+    return wait, lambda: None
+
+def bench_backends(args):
+    """Latence appel -> réception d'une touche pour chaque backend d'injection"""
+    from input_backends import KeyEventServer, create_backend
+
+    for name in args.backends.split(","):
+        server = probe = backend = None
+        try:
+            if name == "socket":
+                server = KeyEventServer()
+                backend = create_backend(name, address=server.address)
+                probe = (lambda timeout=1.0: server.events[-1][0] if server.wait_for(len(calls), timeout) else None,
+                         server.close)
+            else:
+                backend = create_backend(name, pause=args.pause)
+                try:
+                    probe = _uinput_key_probe(backend) if name == "uinput" else _x11_key_probe()
+                except Exception as e:
+                    print(f"{name}: réception non mesurable ({e}), durée d'appel seule")
+        except Exception as e:
+            print(f"{name}: indisponible ({type(e).__name__}: {e})")
+            continue
+
+        calls, deliveries, lost = [], [], 0
+        try:
+            for _ in range(args.presses):
+                # Touche sans effet (Maj) : l'injection uinput / XTEST atteint aussi les autres fenêtres
+                start = time.perf_counter()
+                backend.press(args.key)
+                calls.append((time.perf_counter() - start) * 1000)
+                if probe is not None:
+                    delivered = probe[0]()
+                    if delivered is None:
+                        lost += 1
+                    else:
+                        deliveries.append((delivered - start) * 1000)
+                time.sleep(args.gap)
+        finally:
+            backend.close()
+            if probe is not None:
+                probe[1]()
+
+        print_timings(f"{name}: durée de l'appel", calls)
+        if probe is not None:
+            print_timings(f"{name}: appel -> réception", deliveries)
+            if lost:
+                print(f"    {lost} touches non reçues")
+
+def bench_mapping(args):
+    """Recherche de l'action d'un geste : table compilée vs dictionnaire reconstruit à chaque appel"""
+    import os
+    from gesture_mapping import GestureMapping
+    from input_backends import InputBackend
+    from presentation_controller import PresentationController
+
+    class NullBackend(InputBackend):
+        """Aucune touche envoyée : seule la recherche de l'action est mesurée"""
+        def key_down(self, key):
+            pass
+
+        def key_up(self, key):
+            pass
+
+    controller = PresentationController(NullBackend())
+    gestures = ["fist", "open_hand", "three", "none", "swipe_left"] * (args.calls // 5)
+
+    def rebuilt(gesture):
+        # Ancienne version de execute_gesture_action : lambdas recréées à chaque appel
+        action_map = {
+            "fist": controller.next_slide,
+            "open_hand": controller.previous_slide,
+            "three": controller.smart_slideshow_toggle,
+            "swipe_left": controller.next_slide,
+            "swipe_right": controller.previous_slide,
+            "two": lambda: controller.go_to_slide(2),
+            "four": lambda: controller.go_to_slide(4),
+        }
+        return action_map.get(gesture)
+
+    for name, lookup in (("dictionnaire reconstruit", rebuilt), ("table compilée", controller.dispatch_table.get)):
+        start = time.perf_counter()
+        for gesture in gestures:
+            lookup(gesture)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {elapsed / len(gestures) * 1e9:.0f} ns par recherche")
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestures.json")
+    GestureMapping.load(path)  # Premier chargement : import de gesture_detector (MediaPipe) hors mesure
+    timings = []
+    for _ in range(args.reloads):
+        start = time.perf_counter()
+        controller.load_mapping(GestureMapping.load(path))
+        timings.append((time.perf_counter() - start) * 1000)
+    print_timings("rechargement de gestures.json (lecture, validation, compilation)", timings)
+
+def bench_coalescing(args):
+    """Rafales de slides suivantes : touches, redessins et délai d'arrivée avec et sans regroupement"""
+    import contextlib
+    import io
+    from input_backends import InputBackend
+    from presentation_controller import PresentationController
+
+    class SimulatedBackend(InputBackend):
+        """Chaque touche coûte key_cost ; chaque slide affichée (flèche, Entrée) coûte redraw_cost"""
+        def __init__(self):
+            self.keys = 0
+            self.redraws = 0
+
+        def key_down(self, key):
+            self.keys += 1
+            time.sleep(args.key_cost)
+            if key in ("right", "left", "enter"):
+                self.redraws += 1
+                time.sleep(args.redraw_cost)
+
+        def key_up(self, key):
+            pass
+
+        def hotkey(self, *keys):
+            self.keys += len(keys)
+            time.sleep(len(keys) * args.key_cost)
+
+        def write(self, text):
+            self.keys += len(text)
+            time.sleep(len(text) * args.key_cost)
+
+    for burst in range(1, args.max_burst + 1):
+        results = []
+        for window in (0.0, args.window):
+            backend = SimulatedBackend()
+            controller = PresentationController(backend, coalesce_window=window, slide_count=100,
+                                                key_cost=args.key_cost, redraw_cost=args.redraw_cost)
+            # Diaporama lancé par le contrôleur (F5) : index sûr, le saut direct est permis
+            controller.is_in_slideshow = controller.slide_known = True
+            with contextlib.redirect_stdout(io.StringIO()):
+                # Gestes en attente relâchés d'un coup après un ralentissement
+                start = time.perf_counter()
+                for _ in range(burst):
+                    controller.execute_gesture_action("fist", cooldown=0.0)
+                while controller.pending_navigation:
+                    time.sleep(0.001)
+                elapsed = (time.perf_counter() - start) * 1000
+            if controller.current_slide != 1 + burst:
+                print(f"⚠️  slide {controller.current_slide} au lieu de {1 + burst}")
+            results.append(f"{backend.keys} touches, {backend.redraws} slides affichées, arrivée {elapsed:.0f} ms")
+        print(f"rafale de {burst}: sans regroupement {results[0]} | avec {results[1]}")
+
+def main():
+    """Point d'entrée des benchmarks"""
+    parser = argparse.ArgumentParser(description="Benchmarks du contrôleur gestuel")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    detector_parser = subparsers.add_parser("detector", help=bench_detector.__doc__)
+    detector_parser.add_argument("--source", default="synthetic:300")
+    detector_parser.add_argument("--frames", type=int, default=0, help="0 = toute la source")
+    detector_parser.add_argument("--roi", action="store_true", help="Inférence sur recadrage suivi")
+    detector_parser.add_argument("--interval", type=int, default=1, help="Inférence une frame sur N")
+    detector_parser.add_argument("--adaptive", action="store_true", help="Intervalle d'inférence adaptatif")
+    detector_parser.add_argument("--process", action="store_true", help="Inférence dans un processus séparé")
+    detector_parser.set_defaults(func=bench_detector)
+
+    scales_parser = subparsers.add_parser("scales", help=bench_scales.__doc__)
+    scales_parser.add_argument("--source", default="synthetic:300")
+    scales_parser.add_argument("--frames", type=int, default=0, help="0 = toute la source")
+    scales_parser.add_argument("--scales", default="1.0,0.75,0.5")
+    scales_parser.set_defaults(func=bench_scales)
+
+    allocations_parser = subparsers.add_parser("allocations", help=bench_allocations.__doc__)
+    allocations_parser.add_argument("--frames", type=int, default=200)
+    allocations_parser.add_argument("--scale", type=float, default=1.0, help="Échelle d'inférence")
+    allocations_parser.add_argument("--inference", action="store_true", help="Inclure Hands.process")
+    allocations_parser.set_defaults(func=bench_allocations)
+
+    classify_parser = subparsers.add_parser("classify", help=bench_classify.__doc__)
+    classify_parser.add_argument("--frames", type=int, default=5000)
+    classify_parser.set_defaults(func=bench_classify)
+
+    engines_parser = subparsers.add_parser("engines", help=bench_engines.__doc__)
+    engines_parser.add_argument("--train", type=int, default=4000)
+    engines_parser.add_argument("--test", type=int, default=2000)
+    engines_parser.add_argument("--tilt", type=float, default=30.0, help="Inclinaison maximale (degrés)")
+    engines_parser.add_argument("--left", type=float, default=0.5, help="Part de mains gauches")
+    engines_parser.set_defaults(func=bench_engines)
+
+    stability_parser = subparsers.add_parser("stability", help=bench_stability.__doc__)
+    stability_parser.add_argument("--seconds", type=float, default=10.0, help="Durée par mode")
+    stability_parser.add_argument("--fps", type=float, default=30.0)
+    stability_parser.add_argument("--segment", type=float, default=0.8, help="Durée d'un geste (s)")
+    stability_parser.add_argument("--noise", type=float, default=0.01, help="Bruit des landmarks (ambiguïté)")
+    stability_parser.set_defaults(func=bench_stability)
+
+    debouncer_parser = subparsers.add_parser("debouncer", help=bench_debouncer.__doc__)
+    debouncer_parser.add_argument("--updates", type=int, default=200000)
+    debouncer_parser.set_defaults(func=bench_debouncer)
+
+    smoothing_parser = subparsers.add_parser("smoothing", help=bench_smoothing.__doc__)
+    smoothing_parser.add_argument("--source", default=None, help="Session enregistrée (sinon synthétique)")
+    smoothing_parser.add_argument("--seconds", type=float, default=60.0)
+    smoothing_parser.add_argument("--fps", type=float, default=30.0)
+    smoothing_parser.add_argument("--jitter", type=float, default=0.012, help="Gigue des landmarks synthétiques")
+    smoothing_parser.add_argument("--cutoffs", default="0.5,1.0,2.0", help="Coupures au repos testées (Hz)")
+    smoothing_parser.add_argument("--beta", type=float, default=GestureConfig.smoothing_beta)
+    smoothing_parser.set_defaults(func=bench_smoothing)
+
+    swipes_parser = subparsers.add_parser("swipes", help=bench_swipes.__doc__)
+    swipes_parser.add_argument("--swipes", type=int, default=200)
+    swipes_parser.add_argument("--fps", type=float, default=30.0)
+    swipes_parser.add_argument("--jitter", type=float, default=0.01)
+    swipes_parser.set_defaults(func=bench_swipes)
+
+    hands_parser = subparsers.add_parser("hands", help=bench_hands.__doc__)
+    hands_parser.add_argument("--max-hands", type=int, default=4)
+    hands_parser.add_argument("--frames", type=int, default=2000)
+    hands_parser.add_argument("--min-tracked", type=int, default=1,
+                              help="2 = suivi actif même avec une seule main (coût du suivi seul)")
+    hands_parser.add_argument("--source", default=None, help="Session enregistrée : inférence réelle")
+    hands_parser.set_defaults(func=bench_hands)
+
+    tuning_parser = subparsers.add_parser("tuning", help=bench_tuning.__doc__)
+    tuning_parser.add_argument("--source", default="synthetic:300")
+    tuning_parser.add_argument("--frames", type=int, default=0, help="0 = toute la source")
+    tuning_parser.add_argument("--budget", type=float, default=GestureConfig.inference_budget_ms)
+    tuning_parser.set_defaults(func=bench_tuning)
+
+    motion_parser = subparsers.add_parser("motion", help=bench_motion.__doc__)
+    motion_parser.add_argument("--seconds", type=float, default=60.0)
+    motion_parser.add_argument("--fps", type=float, default=30.0)
+    motion_parser.add_argument("--period", type=float, default=10.0, help="Intervalle entre deux passages (s)")
+    motion_parser.add_argument("--noise", type=float, default=3.0, help="Bruit capteur (écart-type, niveaux de gris)")
+    motion_parser.add_argument("--heartbeat", type=float, default=GestureConfig.motion_heartbeat)
+    motion_parser.set_defaults(func=bench_motion)
+
+    idle_parser = subparsers.add_parser("idle", help=bench_idle.__doc__)
+    idle_parser.add_argument("--seconds", type=float, default=20.0)
+    idle_parser.add_argument("--fps", type=float, default=30.0)
+    idle_parser.add_argument("--idle-after", type=float, default=5.0)
+    idle_parser.add_argument("--idle-fps", type=float, default=GestureConfig.idle_fps)
+    idle_parser.set_defaults(func=bench_idle)
+
+    actions_parser = subparsers.add_parser("actions", help=bench_actions.__doc__)
+    actions_parser.add_argument("--seconds", type=float, default=20.0)
+    actions_parser.add_argument("--fps", type=float, default=30.0)
+    actions_parser.add_argument("--segment", type=float, default=0.8, help="Durée d'un geste (s)")
+    actions_parser.add_argument("--pause", type=float, default=0.1, help="pyautogui.PAUSE simulé (s)")
+    actions_parser.set_defaults(func=bench_actions)
+
+    backends_parser = subparsers.add_parser("backends", help=bench_backends.__doc__)
+    backends_parser.add_argument("--backends", default="pyautogui,xtest,uinput,socket")
+    backends_parser.add_argument("--presses", type=int, default=200)
+    backends_parser.add_argument("--key", default="shift", help="Touche injectée")
+    backends_parser.add_argument("--gap", type=float, default=0.01, help="Pause entre deux touches (s)")
+    backends_parser.add_argument("--pause", type=float, default=GestureConfig.input_pause,
+                                 help="pyautogui.PAUSE (0.1 s par défaut dans pyautogui)")
+    backends_parser.set_defaults(func=bench_backends)
+
+    mapping_parser = subparsers.add_parser("mapping", help=bench_mapping.__doc__)
+    mapping_parser.add_argument("--calls", type=int, default=200000)
+    mapping_parser.add_argument("--reloads", type=int, default=200)
+    mapping_parser.set_defaults(func=bench_mapping)
+
+    coalescing_parser = subparsers.add_parser("coalescing", help=bench_coalescing.__doc__)
+    coalescing_parser.add_argument("--max-burst", type=int, default=8)
+    coalescing_parser.add_argument("--window", type=float, default=0.1, help="Fenêtre de regroupement (s)")
+    coalescing_parser.add_argument("--key-cost", type=float, default=0.01, help="Coût simulé d'une touche (s)")
+    coalescing_parser.add_argument("--redraw-cost", type=float, default=0.05,
+                                   help="Coût simulé d'une slide affichée (s)")
+    coalescing_parser.set_defaults(func=bench_coalescing)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,65 @@
 """
 Configuration pour le contrôleur gestuel
 """
-from dataclasses import dataclass
-from typing import Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
 
 @dataclass
 class GestureConfig:
     """Configuration des gestes et de leur sensibilité"""
     min_detection_confidence: float = 0.7
     min_tracking_confidence: float = 0.5
+    model_complexity: int = 1  # Modèle de landmarks MediaPipe : 0 (léger) ou 1 (complet)
     gesture_cooldown: float = 1.0  # Délai entre gestes (secondes)
     distance_threshold: float = 0.15  # Distance minimum pour activer
     laser_pointer_color: Tuple[int, int, int] = (0, 0, 255)  # Rouge
     laser_pointer_radius: int = 10
+    video_source: str = "0"  # Index caméra, fichier vidéo, dossier d'images ou "synthetic[:N]"
+    roi_tracking: bool = False  # Inférence sur un recadrage autour de la main suivie
+    roi_margin: float = 0.3  # Marge autour de la boîte englobante (fraction de sa taille)
+    roi_min_size: int = 160  # Taille minimale du recadrage (pixels)
+    inference_interval: int = 1  # MediaPipe une frame sur N, landmarks extrapolés entre deux
+    adaptive_inference_interval: bool = False  # N ajusté selon le temps d'inférence mesuré
+    inference_budget_ms: float = 33.0  # Budget d'inférence par frame pour le mode adaptatif
+    max_inference_interval: int = 4
+    auto_tune_inference: bool = False  # Allège / alourdit MediaPipe pour tenir inference_budget_ms
+    motion_gating: bool = False  # Inférence sautée tant que la scène est immobile et sans main
+    motion_pixel_threshold: int = 12  # Écart de gris (0-255) d'un pixel changé dans la vignette
+    motion_min_fraction: float = 0.005  # Part de pixels changés signalant un mouvement
+    motion_heartbeat: float = 1.0  # Inférence de contrôle au moins toutes les N secondes
+    idle_mode: bool = False  # Capture ralentie quand aucune main n'est visible
+    idle_after: float = 10.0  # Secondes sans main avant la veille
+    idle_fps: float = 5.0  # Cadence de capture en veille
+    async_actions: bool = False  # Actions (pyautogui) exécutées par un thread dédié, hors détection
+    input_backend: str = "pyautogui"  # Injection des touches : "pyautogui", "xtest", "uinput" ou "socket"
+    input_pause: float = 0.0  # pyautogui.PAUSE après chaque appel (0.1 s par défaut dans pyautogui)
+    input_address: str = "127.0.0.1:8765"  # Destination du backend "socket"
+    navigation_coalesce_window: float = 0.0  # Fenêtre (s) de regroupement des slides suivante / précédente (0 = désactivé)
+    slide_count: int = 0  # Nombre de slides de la présentation (0 = inconnu), borne l'index suivi
+    inference_scale: float = 1.0  # Échelle de l'image envoyée à MediaPipe (aperçu inchangé)
+    inference_process: bool = False  # MediaPipe dans un processus séparé (mémoire partagée)
+    pipeline_queue_size: int = 2  # Taille des files entre étapes du pipeline
+    pipeline_drop_policy: str = "drop_oldest"  # "drop_oldest", "drop_newest" ou "block"
+    reuse_frame_buffers: bool = False  # Capture, miroir et conversion couleur dans des tampons préalloués
+    mirror_mode: str = "image"  # "image" (cv2.flip de chaque frame) ou "landmarks" (x -> 1 - x)
+    gesture_engine: str = "rules"  # "rules" (règles sur les doigts) ou "model" (classifieur entraîné)
+    gesture_model_path: str = "gesture_model.npz"  # Modèle produit par gesture_classifier.py train
+    min_gesture_probability: float = 0.6  # En dessous, le classifieur répond "unknown"
+    adaptive_stability: bool = False  # Nombre de frames de validation selon la confiance géométrique
+    min_stability_frames: int = 2  # Geste net (confiance 100%)
+    max_stability_frames: int = 8  # Geste ambigu (confiance nulle)
+    confidence_margin: float = 0.2  # Marge doigt/articulation (unités de paume) donnant 100% de confiance
+    stability_release_frames: int = 2  # Hystérésis : le geste actif tient tant qu'il occupe N frames de la fenêtre
+    gesture_cooldowns: Dict[str, float] = field(default_factory=dict)  # Cooldown par geste (sinon gesture_cooldown)
+    gesture_mapping_file: str = ""  # Fichier JSON geste -> action rechargé à chaud (vide = correspondance par défaut)
+    landmark_smoothing: bool = False  # Filtre One-Euro sur les landmarks avant classification
+    smoothing_min_cutoff: float = 1.0  # Coupure au repos (Hz) : plus bas = moins de gigue
+    smoothing_beta: float = 10.0  # Réactivité aux mouvements rapides
+    swipe_gestures: bool = False  # Balayages gauche / droite de la paume (gestes dynamiques)
+    swipe_min_distance: float = 0.25  # Déplacement horizontal minimal (fraction de la largeur)
+    swipe_min_speed: float = 1.0  # Vitesse minimale (largeurs d'image par seconde)
+    swipe_window: float = 0.4  # Durée de trajectoire prise en compte (secondes)
+    swipe_cooldown: float = 0.4  # Délai minimal entre deux balayages
+    max_num_hands: int = 1  # Mains suivies par MediaPipe (au-delà de 1 : suivi avec identifiants)
+    control_hand_policy: str = "stable"  # "stable", "largest", "right" ou "left"
+    hand_match_distance: float = 0.2  # Déplacement maximal d'une main entre deux frames
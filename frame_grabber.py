@@ -0,0 +1,163 @@
+"""
+Capture vidéo en arrière-plan - ne conserve que la frame la plus récente
+"""
+import time
+import cv2
+import numpy as np
+from threading import Thread, Condition
+from typing import Optional, Tuple
+
+class FrameGrabber:
+    """Thread de capture dédié avec un emplacement unique pour la dernière frame
+
+    La caméra est lue en continu : si l'inférence est plus lente que la
+    capture, les anciennes frames sont écrasées (et comptées comme perdues)
+    au lieu de s'accumuler dans le tampon du pilote.
+
+    Avec reuse_buffers, la capture écrit dans trois tampons préalloués
+    (en cours d'écriture, en attente, livré) : une frame livrée reste
+    valide jusqu'au read() suivant.
+    """
+
+    def __init__(self, capture, reuse_buffers: bool = False):
+        self.capture = capture
+        self.reuse_buffers = reuse_buffers
+        self._buffers = []
+        self._frame_buffer = None
+        self._delivered_buffer = None
+        self._condition = Condition()
+        self._frame = None
+        self._frame_id = 0
+        self._last_read_id = 0
+        self._is_running = False
+        self._has_ended = False
+        self._thread = None
+        self.frame_interval = 0.0  # Intervalle minimal entre deux captures (0 = rythme de la source)
+        self._pending_fps = None  # Cadence demandée, transmise à la source par le thread de capture
+
+        # Compteurs
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.frames_delivered = 0
+        self.last_capture_time = 0.0
+        self.read_time_ms = 0.0
+
+    def start(self):
+        """Démarre le thread de capture"""
+        if self._is_running:
+            return self
+        self._is_running = True
+        self._has_ended = False
+        self._thread = Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def _capture_loop(self):
+        """Lit la caméra en continu et remplace la frame en attente"""
+        while self._is_running:
+            self._apply_frame_rate()
+            buffer_index = self._free_buffer_index()
+            start = time.perf_counter()
+            if buffer_index is None:
+                ret, frame = self.capture.read()
+            else:
+                ret, frame = self.capture.read(self._buffers[buffer_index])
+            if not ret:
+                break
+            self.read_time_ms = 0.9 * self.read_time_ms + 0.1 * (time.perf_counter() - start) * 1000
+
+            if self.reuse_buffers and not self._buffers:
+                self._buffers = [np.empty_like(frame) for _ in range(3)]
+
+            with self._condition:
+                # La frame précédente n'a jamais été consommée : elle est perdue
+                if self._frame_id > self._last_read_id:
+                    self.frames_dropped += 1
+                self._frame = frame
+                self._frame_buffer = buffer_index
+                self._frame_id += 1
+                self.frames_captured += 1
+                self.last_capture_time = time.time()
+                self._condition.notify_all()
+
+                # Rythme réduit : attente interrompue par stop() ou un retour au rythme normal
+                deadline = start + self.frame_interval
+                while self._is_running and self.frame_interval and time.perf_counter() < deadline:
+                    self._condition.wait(max(deadline - time.perf_counter(), 0.0))
+
+        with self._condition:
+            self._has_ended = True
+            self._condition.notify_all()
+
+    def set_frame_rate(self, fps: Optional[float]):
+        """Limite la capture à `fps` images/s (None = rythme de la source)
+
+        Les caméras qui l'acceptent réduisent aussi leur propre cadence ;
+        les autres sources sont simplement lues moins souvent.
+        """
+        with self._condition:
+            # VideoCapture n'est pas thread-safe : set() est appelé entre deux read() de la boucle
+            self._pending_fps = fps or getattr(self.capture, "fps", 30.0)
+            self.frame_interval = 1.0 / fps if fps else 0.0
+            self._condition.notify_all()
+
+    def _apply_frame_rate(self):
+        """Transmet à la source la dernière cadence demandée (thread de capture)"""
+        with self._condition:
+            fps, self._pending_fps = self._pending_fps, None
+        if fps is not None:
+            self.capture.set(cv2.CAP_PROP_FPS, fps)
+
+    def _free_buffer_index(self) -> Optional[int]:
+        """Tampon ni en attente de lecture, ni en cours d'utilisation par le consommateur"""
+        if not self._buffers:
+            return None
+        with self._condition:
+            busy = (self._frame_buffer, self._delivered_buffer)
+        for index in range(len(self._buffers)):
+            if index not in busy:
+                return index
+        return None
+
+    @property
+    def has_ended(self) -> bool:
+        """La source ne fournira plus de frame"""
+        return self._has_ended
+
+    def read(self, timeout: float = 1.0) -> Tuple[bool, Optional[object]]:
+        """Retourne la frame la plus récente non encore lue (même interface que cv2.VideoCapture.read)"""
+        deadline = time.time() + timeout
+        with self._condition:
+            while self._frame_id == self._last_read_id:
+                remaining = deadline - time.time()
+                if self._has_ended or not self._is_running or remaining <= 0:
+                    return False, None
+                self._condition.wait(remaining)
+
+            self._last_read_id = self._frame_id
+            self._delivered_buffer = self._frame_buffer
+            self.frames_delivered += 1
+            return True, self._frame
+
+    def stop(self, timeout: float = 2.0):
+        """Arrête le thread de capture (ne libère pas la caméra)"""
+        with self._condition:
+            self._is_running = False
+            self._condition.notify_all()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def get_stats(self) -> dict:
+        """Retourne les compteurs de capture"""
+        with self._condition:
+            captured = self.frames_captured
+            dropped = self.frames_dropped
+            return {
+                "captured": captured,
+                "delivered": self.frames_delivered,
+                "dropped": dropped,
+                "drop_rate": dropped / captured if captured else 0.0,
+                "pending": 1 if self._frame_id > self._last_read_id else 0,
+                "read_ms": self.read_time_ms,
+            }
@@ -0,0 +1,205 @@
+"""
+Sources de frames interchangeables (caméra, fichier vidéo, dossier d'images, synthétique)
+"""
+import os
+import time
+from abc import ABC, abstractmethod
+import cv2
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+class FrameSource(ABC):
+    """Interface commune des sources de frames (compatible cv2.VideoCapture)
+
+    Les sources hors caméra peuvent être lues aussi vite que possible
+    (realtime=False, pour les benchmarks) ou au rythme de leur FPS nominal
+    (realtime=True, pour rejouer une session).
+    """
+
+    def __init__(self, fps: float = 30.0, realtime: bool = False):
+        self.fps = fps
+        self.realtime = realtime
+        self.frames_read = 0
+        self._next_frame_time = None
+
+    def isOpened(self) -> bool:
+        return True
+
+    def read(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """Lit la frame suivante en respectant le rythme si demandé
+
+        Si un tampon `image` de la bonne taille est fourni, la frame y est
+        écrite au lieu d'allouer un nouveau tableau.
+        """
+        ret, frame = self._read_frame(image)
+        if not ret:
+            return False, None
+
+        if self.realtime and self.fps > 0:
+            self._pace()
+
+        self.frames_read += 1
+        return True, frame
+
+    @abstractmethod
+    def _read_frame(self, image: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """Lit la frame suivante de la source (dans `image` si possible)"""
+
+    @staticmethod
+    def _into(frame: np.ndarray, image: Optional[np.ndarray]) -> np.ndarray:
+        """Copie la frame dans le tampon fourni s'il est compatible"""
+        if image is None or image is frame or image.shape != frame.shape:
+            return frame
+        np.copyto(image, frame)
+        return image
+
+    def _pace(self):
+        """Attend l'échéance de la frame suivante"""
+        now = time.perf_counter()
+        if self._next_frame_time is None:
+            self._next_frame_time = now
+        delay = self._next_frame_time - now
+        if delay > 0:
+            time.sleep(delay)
+        self._next_frame_time = max(self._next_frame_time, now) + 1.0 / self.fps
+
+    def set(self, prop_id, value) -> bool:
+        """Les propriétés de capture ne s'appliquent qu'aux caméras"""
+        return False
+
+    def release(self):
+        pass
+
+class CameraSource(FrameSource):
+    """Webcam via cv2.VideoCapture (le rythme est imposé par le matériel)"""
+
+    def __init__(self, index: int = 0, width: int = 640, height: int = 480, fps: float = 30.0):
+        super().__init__(fps=fps, realtime=False)
+        self.cap = cv2.VideoCapture(index)
+        if self.cap.isOpened():
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def _read_frame(self, image=None):
+        return self.cap.read(image)
+
+    def set(self, prop_id, value) -> bool:
+        return self.cap.set(prop_id, value)
+
+    def release(self):
+        self.cap.release()
+
+class VideoFileSource(FrameSource):
+    """Fichier vidéo enregistré (rejeu de session)"""
+
+    def __init__(self, path: str, realtime: bool = False, loop: bool = False):
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        super().__init__(fps=fps, realtime=realtime)
+        self.path = path
+        self.loop = loop
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def _read_frame(self, image=None):
+        ret, frame = self.cap.read(image)
+        if not ret and self.loop and self.frames_read > 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read(image)
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+class ImageSequenceSource(FrameSource):
+    """Dossier d'images lues dans l'ordre alphabétique"""
+
+    def __init__(self, directory: str, fps: float = 30.0, realtime: bool = False, loop: bool = False):
+        super().__init__(fps=fps, realtime=realtime)
+        self.directory = directory
+        self.loop = loop
+        self.paths = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.index = 0
+
+    def isOpened(self) -> bool:
+        return len(self.paths) > 0
+
+    def _read_frame(self, image=None):
+        if self.index >= len(self.paths):
+            if not self.loop or not self.paths:
+                return False, None
+            self.index = 0
+
+        frame = cv2.imread(self.paths[self.index])
+        self.index += 1
+        if frame is None:
+            return False, None
+        return True, self._into(frame, image)
+
+class SyntheticSource(FrameSource):
+    """Générateur de frames déterministe, sans caméra (CI, benchmarks)"""
+
+    def __init__(self, frame_count: int = 300, width: int = 640, height: int = 480,
+                 fps: float = 30.0, realtime: bool = False,
+                 generator: Optional[Callable[[int], np.ndarray]] = None):
+        super().__init__(fps=fps, realtime=realtime)
+        self.frame_count = frame_count
+        self.width = width
+        self.height = height
+        self.generator = generator
+        self.index = 0
+
+        # Fond en dégradé calculé une seule fois
+        gradient = np.linspace(40, 160, width, dtype=np.uint8)
+        self._background = np.repeat(np.tile(gradient, (height, 1))[:, :, None], 3, axis=2)
+
+    def _default_frame(self, index: int, image: Optional[np.ndarray] = None) -> np.ndarray:
+        """Fond en dégradé avec une tache couleur peau qui se déplace"""
+        if image is not None and image.shape == self._background.shape:
+            np.copyto(image, self._background)
+            frame = image
+        else:
+            frame = self._background.copy()
+        phase = 2 * np.pi * index / max(self.frame_count, 1)
+        center = (int(self.width / 2 + self.width / 4 * np.cos(phase)),
+                  int(self.height / 2 + self.height / 4 * np.sin(phase)))
+        cv2.ellipse(frame, center, (60, 80), 0, 0, 360, (120, 160, 210), -1)
+        return frame
+
+    def _read_frame(self, image=None):
+        if self.frame_count and self.index >= self.frame_count:
+            return False, None
+        if self.generator is None:
+            frame = self._default_frame(self.index, image)
+        else:
+            frame = self._into(self.generator(self.index), image)
+        self.index += 1
+        return True, frame
+
+def open_frame_source(spec: str = "0", realtime: bool = False, **kwargs) -> FrameSource:
+    """Crée une source depuis une description texte
+
+    "0", "1"...        -> caméra d'index correspondant
+    "synthetic[:N]"    -> générateur synthétique de N frames
+    dossier            -> séquence d'images
+    autre chemin       -> fichier vidéo
+    """
+    spec = str(spec)
+    if spec.isdigit():
+        return CameraSource(int(spec), **kwargs)
+    if spec.startswith("synthetic"):
+        _, _, count = spec.partition(":")
+        return SyntheticSource(int(count) if count else 300, realtime=realtime, **kwargs)
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, realtime=realtime, **kwargs)
+    return VideoFileSource(spec, realtime=realtime, **kwargs)
@@ -0,0 +1,364 @@
+"""
+Classifieurs de gestes entraînables (kNN, petit MLP) - inférence NumPy uniquement
+
+Les landmarks sont d'abord normalisés (origine au poignet, axe poignet ->
+majeur vertical, échelle de la paume, main gauche ramenée en main droite) :
+le modèle ne dépend ni de l'inclinaison ni de la main utilisée.
+
+Usage:
+    python gesture_classifier.py record --source 0 --label fist --out data/fist.npz
+    python gesture_classifier.py train --data data/*.npz --engine mlp --out gesture_model.npz
+"""
+import argparse
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+ENGINES = ("knn", "mlp")
+MIDDLE_MCP = 9
+INDEX_MCP = 5
+PINKY_MCP = 17
+
+def normalize_landmarks(landmarks: np.ndarray) -> np.ndarray:
+    """Vecteurs de caractéristiques (N, 63) invariants à la position, l'échelle, la rotation et la main"""
+    points = np.asarray(landmarks, dtype=np.float32).reshape(-1, 21, 3)
+    centered = points - points[:, :1]
+
+    # Rotation dans le plan image : poignet -> MCP du majeur vers le haut (y négatif)
+    axis = centered[:, MIDDLE_MCP, :2]
+    length = np.linalg.norm(axis, axis=1, keepdims=True) + 1e-6
+    up_y, up_x = -axis[:, 1:2] / length, axis[:, 0:1] / length
+    x = centered[..., 0] * up_y - centered[..., 1] * up_x
+    y = centered[..., 0] * up_x + centered[..., 1] * up_y
+
+    # Main gauche (ou paume retournée) : miroir pour avoir l'index à droite de l'auriculaire
+    x = np.where((x[:, INDEX_MCP] < x[:, PINKY_MCP])[:, None], -x, x)
+
+    normalized = np.stack([x, -y, centered[..., 2]], axis=-1) / length[:, :, None]
+    return normalized.reshape(len(points), -1)
+
+class LandmarkClassifier(ABC):
+    """Interface commune : fit / predict_proba / save"""
+    engine = None
+
+    def __init__(self):
+        self.classes = np.array([], dtype=str)
+
+    def fit(self, landmarks: np.ndarray, labels: Sequence[str]):
+        self.classes, targets = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+        self._fit(normalize_landmarks(landmarks), targets)
+        return self
+
+    def predict_proba(self, landmarks: np.ndarray) -> np.ndarray:
+        """Probabilités (N, nombre de classes), dans l'ordre de self.classes"""
+        return self._predict_proba(normalize_landmarks(landmarks))
+
+    def predict(self, landmarks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Libellés (N,) et probabilité de la classe retenue (N,)"""
+        proba = self.predict_proba(landmarks)
+        best = np.argmax(proba, axis=1)
+        return self.classes[best], proba[np.arange(len(best)), best]
+
+    def save(self, path: str):
+        np.savez(path, engine=self.engine, classes=self.classes, **self._parameters())
+
+    @abstractmethod
+    def _fit(self, features: np.ndarray, targets: np.ndarray):
+        """Entraînement sur les caractéristiques normalisées et les indices de classe"""
+
+    @abstractmethod
+    def _predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Probabilités (N, nombre de classes) à partir des caractéristiques normalisées"""
+
+    @abstractmethod
+    def _parameters(self) -> dict:
+        """Tableaux du modèle enregistrés par save()"""
+
+class KNNClassifier(LandmarkClassifier):
+    """k plus proches voisins : probabilité = part pondérée des voisins de chaque classe"""
+    engine = "knn"
+
+    def __init__(self, k: int = 7):
+        super().__init__()
+        self.k = k
+        self.features = np.empty((0, 63), np.float32)
+        self.targets = np.empty(0, np.int64)
+
+    def _fit(self, features, targets):
+        self.features = features.astype(np.float32)
+        self.targets = targets
+        self._squared_norms = np.sum(self.features ** 2, axis=1)
+
+    def _predict_proba(self, features):
+        k = min(self.k, len(self.features))
+        distances = (np.sum(features ** 2, axis=1)[:, None] + self._squared_norms[None, :]
+                     - 2 * features @ self.features.T)
+        neighbours = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        weights = 1.0 / (np.sqrt(np.maximum(np.take_along_axis(distances, neighbours, axis=1), 0)) + 1e-3)
+
+        proba = np.zeros((len(features), len(self.classes)), np.float32)
+        np.add.at(proba, (np.arange(len(features))[:, None], self.targets[neighbours]), weights)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def _parameters(self):
+        return {"k": self.k, "features": self.features, "targets": self.targets}
+
+class MLPClassifier(LandmarkClassifier):
+    """Perceptron à une couche cachée (ReLU, softmax) entraîné par Adam"""
+    engine = "mlp"
+
+    def __init__(self, hidden: int = 64, epochs: int = 200, learning_rate: float = 0.01,
+                 batch_size: int = 128, seed: int = 0):
+        super().__init__()
+        self.hidden = hidden
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.batch_size = batch_size
+        self.seed = seed
+        self.layers = []
+        self.mean = np.zeros(63, np.float32)
+        self.std = np.ones(63, np.float32)
+
+    def _forward(self, inputs):
+        """Couche cachée et probabilités pour des caractéristiques déjà centrées-réduites"""
+        (w1, b1), (w2, b2) = self.layers
+        hidden = np.maximum(inputs @ w1 + b1, 0)
+        logits = hidden @ w2 + b2
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return hidden, exp / exp.sum(axis=1, keepdims=True)
+
+    def _fit(self, features, targets):
+        rng = np.random.default_rng(self.seed)
+        self.mean = features.mean(axis=0)
+        self.std = features.std(axis=0) + 1e-6
+        inputs, classes = features.shape[1], len(self.classes)
+        self.layers = [
+            (rng.normal(0, np.sqrt(2 / inputs), (inputs, self.hidden)).astype(np.float32),
+             np.zeros(self.hidden, np.float32)),
+            (rng.normal(0, np.sqrt(2 / self.hidden), (self.hidden, classes)).astype(np.float32),
+             np.zeros(classes, np.float32)),
+        ]
+        parameters = [array for layer in self.layers for array in layer]
+        moments = [(np.zeros_like(p), np.zeros_like(p)) for p in parameters]
+        one_hot = np.eye(classes, dtype=np.float32)[targets]
+        step = 0
+
+        for _ in range(self.epochs):
+            order = rng.permutation(len(features))
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                x = (features[batch] - self.mean) / self.std
+                hidden, proba = self._forward(x)
+
+                # Rétropropagation de l'entropie croisée
+                d_logits = (proba - one_hot[batch]) / len(batch)
+                d_hidden = (d_logits @ self.layers[1][0].T) * (hidden > 0)
+                gradients = [x.T @ d_hidden, d_hidden.sum(axis=0), hidden.T @ d_logits, d_logits.sum(axis=0)]
+
+                step += 1
+                for parameter, gradient, (m, v) in zip(parameters, gradients, moments):
+                    m *= 0.9
+                    m += 0.1 * gradient
+                    v *= 0.999
+                    v += 0.001 * gradient ** 2
+                    m_hat = m / (1 - 0.9 ** step)
+                    v_hat = v / (1 - 0.999 ** step)
+                    parameter -= self.learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)
+
+    def _predict_proba(self, features):
+        return self._forward((features - self.mean) / self.std)[1]
+
+    def _parameters(self):
+        (w1, b1), (w2, b2) = self.layers
+        return {"mean": self.mean, "std": self.std, "w1": w1, "b1": b1, "w2": w2, "b2": b2}
+
+def create_classifier(engine: str) -> LandmarkClassifier:
+    """Classifieur non entraîné pour le moteur demandé"""
+    if engine == "knn":
+        return KNNClassifier()
+    if engine == "mlp":
+        return MLPClassifier()
+    raise ValueError(f"Moteur inconnu: {engine} (choix: {', '.join(ENGINES)})")
+
+def load_classifier(path: str) -> LandmarkClassifier:
+    """Recharge un classifieur sauvegardé par LandmarkClassifier.save"""
+    with np.load(path) as data:
+        engine = str(data["engine"])
+        classifier = create_classifier(engine)
+        classifier.classes = data["classes"]
+        if engine == "knn":
+            classifier.k = int(data["k"])
+            classifier._fit(data["features"], data["targets"])
+        else:
+            classifier.mean, classifier.std = data["mean"], data["std"]
+            classifier.layers = [(data["w1"], data["b1"]), (data["w2"], data["b2"])]
+    return classifier
+
+# Données ------------------------------------------------------------------
+
+def save_dataset(path: str, landmarks: np.ndarray, labels: Sequence[str]):
+    """Enregistre des landmarks (N, 21, 3) et leurs libellés"""
+    np.savez_compressed(path, landmarks=np.asarray(landmarks, np.float32), labels=np.asarray(labels, dtype=str))
+
+def load_datasets(paths: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Concatène plusieurs fichiers enregistrés par save_dataset"""
+    landmarks, labels = [], []
+    for path in paths:
+        with np.load(path) as data:
+            landmarks.append(data["landmarks"])
+            labels.append(data["labels"])
+    return np.concatenate(landmarks), np.concatenate(labels)
+
+# Squelette de main droite, paume face à la caméra (unités de paume, y vers le bas)
+_FINGER_BASES = {1: (0.35, -0.9), 2: (0.1, -1.0), 3: (-0.15, -0.95), 4: (-0.38, -0.85)}
+_FINGER_SEGMENTS = (0.45, 0.3, 0.25)
+_HAND_SHAPES = {
+    # Doigts étendus : pouce, index, majeur, annulaire, auriculaire
+    "fist": (0, 0, 0, 0, 0),
+    "one": (1, 0, 0, 0, 0),
+    "point": (0, 1, 0, 0, 0),
+    "two": (0, 1, 1, 0, 0),
+    "three": (0, 1, 1, 1, 0),
+    "four": (0, 1, 1, 1, 1),
+    "open_hand": (1, 1, 1, 1, 1),
+    "ok": (1, 0, 1, 1, 1),  # Pointes du pouce et de l'index jointes
+}
+SYNTHETIC_GESTURES = tuple(_HAND_SHAPES)
+
+def _synthetic_hand(gesture: str, rng: np.random.Generator) -> np.ndarray:
+    """Main droite droite (non inclinée) en unités de paume"""
+    points = np.zeros((21, 3), np.float32)
+    shape = _HAND_SHAPES[gesture]
+
+    # Pouce : latéral, replié devant la paume
+    points[1] = (0.3, -0.25, 0)
+    points[2] = (0.55, -0.45, 0)
+    if shape[0]:
+        points[3] = points[2] + (0.3, -0.2, 0)
+        points[4] = points[3] + (0.25, -0.15, 0)
+    else:
+        points[3] = points[2] + (0.0, -0.15, 0)
+        points[4] = points[3] + (-0.45, 0.25, 0)
+
+    for finger, (base_x, base_y) in _FINGER_BASES.items():
+        mcp = 1 + 4 * finger
+        points[mcp] = (base_x, base_y, 0)
+        if shape[finger]:
+            angle = rng.normal(base_x * 0.3, 0.05)
+            direction = np.array([np.sin(angle), -np.cos(angle), 0], np.float32)
+            for joint, length in enumerate(_FINGER_SEGMENTS, start=1):
+                points[mcp + joint] = points[mcp + joint - 1] + direction * length * rng.uniform(0.9, 1.1)
+        else:
+            points[mcp + 1] = points[mcp] + (0, -0.35, -0.1)
+            points[mcp + 2] = points[mcp + 1] + (0, 0.2, -0.15)
+            points[mcp + 3] = points[mcp + 2] + (0, 0.2, 0.05)
+
+    if gesture == "ok":
+        points[8] = points[4] + rng.normal(0, 0.03, 3)
+        points[7] = (points[6] + points[8]) / 2 + (0, -0.05, 0)
+    return points
+
+def synthetic_hands(count: int, max_tilt_degrees: float = 30.0, left_fraction: float = 0.5,
+                    gestures: Sequence[str] = SYNTHETIC_GESTURES,
+                    seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Mains étiquetées synthétiques (coordonnées normalisées de l'image) pour tests et benchmarks"""
+    rng = np.random.default_rng(seed)
+    labels = rng.choice(list(gestures), size=count)
+    hands = np.empty((count, 21, 3), np.float32)
+    for index, gesture in enumerate(labels):
+        points = _synthetic_hand(gesture, rng)
+        if rng.random() < left_fraction:
+            points[:, 0] = -points[:, 0]
+        tilt = np.radians(rng.uniform(-max_tilt_degrees, max_tilt_degrees))
+        rotation = np.array([[np.cos(tilt), -np.sin(tilt)], [np.sin(tilt), np.cos(tilt)]], np.float32)
+        points[:, :2] = points[:, :2] @ rotation.T
+        points *= rng.uniform(0.12, 0.25)
+        points[:, :2] += rng.uniform(0.35, 0.65, 2) + (0, 0.15)
+        hands[index] = points + rng.normal(0, 0.003, (21, 3))
+    return hands, labels
+
+# Ligne de commande --------------------------------------------------------
+
+def record(args):
+    """Enregistre les landmarks détectés sur une source pour un libellé donné"""
+    import cv2
+    from config import GestureConfig
+    from frame_sources import open_frame_source
+    from gesture_detector import GestureDetector
+
+    detector = GestureDetector(GestureConfig(mirror_mode="landmarks"))
+    source = open_frame_source(args.source, realtime=True)
+    samples = []
+    print(f"🎥 Enregistrement de '{args.label}' : gardez le geste devant la caméra...")
+    while len(samples) < args.frames:
+        ret, frame = source.read()
+        if not ret:
+            break
+        landmarks = detector.get_landmarks(frame)
+        if landmarks is not None:
+            samples.append(landmarks)
+        if args.preview:
+            cv2.imshow("Enregistrement", cv2.flip(frame, 1))
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    source.release()
+    cv2.destroyAllWindows()
+
+    save_dataset(args.out, np.array(samples, np.float32).reshape(-1, 21, 3), [args.label] * len(samples))
+    print(f"✅ {len(samples)} échantillons enregistrés dans {args.out}")
+
+def train(args):
+    """Entraîne un classifieur sur des enregistrements (et/ou des mains synthétiques)"""
+    landmarks, labels = load_datasets(args.data) if args.data else (np.empty((0, 21, 3), np.float32), [])
+    if args.synthetic:
+        synthetic, synthetic_labels = synthetic_hands(args.synthetic, seed=0)
+        landmarks = np.concatenate([landmarks, synthetic])
+        labels = np.concatenate([labels, synthetic_labels])
+    if not len(landmarks):
+        print("❌ Aucune donnée d'entraînement (--data ou --synthetic)")
+        return 1
+
+    rng = np.random.default_rng(0)
+    order = rng.permutation(len(landmarks))
+    split = int(len(order) * 0.8)
+    train_index, test_index = order[:split], order[split:]
+
+    start = time.perf_counter()
+    classifier = create_classifier(args.engine).fit(landmarks[train_index], np.asarray(labels)[train_index])
+    print(f"Entraînement {args.engine}: {len(train_index)} échantillons en {time.perf_counter() - start:.1f} s")
+    if len(test_index):
+        predicted, _ = classifier.predict(landmarks[test_index])
+        print(f"Précision sur {len(test_index)} échantillons réservés: "
+              f"{np.mean(predicted == np.asarray(labels)[test_index]):.1%}")
+
+    classifier.fit(landmarks, labels).save(args.out)
+    print(f"✅ Modèle enregistré dans {args.out} (classes: {', '.join(classifier.classes)})")
+    return 0
+
+def main():
+    """Point d'entrée : enregistrement et entraînement"""
+    parser = argparse.ArgumentParser(description="Classifieur de gestes entraînable")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help=record.__doc__)
+    record_parser.add_argument("--source", default="0")
+    record_parser.add_argument("--label", required=True)
+    record_parser.add_argument("--frames", type=int, default=300)
+    record_parser.add_argument("--out", required=True)
+    record_parser.add_argument("--preview", action="store_true", help="Afficher la caméra")
+    record_parser.set_defaults(func=record)
+
+    train_parser = subparsers.add_parser("train", help=train.__doc__)
+    train_parser.add_argument("--data", nargs="*", default=[])
+    train_parser.add_argument("--synthetic", type=int, default=0, help="Ajouter N mains synthétiques")
+    train_parser.add_argument("--engine", choices=ENGINES, default="mlp")
+    train_parser.add_argument("--out", default="gesture_model.npz")
+    train_parser.set_defaults(func=train)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
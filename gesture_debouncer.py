@@ -0,0 +1,101 @@
+"""
+Validation des gestes détectés : stabilité, hystérésis et cooldowns
+
+Remplace les compteurs de stabilité écrits directement dans la boucle de
+détection : un seul composant décide quand un geste déclenche une action.
+"""
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+NO_GESTURE = "none"
+
+class GestureDebouncer:
+    """Machine à états sur une fenêtre glissante des derniers gestes
+
+    - Entrée : un geste devient actif quand il occupe au moins `required`
+      des `window` dernières frames.
+    - Hystérésis : le geste actif le reste tant qu'il occupe au moins
+      `release` frames de la fenêtre (une frame parasite ne le coupe pas).
+    - Déclenchement : la frame courante montre le geste actif et son
+      cooldown (propre à chaque geste) est écoulé ; un geste maintenu se
+      répète donc au rythme de son cooldown.
+
+    Chaque update() coûte O(1) : anneau de taille fixe et compteurs par
+    geste, rien n'est alloué une fois les gestes rencontrés.
+    """
+
+    def __init__(self, window: int = 8, required: int = 5, release: int = 2,
+                 cooldown: float = 1.0, cooldowns: Optional[Dict[str, float]] = None,
+                 allowed: Optional[Iterable[str]] = None, clock: Callable[[], float] = time.monotonic):
+        if not 1 <= release <= required <= window:
+            raise ValueError(f"Il faut 1 <= release ({release}) <= required ({required}) <= window ({window})")
+        self.window = window
+        self.required = required
+        self.release = release
+        self.cooldown = cooldown
+        self.cooldowns = dict(cooldowns or {})
+        self.allowed = frozenset(allowed) if allowed is not None else None
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """Vide la fenêtre et les cooldowns"""
+        self._ring = [NO_GESTURE] * self.window
+        self._index = 0
+        self._counts = {NO_GESTURE: self.window}
+        self._onsets = {}
+        self._last_fired = {}
+        self.active = NO_GESTURE
+        self._active_fired = False
+        self.progress = 0.0  # Avancement de la validation du geste courant (0-1)
+        self.fired_onset = 0.0  # Apparition du dernier geste déclenché (horloge du débouncer)
+        self.fired_repeat = False  # Le dernier déclenchement répète un geste maintenu
+
+    def cooldown_for(self, gesture: str) -> float:
+        return self.cooldowns.get(gesture, self.cooldown)
+
+    def update(self, gesture: str, required: Optional[int] = None, now: Optional[float] = None) -> Optional[str]:
+        """Ajoute le geste de la frame courante ; retourne le geste à exécuter ou None
+
+        `required` remplace ponctuellement le seuil d'entrée (fenêtre adaptative).
+        """
+        if now is None:
+            now = self.clock()
+        if self.allowed is not None and gesture not in self.allowed:
+            gesture = NO_GESTURE
+        required = self.required if required is None else min(max(required, self.release), self.window)
+
+        # Fenêtre glissante : la frame la plus ancienne sort, la nouvelle entre
+        counts = self._counts
+        oldest = self._ring[self._index]
+        self._ring[self._index] = gesture
+        self._index = (self._index + 1) % self.window
+        counts[oldest] -= 1
+        count = counts.get(gesture, 0) + 1
+        counts[gesture] = count
+        if count == 1:
+            self._onsets[gesture] = now
+
+        # Hystérésis : sortie sous le seuil bas, entrée au-dessus du seuil haut
+        if self.active != NO_GESTURE and counts[self.active] < self.release:
+            self.active = NO_GESTURE
+        if gesture == NO_GESTURE:
+            self.progress = 0.0
+            return None
+        if gesture != self.active and count >= required and (
+                self.active == NO_GESTURE or count > counts[self.active]):
+            self.active = gesture
+            self._active_fired = False
+
+        self.progress = min(count / required, 1.0)
+        if gesture != self.active:
+            return None
+
+        last_fired = self._last_fired.get(gesture)
+        if last_fired is not None and now - last_fired < self.cooldown_for(gesture):
+            return None
+        self.fired_repeat = self._active_fired
+        self.fired_onset = self._onsets[gesture]
+        self._active_fired = True
+        self._last_fired[gesture] = now
+        return gesture
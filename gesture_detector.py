@@ -4,121 +4,356 @@ Détecteur de gestes basé sur MediaPipe
 import cv2
 import mediapipe as mp
 import math
-from typing import List, Optional
+import time
+import numpy as np
+from typing import Optional
 from config import GestureConfig
+from gesture_classifier import load_classifier
+from hand_tracker import HandTracker
+from inference_tuner import InferenceTuner, TuningLevel, tuning_levels
+from landmark_features import (HAND_CONNECTIONS, extended_fingers, finger_margins,
+                               landmark_distance, landmarks_to_array)
+from utils import FrameBufferRing
+
+MIRRORED_HANDEDNESS = {"Left": "Right", "Right": "Left"}
+
+# Codes entiers des gestes (classify_batch)
+GESTURE_NAMES = ("none", "ok", "fist", "point", "one", "two", "three", "four", "open_hand", "unknown")
+GESTURE_CODES = {name: code for code, name in enumerate(GESTURE_NAMES)}
+OK_DISTANCE = 0.05
+GESTURE_ENGINES = ("rules", "model")
+MIRROR_MODES = ("image", "landmarks")
+
+# Geste selon le nombre de doigts étendus (0 à 5)
+_FINGER_COUNT_CODES = np.array(
+    [GESTURE_CODES[name] for name in ("fist", "one", "two", "three", "four", "open_hand")], dtype=np.int8)
 
 class GestureDetector:
     """Détecteur de gestes basé sur MediaPipe"""
     
     def __init__(self, config: GestureConfig):
+        if config.mirror_mode not in MIRROR_MODES:
+            raise ValueError(f"Miroir inconnu: {config.mirror_mode} (choix: {', '.join(MIRROR_MODES)})")
         self.config = config
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
+        self.hands = self._create_hands(tuning_levels(config)[-1])  # Réglages configurés
+        # Réglage automatique : Hands reconstruit selon le temps d'inférence mesuré
+        self.tuner = None
+        if config.auto_tune_inference:
+            self.tuner = InferenceTuner(tuning_levels(config), config.inference_budget_ms)
+        self.mp_drawing = mp.solutions.drawing_utils
+        self.handedness = None  # "Left" / "Right" du point de vue de l'utilisateur
+        
+        # Plusieurs mains : identifiants stables et choix de la main de contrôle
+        self.tracker = None
+        if config.max_num_hands > 1:
+            self.tracker = HandTracker(config.control_hand_policy, config.hand_match_distance)
+        self.control_hand_id = None
+        self.candidates = []  # Toutes les mains de la dernière inférence
+        self.candidate_handedness = []
+        
+        # Moteur de classification : règles ou classifieur entraîné (kNN / MLP)
+        if config.gesture_engine not in GESTURE_ENGINES:
+            raise ValueError(f"Moteur inconnu: {config.gesture_engine} (choix: {', '.join(GESTURE_ENGINES)})")
+        self.classifier = load_classifier(config.gesture_model_path) if config.gesture_engine == "model" else None
+        self.gesture_probability = 0.0
+        self.gesture_confidence = 0.0  # Confiance du dernier geste classé (0-1)
+        
+        # Tampons réutilisés pour la copie d'inférence (réduction, conversion RGB)
+        self.scaled_buffers = FrameBufferRing(1) if config.reuse_frame_buffers else None
+        self.rgb_buffers = FrameBufferRing(1) if config.reuse_frame_buffers else None
+        
+        # Suivi de la région d'intérêt (x0, y0, x1, y1) en pixels
+        self.roi = None
+        self.roi_frames = 0
+        self.roi_fallbacks = 0
+        
+        # Décimation : historique des deux dernières inférences (index de frame, positions)
+        self.frame_index = 0
+        self.keyframes = []
+        self.inference_time_ms = 0.0
+        self.keyframe_count = 0
+        self.interpolated_count = 0
+        
+    def get_landmarks(self, image) -> Optional[np.ndarray]:
+        """Extrait les landmarks de la main depuis l'image (tableau (21, 3) float32)"""
+        self.frame_index += 1
+        interval = self.current_inference_interval()
+        
+        if interval > 1 and self.keyframes:
+            last_index, last_positions = self.keyframes[-1]
+            if self.frame_index - last_index < interval:
+                self.interpolated_count += 1
+                return self._extrapolate(self.frame_index) if last_positions is not None else None
+        
+        start = time.perf_counter()
+        landmarks = self._detect_landmarks(image)
+        if self.tracker is not None:
+            landmarks = self._select_control_hand()
+        elif landmarks is not None and self.config.mirror_mode == "landmarks":
+            # Image non retournée : miroir appliqué aux landmarks (après le calcul du ROI, en pixels image)
+            self.mirror_landmarks(landmarks)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.inference_time_ms = elapsed_ms if not self.keyframe_count else \
+            0.8 * self.inference_time_ms + 0.2 * elapsed_ms
+        self.keyframe_count += 1
+        if self.tuner is not None:
+            level = self.tuner.record(elapsed_ms)
+            if level is not None:
+                self.hands.close()
+                self.hands = self._create_hands(level)
+        
+        # Une perte de la main coupe l'historique de mouvement
+        history = self.keyframes[-1:] if landmarks is not None else []
+        self.keyframes = history + [(self.frame_index, landmarks)]
+        return landmarks
+    
+    def _select_control_hand(self) -> Optional[np.ndarray]:
+        """Associe les mains détectées aux mains suivies et retourne celle qui contrôle"""
+        if self.config.mirror_mode == "landmarks":
+            for hand in self.candidates:
+                self.mirror_landmarks(hand)
+        self.tracker.update(self.candidates, self.candidate_handedness)
+        hand = self.tracker.control_hand()
+        
+        control_id = hand.id if hand is not None else None
+        if control_id != self.control_hand_id:
+            # Changement de main : pas d'extrapolation entre deux mains différentes
+            self.keyframes = []
+            self.control_hand_id = control_id
+        self.handedness = hand.handedness if hand is not None else None
+        return hand.landmarks if hand is not None else None
+    
+    def _create_hands(self, level: TuningLevel):
+        """Instance MediaPipe Hands pour un niveau de réglage"""
+        return self.mp_hands.Hands(
             static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=config.min_detection_confidence,
-            min_tracking_confidence=config.min_tracking_confidence
+            max_num_hands=self.config.max_num_hands,
+            model_complexity=level.model_complexity,
+            min_detection_confidence=level.min_detection_confidence,
+            min_tracking_confidence=level.min_tracking_confidence
         )
-        self.mp_drawing = mp.solutions.drawing_utils
+    
+    def current_inference_interval(self) -> int:
+        """Nombre de frames entre deux inférences MediaPipe"""
+        if not self.config.adaptive_inference_interval:
+            return max(1, self.config.inference_interval)
+        if not self.keyframe_count or self.config.inference_budget_ms <= 0:
+            return 1
+        interval = math.ceil(self.inference_time_ms / self.config.inference_budget_ms)
+        return max(1, min(interval, self.config.max_inference_interval))
+    
+    def _extrapolate(self, frame_index: int) -> np.ndarray:
+        """Prolonge le mouvement observé entre les deux dernières inférences"""
+        last_index, last_positions = self.keyframes[-1]
+        if len(self.keyframes) < 2:
+            return last_positions.copy()
+        
+        previous_index, previous_positions = self.keyframes[-2]
+        ratio = (frame_index - last_index) / (last_index - previous_index)
+        return last_positions + (last_positions - previous_positions) * np.float32(ratio)
+    
+    def _detect_landmarks(self, image) -> Optional[np.ndarray]:
+        """Inférence MediaPipe, sur l'image complète ou sur la région d'intérêt"""
+        # Le recadrage ne couvre qu'une main : désactivé en multi-mains
+        if not self.config.roi_tracking or self.tracker is not None:
+            return self._process(image)
+        
+        height, width = image.shape[:2]
+        landmarks = None
         
-    def get_landmarks(self, image) -> Optional[List]:
-        """Extrait les landmarks de la main depuis l'image"""
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_image)
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            landmarks = self._process(image[y0:y1, x0:x1])
+            if landmarks is not None:
+                self.roi_frames += 1
+                self._crop_to_frame(landmarks, self.roi, width, height)
+            else:
+                # Main perdue dans le recadrage : repli sur l'image complète
+                self.roi_fallbacks += 1
+        
+        if landmarks is None:
+            landmarks = self._process(image)
+        
+        self.roi = self._compute_roi(landmarks, width, height) if landmarks is not None else None
+        return landmarks
+    
+    def _process(self, image) -> Optional[np.ndarray]:
+        """Lance MediaPipe sur l'image (ou le recadrage) fourni"""
+        results = self.hands.process(self.prepare_image(image))
         
         if results.multi_hand_landmarks:
-            return results.multi_hand_landmarks[0].landmark
+            # Conversion unique du résultat protobuf en tableau (21, 3) par main
+            self.candidates = [landmarks_to_array(hand.landmark) for hand in results.multi_hand_landmarks]
+            self.candidate_handedness = [self._read_handedness(results, index)
+                                         for index in range(len(self.candidates))]
+            self.handedness = self.candidate_handedness[0]
+            return self.candidates[0]
+        self.candidates = []
+        self.candidate_handedness = []
+        self.handedness = None
         return None
     
+    def _read_handedness(self, results, index: int = 0) -> Optional[str]:
+        """Main gauche/droite de la main détectée n° index"""
+        handedness = getattr(results, "multi_handedness", None)
+        if not handedness or index >= len(handedness):
+            return None
+        label = handedness[index].classification[0].label
+        if self.config.mirror_mode == "landmarks":
+            label = MIRRORED_HANDEDNESS.get(label, label)
+        return label
+    
+    @staticmethod
+    def mirror_landmarks(landmarks: np.ndarray) -> np.ndarray:
+        """Miroir horizontal en coordonnées normalisées : identique à cv2.flip(frame, 1)"""
+        landmarks[..., 0] = 1.0 - landmarks[..., 0]
+        return landmarks
+    
+    def prepare_image(self, image):
+        """Copie d'inférence : réduction éventuelle puis conversion BGR -> RGB"""
+        # Les landmarks sont normalisés : seule la copie d'inférence est réduite
+        scale = self.config.inference_scale
+        if 0 < scale < 1:
+            height, width = image.shape[:2]
+            size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            scaled = None
+            if self.scaled_buffers:
+                scaled = self.scaled_buffers.next((size[1], size[0]) + image.shape[2:])
+            image = cv2.resize(image, size, dst=scaled, interpolation=cv2.INTER_AREA)
+        
+        rgb = self.rgb_buffers.next(image.shape) if self.rgb_buffers else None
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb)
+    
+    @staticmethod
+    def _crop_to_frame(landmarks: np.ndarray, roi, width: int, height: int):
+        """Ramène des landmarks normalisés dans le recadrage en coordonnées de l'image complète"""
+        x0, y0, x1, y1 = roi
+        crop_width, crop_height = x1 - x0, y1 - y0
+        landmarks[:, 0] = (x0 + landmarks[:, 0] * crop_width) / width
+        landmarks[:, 1] = (y0 + landmarks[:, 1] * crop_height) / height
+        # z suit la même échelle que x
+        landmarks[:, 2] *= crop_width / width
+    
+    def _compute_roi(self, landmarks: np.ndarray, width: int, height: int):
+        """Calcule un recadrage carré autour de la boîte englobante des landmarks"""
+        low = landmarks[:, :2].min(axis=0) * (width, height)
+        high = landmarks[:, :2].max(axis=0) * (width, height)
+        box_size = float((high - low).max())
+        size = int(max(box_size * (1 + 2 * self.config.roi_margin), self.config.roi_min_size))
+        
+        # La main occupe presque toute l'image : inutile de recadrer
+        if size >= min(width, height):
+            return None
+        
+        center_x, center_y = (high + low) / 2
+        x0 = int(min(max(center_x - size / 2, 0), width - size))
+        y0 = int(min(max(center_y - size / 2, 0), height - size))
+        return (x0, y0, x0 + size, y0 + size)
+    
     def calculate_distance(self, point1, point2) -> float:
-        """Calcule la distance euclidienne entre deux points"""
+        """Calcule la distance euclidienne entre deux points (objets x/y ou lignes de tableau)"""
+        if isinstance(point1, np.ndarray):
+            return float(np.hypot(point1[0] - point2[0], point1[1] - point2[1]))
         return math.sqrt((point1.x - point2.x)**2 + (point1.y - point2.y)**2)
     
     def is_finger_extended(self, landmarks, finger_tip_id: int, finger_pip_id: int) -> bool:
         """Vérifie si un doigt est étendu"""
-        return landmarks[finger_tip_id].y < landmarks[finger_pip_id].y
+        points = landmarks_to_array(landmarks)
+        return bool(points[finger_tip_id, 1] < points[finger_pip_id, 1])
     
     def count_extended_fingers(self, landmarks) -> int:
         """Compte le nombre de doigts étendus"""
-        finger_tips = [4, 8, 12, 16, 20]  # Pouce, Index, Majeur, Annulaire, Auriculaire
-        finger_pips = [3, 6, 10, 14, 18]
-        
-        extended_count = 0
-        
-        # Pouce (logique différente car il bouge latéralement)
-        if landmarks[4].x > landmarks[3].x:  # Pouce étendu vers la droite
-            extended_count += 1
-            
-        # Autres doigts
-        for i in range(1, 5):
-            if self.is_finger_extended(landmarks, finger_tips[i], finger_pips[i]):
-                extended_count += 1
-                
-        return extended_count
+        return int(np.count_nonzero(extended_fingers(landmarks_to_array(landmarks))))
     
     def detect_gesture(self, landmarks) -> str:
-        """Détecte le type de geste basé sur les landmarks"""
-        if not landmarks:
+        """Détecte le type de geste basé sur les landmarks (protobuf MediaPipe ou tableau (21, 3))"""
+        points = landmarks_to_array(landmarks)
+        if points is None or len(points) == 0:
+            self.gesture_confidence = 0.0
             return "none"
         
-        extended_fingers = self.count_extended_fingers(landmarks)
+        if self.classifier is not None:
+            labels, probabilities = self.classifier.predict(points)
+            self.gesture_probability = self.gesture_confidence = float(probabilities[0])
+            if self.gesture_probability < self.config.min_gesture_probability:
+                return "unknown"
+            return str(labels[0])
+        
+        extended = extended_fingers(points)
+        extended_fingers_count = int(np.count_nonzero(extended))
+        ok_distance = float(landmark_distance(points, 4, 8))
+        self.gesture_confidence = self.rule_confidence(points, ok_distance if extended_fingers_count <= 2 else None)
         
         # Geste OK (pouce + index)
-        thumb_tip = landmarks[4]
-        index_tip = landmarks[8]
-        if self.calculate_distance(thumb_tip, index_tip) < 0.05 and extended_fingers <= 2:
+        if ok_distance < OK_DISTANCE and extended_fingers_count <= 2:
             return "ok"
         
         # Classification basée sur le nombre de doigts
-        if extended_fingers == 0:
+        if extended_fingers_count == 0:
             return "fist"
-        elif extended_fingers == 1:
+        elif extended_fingers_count == 1:
             # Vérifier si c'est l'index qui est étendu
-            if self.is_finger_extended(landmarks, 8, 6):
+            if extended[1]:
                 return "point"
             return "one"
-        elif extended_fingers == 2:
+        elif extended_fingers_count == 2:
             return "two"
-        elif extended_fingers == 3:
+        elif extended_fingers_count == 3:
             return "three"
-        elif extended_fingers == 4:
+        elif extended_fingers_count == 4:
             return "four"
-        elif extended_fingers == 5:
+        elif extended_fingers_count == 5:
             return "open_hand"
         
         return "unknown"
     
+    def rule_confidence(self, points: np.ndarray, ok_distance: Optional[float] = None) -> float:
+        """Confiance géométrique : marge du doigt le plus ambigu (et du seuil OK s'il s'applique)"""
+        margin = float(np.abs(finger_margins(points)).min()) / self.config.confidence_margin
+        if ok_distance is not None:
+            margin = min(margin, abs(ok_distance - OK_DISTANCE) / (OK_DISTANCE / 2))
+        return min(margin, 1.0)
+    
+    def classify_batch(self, landmarks: np.ndarray) -> np.ndarray:
+        """Classe un lot de mains (N, 21, 3) en codes de gestes (N,) int8
+        
+        Mêmes règles que detect_gesture ; GESTURE_NAMES[code] donne le libellé.
+        Avec le classifieur, un libellé absent de GESTURE_NAMES devient "unknown".
+        """
+        points = np.asarray(landmarks, dtype=np.float32).reshape(-1, 21, 3)
+        if self.classifier is not None:
+            return self._classify_batch_with_model(points)
+        
+        extended = extended_fingers(points)
+        counts = np.count_nonzero(extended, axis=1)
+        
+        codes = _FINGER_COUNT_CODES[counts]
+        codes[(counts == 1) & extended[:, 1]] = GESTURE_CODES["point"]
+        codes[(landmark_distance(points, 4, 8) < OK_DISTANCE) & (counts <= 2)] = GESTURE_CODES["ok"]
+        return codes
+    
+    def _classify_batch_with_model(self, points: np.ndarray) -> np.ndarray:
+        unknown = GESTURE_CODES["unknown"]
+        class_codes = np.array([GESTURE_CODES.get(str(label), unknown) for label in self.classifier.classes],
+                               dtype=np.int8)
+        if not len(points):
+            return np.empty(0, np.int8)
+        
+        probabilities = self.classifier.predict_proba(points)
+        best = np.argmax(probabilities, axis=1)
+        codes = class_codes[best]
+        codes[probabilities[np.arange(len(best)), best] < self.config.min_gesture_probability] = unknown
+        return codes
+    
     def draw_landmarks(self, frame, landmarks, width, height):
         """Dessine les landmarks de la main sur l'image"""
+        points = (landmarks_to_array(landmarks)[:, :2] * (width, height)).astype(np.int32)
+        
         # Dessiner les points des articulations
-        for landmark in landmarks:
-            x = int(landmark.x * width)
-            y = int(landmark.y * height)
-            cv2.circle(frame, (x, y), 5, (255, 0, 0), -1)
-        
-        # Dessiner les connexions entre les doigts
-        connections = [
-            # Pouce
-            (0, 1), (1, 2), (2, 3), (3, 4),
-            # Index
-            (0, 5), (5, 6), (6, 7), (7, 8),
-            # Majeur
-            (0, 9), (9, 10), (10, 11), (11, 12),
-            # Annulaire
-            (0, 13), (13, 14), (14, 15), (15, 16),
-            # Auriculaire
-            (0, 17), (17, 18), (18, 19), (19, 20),
-            # Connexions de la paume
-            (5, 9), (9, 13), (13, 17)
-        ]
-        
-        for connection in connections:
-            start_point = landmarks[connection[0]]
-            end_point = landmarks[connection[1]]
-            
-            start_x = int(start_point.x * width)
-            start_y = int(start_point.y * height)
-            end_x = int(end_point.x * width)
-            end_y = int(end_point.y * height)
-            
-            cv2.line(frame, (start_x, start_y), (end_x, end_y), (0, 255, 0), 2)
+        for x, y in points:
+            cv2.circle(frame, (int(x), int(y)), 5, (255, 0, 0), -1)
+        
+        # Dessiner les connexions entre les doigts (un seul appel)
+        segments = [points[[start, end]] for start, end in HAND_CONNECTIONS]
+        cv2.polylines(frame, segments, False, (0, 255, 0), 2)
@@ -0,0 +1,169 @@
+"""
+Correspondance geste -> action, décrite dans un fichier JSON
+
+Pour chaque geste : action du contrôleur, arguments, cooldown, stabilité
+requise, libellé. La correspondance est compilée une seule fois en tables
+plates partagées par le filtrage des gestes (pipeline), l'interface et le
+contrôleur ; MappingFile la recharge à chaud quand le fichier change.
+
+Exemple :
+    {
+        "fist": {"action": "next_slide", "label": "Poing", "cooldown": 1.5},
+        "open_hand": "previous_slide",
+        "two": {"action": "go_to_slide", "args": [2], "stability": 6}
+    }
+"""
+import json
+import os
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+SWIPE_GESTURES = ("swipe_left", "swipe_right")
+
+# Méthodes de PresentationController utilisables et nombre d'arguments attendus
+ACTIONS = {
+    "next_slide": 0,
+    "previous_slide": 0,
+    "smart_slideshow_toggle": 0,
+    "go_to_slide": 1,
+    "force_start_slideshow": 0,
+    "force_exit_slideshow": 0,
+    "toggle_fullscreen_only": 0,
+    "end_slideshow": 0,
+    "black_screen": 0,
+    "white_screen": 0,
+}
+# Regroupement dans ActionDispatcher : actions absolues (la dernière demandée suffit) et bascules
+ABSOLUTE_ACTIONS = ("go_to_slide",)
+TOGGLE_ACTIONS = ("smart_slideshow_toggle",)
+# Déplacements relatifs, regroupés en rafale par PresentationController
+NAVIGATION_ACTIONS = ("next_slide", "previous_slide")
+
+BINDING_FIELDS = {"action", "args", "cooldown", "stability", "label", "enabled"}
+
+@dataclass(frozen=True)
+class GestureBinding:
+    """Action associée à un geste"""
+    gesture: str
+    action: str
+    args: Tuple = ()
+    cooldown: Optional[float] = None  # None = gesture_cooldown ; gestes statiques uniquement
+    stability: Optional[int] = None  # Frames de validation ; None = réglage global ; gestes statiques uniquement
+    label: str = ""
+    enabled: bool = True  # False = action conservée mais geste ignoré par la détection
+
+class GestureMapping:
+    """Correspondance compilée en tables plates (aucun calcul par frame)"""
+
+    def __init__(self, bindings: Iterable[GestureBinding], source: Optional[str] = None):
+        self.bindings: Dict[str, GestureBinding] = {binding.gesture: binding for binding in bindings}
+        self.source = source
+        enabled = [binding for binding in self.bindings.values() if binding.enabled]
+        self.allowed = tuple(binding.gesture for binding in enabled)
+        self.cooldowns = {binding.gesture: binding.cooldown for binding in enabled if binding.cooldown is not None}
+        self.stability = {binding.gesture: binding.stability for binding in enabled if binding.stability is not None}
+        self.labels = {gesture: binding.label or gesture for gesture, binding in self.bindings.items()}
+        self.action_groups = {gesture: binding.action for gesture, binding in self.bindings.items()
+                              if binding.action in ABSOLUTE_ACTIONS}
+        self.toggles = tuple(gesture for gesture, binding in self.bindings.items()
+                             if binding.action in TOGGLE_ACTIONS)
+        self.navigation = tuple(gesture for gesture, binding in self.bindings.items()
+                                if binding.action in NAVIGATION_ACTIONS)
+
+    def compile(self, controller) -> Dict[str, Callable[[], None]]:
+        """Table geste -> méthode liée du contrôleur, arguments inclus"""
+        return {gesture: partial(getattr(controller, binding.action), *binding.args)
+                for gesture, binding in self.bindings.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict, source: Optional[str] = None) -> "GestureMapping":
+        """Valide la description ; ValueError au premier champ incorrect"""
+        from gesture_detector import GESTURE_NAMES
+        if not isinstance(data, dict):
+            raise ValueError("Objet JSON geste -> action attendu")
+        known = set(GESTURE_NAMES[1:-1]) | set(SWIPE_GESTURES)  # Sans "none" ni "unknown"
+        bindings = []
+        for gesture, spec in data.items():
+            if gesture not in known:
+                raise ValueError(f"Geste inconnu: {gesture} (choix: {', '.join(sorted(known))})")
+            if isinstance(spec, str):
+                spec = {"action": spec}
+            if not isinstance(spec, dict):
+                raise ValueError(f"{gesture}: nom d'action ou objet attendu")
+            unknown = set(spec) - BINDING_FIELDS
+            if unknown:
+                raise ValueError(f"{gesture}: champs inconnus {', '.join(sorted(unknown))}")
+            action = spec.get("action")
+            if action not in ACTIONS:
+                raise ValueError(f"{gesture}: action inconnue {action!r} (choix: {', '.join(ACTIONS)})")
+            args = tuple(spec.get("args", ()))
+            if len(args) != ACTIONS[action]:
+                raise ValueError(f"{gesture}: {action} attend {ACTIONS[action]} argument(s)")
+            cooldown, stability = spec.get("cooldown"), spec.get("stability")
+            if gesture in SWIPE_GESTURES and (cooldown is not None or stability is not None):
+                # Les balayages ne passent pas par le débouncer : délai commun swipe_cooldown
+                raise ValueError(f"{gesture}: cooldown et stability ne s'appliquent pas aux balayages "
+                                 "(voir GestureConfig.swipe_cooldown)")
+            if cooldown is not None and (isinstance(cooldown, bool) or not isinstance(cooldown, (int, float))
+                                         or cooldown < 0):
+                raise ValueError(f"{gesture}: cooldown positif attendu")
+            if stability is not None and (isinstance(stability, bool) or not isinstance(stability, int)
+                                          or stability < 1):
+                raise ValueError(f"{gesture}: stabilité entière >= 1 attendue")
+            bindings.append(GestureBinding(gesture, action, args, cooldown, stability,
+                                           str(spec.get("label", "")), bool(spec.get("enabled", True))))
+        return cls(bindings, source)
+
+    @classmethod
+    def load(cls, path: str) -> "GestureMapping":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), source=path)
+
+# Correspondance historique : trois gestes statiques, balayages, "aller à la slide" désactivé
+DEFAULT_BINDINGS = (
+    GestureBinding("fist", "next_slide", label="Poing"),
+    GestureBinding("open_hand", "previous_slide", label="Main ouverte"),
+    GestureBinding("three", "smart_slideshow_toggle", label="Trois doigts"),
+    GestureBinding("swipe_left", "next_slide", label="Balayage ←"),  # La main pousse la slide vers la gauche
+    GestureBinding("swipe_right", "previous_slide", label="Balayage →"),
+    GestureBinding("two", "go_to_slide", (2,), label="Deux doigts", enabled=False),
+    GestureBinding("four", "go_to_slide", (4,), label="Quatre doigts", enabled=False),
+)
+
+def default_mapping() -> GestureMapping:
+    return GestureMapping(DEFAULT_BINDINGS)
+
+class MappingFile:
+    """Fichier de correspondance surveillé (date de modification et taille)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._stamp = self._read_stamp()
+        self.mapping = GestureMapping.load(path)  # Fichier invalide au démarrage : erreur immédiate
+        self.reloads = 0
+        self.errors = 0
+
+    def _read_stamp(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> Optional[GestureMapping]:
+        """Nouvelle correspondance si le fichier a changé et reste valide, sinon None"""
+        try:
+            stamp = self._read_stamp()
+        except OSError:
+            return None  # Fichier en cours de remplacement par l'éditeur
+        if stamp == self._stamp:
+            return None
+        self._stamp = stamp
+        try:
+            mapping = GestureMapping.load(self.path)
+        except (OSError, ValueError) as e:
+            self.errors += 1
+            print(f"❌ Correspondance {self.path} invalide, version précédente conservée: {e}", flush=True)
+            return None
+        self.mapping = mapping
+        self.reloads += 1
+        print(f"🔁 Correspondance rechargée: {self.path} ({len(mapping.allowed)} gestes actifs)", flush=True)
+        return mapping
@@ -1,12 +1,20 @@
 import cv2
 import tkinter as tk
 from tkinter import ttk, messagebox
-import time
 from threading import Thread
 import math
 from config import GestureConfig
 from gesture_detector import GestureDetector
+from gesture_mapping import SWIPE_GESTURES, default_mapping
+from input_backends import backend_from_config
 from presentation_controller import PresentationController
+from frame_grabber import FrameGrabber
+from frame_sources import open_frame_source
+from inference_worker import InferenceWorker
+from pipeline import GesturePipeline
+
+# Couleur du badge par geste (les autres gestes de la correspondance en bleu)
+GESTURE_COLORS = {"fist": "#EA4335", "open_hand": "#34A853", "three": "#FBBC04"}
 
 class ModernCard(tk.Frame):
     """Carte moderne avec ombre et effets"""
@@ -144,7 +152,8 @@ class StatusIndicator(tk.Frame):
 class ModernGestureControllerGUI:
     """Interface graphique moderne et responsive - 3 gestes uniquement"""
     
-    def __init__(self):
+    def __init__(self, **settings):
+        """settings : champs de GestureConfig imposés (ligne de commande), appliqués avant la construction du détecteur"""
         self.root = tk.Tk()
         self.root.title("🎯 Gesture Navigator Pro - Contrôle Simplifié")
         self.root.geometry("900x650")
@@ -157,14 +166,23 @@ class ModernGestureControllerGUI:
         self.config.min_detection_confidence = 0.8  # Plus strict
         self.config.min_tracking_confidence = 0.8   # Plus strict
         self.config.gesture_cooldown = 1.5          # Plus de temps entre gestes
+        for name, value in settings.items():
+            if not hasattr(self.config, name):
+                raise ValueError(f"Réglage inconnu: {name}")
+            setattr(self.config, name, value)
         
         self.detector = GestureDetector(self.config)
-        self.controller = PresentationController()
+        self.controller = PresentationController(
+            backend_from_config(self.config), coalesce_window=self.config.navigation_coalesce_window,
+            slide_count=self.config.slide_count)
+        self.default_mapping = default_mapping()
         
         # Variables
         self.cap = None
+        self.grabber = None
+        self.inference_worker = None
         self.is_running = False
-        self.video_thread = None
+        self.pipeline = None
         self.gesture_cards = {}
         self.current_gesture = "none"
         self.current_fps = 0
@@ -307,6 +325,21 @@ class ModernGestureControllerGUI:
                                            font=("Segoe UI", 11))
         self.gesture_count_label.pack(pady=2)
         
+        self.pipeline_label = tk.Label(stats_content, text="Goulot: --",
+                                      bg="#FFFFFF", fg=self.colors['text_secondary'],
+                                      font=("Segoe UI", 11))
+        self.pipeline_label.pack(pady=2)
+        
+        self.latency_label = tk.Label(stats_content, text="Latence: --",
+                                     bg="#FFFFFF", fg=self.colors['text_secondary'],
+                                     font=("Segoe UI", 11))
+        self.latency_label.pack(pady=2)
+        
+        self.power_label = tk.Label(stats_content, text="Veille: --",
+                                   bg="#FFFFFF", fg=self.colors['text_secondary'],
+                                   font=("Segoe UI", 11))
+        self.power_label.pack(pady=2)
+        
         # Statut
         self.status_indicator = StatusIndicator(stats_content)
         self.status_indicator.pack(pady=10)
@@ -422,6 +455,11 @@ class ModernGestureControllerGUI:
         """Met à jour la région de scroll"""
         self.main_canvas.configure(scrollregion=self.main_canvas.bbox("all"))
         
+    @property
+    def gesture_mapping(self):
+        """Correspondance en vigueur : celle du pipeline (rechargée à chaud), sinon celle par défaut"""
+        return self.pipeline.mapping if self.pipeline is not None else self.default_mapping
+        
     def update_gesture_display(self, gesture, confidence=0.0):
         """Met à jour l'affichage du geste actuel avec confiance"""
         # Désactiver toutes les cartes
@@ -439,26 +477,14 @@ class ModernGestureControllerGUI:
         if mapped_gesture in self.gesture_cards:
             self.gesture_cards[mapped_gesture].activate()
             
-        # Mettre à jour le badge
-        gesture_names = {
-            "fist": "Poing",
-            "open_hand": "Main ouverte",
-            "three": "Trois doigts",
-            "none": "Aucun"
-        }
-        
-        display_name = gesture_names.get(gesture, "Aucun")
-        self.current_gesture_badge.config(text=display_name)
-        
-        # Changer la couleur du badge selon le geste
-        colors = {
-            "Poing": "#EA4335",
-            "Main ouverte": "#34A853",
-            "Trois doigts": "#FBBC04",
-            "Aucun": "#757575"
-        }
-        
-        self.current_gesture_badge.config(bg=colors.get(display_name, "#757575"))
+        # Mettre à jour le badge (libellés de la correspondance en vigueur)
+        mapping = self.gesture_mapping
+        if gesture in mapping.allowed:
+            display_name = mapping.labels[gesture]
+            color = GESTURE_COLORS.get(gesture, "#4285F4")
+        else:
+            display_name, color = "Aucun", "#757575"
+        self.current_gesture_badge.config(text=display_name, bg=color)
         
         # Mettre à jour la confiance
         self.gesture_confidence = confidence
@@ -472,24 +498,70 @@ class ModernGestureControllerGUI:
     def start_detection(self):
         """Démarre la détection avec précision améliorée"""
         try:
-            self.cap = cv2.VideoCapture(0)
+            # Caméra 640x480@30fps par défaut, ou rejeu d'une session enregistrée
+            self.cap = open_frame_source(self.config.video_source, realtime=True)
             if not self.cap.isOpened():
                 messagebox.showerror("Erreur", "Impossible d'accéder à la caméra")
                 return
             
-            # Configuration de la caméra pour une meilleure qualité
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-            self.cap.set(cv2.CAP_PROP_FPS, 30)
+            # Inférence isolée dans un processus dédié (hors du GIL de l'interface) ;
+            # son démarrage (jusqu'à 30 s) se fait hors du thread Tk
+            if self.config.inference_process:
+                self.status_indicator.set_status("Démarrage de l'inférence...", False)
+                self.start_btn.config(state="disabled")
+                Thread(target=self.start_inference_worker, daemon=True).start()
+                return
+            
+            self.launch_pipeline()
+            
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors du démarrage: {str(e)}")
+    
+    def start_inference_worker(self):
+        """Thread de démarrage du processus d'inférence, puis suite du lancement dans le thread Tk"""
+        try:
+            self.inference_worker = InferenceWorker(self.config).start()
+        except Exception as e:
+            self.root.after(0, lambda error=e: self.abort_start(error))
+            return
+        self.root.after(0, self.launch_pipeline)
+    
+    def abort_start(self, error):
+        """Échec du démarrage : libère la caméra et remet l'interface en état"""
+        if self.inference_worker:
+            self.inference_worker.stop()
+            self.inference_worker = None
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+        self.start_btn.config(state="normal")
+        self.status_indicator.set_status("Arrêté", False)
+        messagebox.showerror("Erreur", f"Erreur lors du démarrage: {str(error)}")
+    
+    def launch_pipeline(self):
+        """Capture et pipeline, une fois la source (et l'éventuel processus d'inférence) prêts"""
+        try:
+            # Capture dans un thread dédié : l'inférence travaille toujours sur la frame la plus récente
+            self.grabber = FrameGrabber(self.cap, reuse_buffers=self.config.reuse_frame_buffers).start()
             
+            # Étapes concurrentes : inférence | classification + action | rendu
+            self.pipeline = GesturePipeline(
+                self.config, self.detector, self.controller, self.grabber,
+                landmark_source=self.inference_worker,
+                on_gesture=self.update_gesture_display,
+                on_action=self.on_gesture_action,
+                on_stats=self.on_pipeline_stats,
+                renderer=self.render_frame,
+                on_stop=lambda: self.root.after(0, self.stop_detection),
+            )
             self.is_running = True
-            self.video_thread = Thread(target=self.video_loop, daemon=True)
-            self.video_thread.start()
+            self.pipeline.start()
             
             self.status_indicator.set_status("Détection haute précision", True)
+            self.start_btn.config(state="normal")
             
         except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur lors du démarrage: {str(e)}")
+            self.abort_start(e)
     
     def stop_detection(self):
         """Arrête la détection sans bloquer l'interface"""
@@ -510,9 +582,20 @@ class ModernGestureControllerGUI:
         # Fonction pour nettoyer les ressources en arrière-plan
         def cleanup_resources():
             try:
-                # Attendre que le thread se termine (max 2 secondes)
-                if self.video_thread and self.video_thread.is_alive():
-                    self.video_thread.join(timeout=2.0)
+                # Attendre la fin des étapes du pipeline (max 2 secondes chacune)
+                if self.pipeline:
+                    self.pipeline.stop(timeout=2.0)
+                    self.pipeline = None
+                
+                # Arrêter le thread de capture avant de libérer la caméra
+                if self.grabber:
+                    self.grabber.stop()
+                    self.grabber = None
+                
+                # Arrêter le processus d'inférence
+                if self.inference_worker:
+                    self.inference_worker.stop()
+                    self.inference_worker = None
                 
                 # Libérer la caméra
                 if self.cap:
@@ -546,85 +629,55 @@ class ModernGestureControllerGUI:
         # Réinitialiser les statistiques
         self.fps_label.config(text="FPS: --")
         self.confidence_label.config(text="Confiance: --%")
+        self.pipeline_label.config(text="Goulot: --")
+        self.latency_label.config(text="Latence: --")
+        self.power_label.config(text="Veille: --")
+        
+    def on_pipeline_stats(self, fps, stats):
+        """Statistiques du pipeline (appelé une fois par seconde)"""
+        self.current_fps = fps
+        dropped = stats["capture"]["dropped"]
+        self.fps_label.config(text=f"FPS: {fps:.1f} (perdues: {dropped})")
+        
+        # Étape la plus lente = goulot d'étranglement
+        name, service_ms = self.pipeline.bottleneck()
+        details = ""
+        if self.detector.tuner is not None and not self.inference_worker:
+            details = f" | modèle {self.detector.tuner.current.name}"
+        if self.pipeline.motion_gate is not None:
+            details += f" | sautées {self.pipeline.motion_gate.skip_fraction:.0%}"
+        self.pipeline_label.config(text=f"Goulot: {name} ({service_ms:.1f} ms){details}")
+        
+        # Latence geste -> action mesurée
+        latency = self.pipeline.action_latency
+        if latency.count:
+            self.latency_label.config(text=f"Latence: p50 ≤{latency.percentile(0.5):.0f} ms "
+                                           f"(p95 ≤{latency.percentile(0.95):.0f} ms)")
+        
+        # Mode veille : part du temps en veille et économie CPU mesurée
+        if self.pipeline.idle is not None:
+            power = self.pipeline.idle.stats()
+            state = "💤 en veille" if power["idle"] else "actif"
+            self.power_label.config(text=f"Veille: {state} | {power['idle_fraction']:.0%} du temps, "
+                                         f"CPU -{power['cpu_saved']:.0%}")
+        
+    def on_gesture_action(self, gesture, count):
+        """Un geste validé a déclenché une action"""
+        self.gesture_count_label.config(text=f"Gestes: {count}")
+        
+    def render_frame(self, packet):
+        """Étape de rendu : overlay et affichage de la caméra"""
+        frame = packet.frame
+        height, width = frame.shape[:2]
         
-    def video_loop(self):
-        """Boucle vidéo avec détection améliorée pour 3 gestes"""
-        gesture_count = 0
-        fps_counter = 0
-        last_fps_time = time.time()
-        last_gesture_time = 0
-        gesture_stability_count = 0
-        required_stability = 5  # Nombre de frames consécutives pour valider un geste
-        
-        while self.is_running:
-            ret, frame = self.cap.read()
-            if not ret:
-                break
-            
-            fps_counter += 1
-            current_time = time.time()
-            
-            # Calcul FPS
-            if current_time - last_fps_time >= 1.0:
-                fps = fps_counter / (current_time - last_fps_time)
-                self.current_fps = fps
-                self.fps_label.config(text=f"FPS: {fps:.1f}")
-                fps_counter = 0
-                last_fps_time = current_time
-            
-            # Traitement
-            frame = cv2.flip(frame, 1)
-            height, width, _ = frame.shape
-            
-            landmarks = self.detector.get_landmarks(frame)
-            
-            if landmarks:
-                detected_gesture = self.detector.detect_gesture(landmarks)
-                
-                # Filtrer pour ne garder que les 3 gestes autorisés
-                if detected_gesture in ["fist", "open_hand", "three"]:
-                    # Calculer une confiance basée sur la stabilité de détection
-                    if detected_gesture == self.current_gesture:
-                        gesture_stability_count += 1
-                    else:
-                        gesture_stability_count = 1
-                        self.current_gesture = detected_gesture
-                    
-                    # Confiance basée sur la stabilité
-                    confidence = min(gesture_stability_count / required_stability, 1.0)
-                    
-                    # Seulement exécuter si le geste est stable ET assez de temps s'est écoulé
-                    if (gesture_stability_count >= required_stability and 
-                        current_time - last_gesture_time > self.config.gesture_cooldown):
-                        
-                        gesture_count += 1
-                        self.gesture_count_label.config(text=f"Gestes: {gesture_count}")
-                        
-                        # Exécution du geste
-                        self.controller.execute_gesture_action(detected_gesture, self.config.gesture_cooldown)
-                        last_gesture_time = current_time
-                        
-                    self.update_gesture_display(detected_gesture, confidence)
-                else:
-                    # Geste non reconnu ou non autorisé
-                    self.update_gesture_display("none", 0.0)
-                    gesture_stability_count = 0
-                    self.current_gesture = "none"
-                
-                self.add_modern_overlay(frame, detected_gesture if detected_gesture in ["fist", "open_hand", "three"] else "none")
-                self.detector.draw_landmarks(frame, landmarks, width, height)
-            else:
-                self.update_gesture_display("none", 0.0)
-                self.add_modern_overlay(frame, "none")
-                gesture_stability_count = 0
-                self.current_gesture = "none"
-            
-            cv2.imshow('🎯 Gesture Navigator Pro - Caméra (3 Gestes)', frame)
-            
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+        self.add_modern_overlay(frame, packet.gesture)
+        if packet.landmarks is not None:
+            self.detector.draw_landmarks(frame, packet.landmarks, width, height)
+        
+        cv2.imshow('🎯 Gesture Navigator Pro - Caméra (3 Gestes)', frame)
         
-        self.stop_detection()
+        # 'q' arrête le pipeline
+        return cv2.waitKey(1) & 0xFF != ord('q')
     
     def add_modern_overlay(self, frame, gesture):
         """Overlay simple et épuré pour la caméra"""
@@ -639,10 +692,10 @@ class ModernGestureControllerGUI:
         # Point central
         cv2.circle(frame, (center_x, center_y), 3, (255, 255, 255), -1)
         
-        # Geste actuel - Simple texte en bas
-        if gesture in ["fist", "open_hand", "three"]:
-            gesture_names = {"fist": "POING", "open_hand": "MAIN OUVERTE", "three": "TROIS DOIGTS"}
-            gesture_text = gesture_names[gesture]
+        # Geste actuel - Simple texte en bas (gestes statiques : les flèches des balayages ne passent pas dans putText)
+        mapping = self.gesture_mapping
+        if gesture in mapping.allowed and gesture not in SWIPE_GESTURES:
+            gesture_text = mapping.labels[gesture].upper()
             
             # Texte centré en bas
             text_size = cv2.getTextSize(gesture_text, cv2.FONT_HERSHEY_SIMPLEX, 0.8, 2)[0]
@@ -9,6 +9,8 @@ from threading import Thread
 from config import GestureConfig
 from gesture_detector import GestureDetector
 from laser_mode import EnhancedPresentationController
+from frame_grabber import FrameGrabber
+from pipeline import GesturePipeline
 
 # ... [Classes ModernButton, AnimatedStatusBar, GestureVisualizer, LaserControlPanel déjà définies] ...
 
@@ -28,6 +30,8 @@ class ModernGestureControllerGUI:
         self.controller = EnhancedPresentationController()  # Utiliser la version améliorée
         
         self.cap = None
+        self.grabber = None
+        self.pipeline = None
         self.is_running = False
         self.video_thread = None
         
@@ -36,104 +40,65 @@ class ModernGestureControllerGUI:
     # ... [Méthodes setup_style, setup_modern_gui, create_header, etc. déjà définies] ...
     
     def video_loop(self):
-        """Boucle vidéo avec détection améliorée pour 3 gestes"""
-        gesture_count = 0
-        fps_counter = 0
-        last_fps_time = time.time()
-        last_gesture_time = 0
-        gesture_stability_count = 0
-        required_stability = 5  # Nombre de frames consécutives pour valider un geste
+        """Boucle vidéo : pipeline concurrent capture | inférence | classification + action | rendu"""
+        self.grabber = FrameGrabber(self.cap, reuse_buffers=self.config.reuse_frame_buffers).start()
+        self.pipeline = GesturePipeline(
+            self.config, self.detector, self.controller, self.grabber,
+            on_gesture=self.on_pipeline_gesture,
+            on_action=self.on_pipeline_action,
+            on_stats=self.on_pipeline_stats,
+            renderer=self.render_frame,
+        )
         
         try:
-            while self.is_running:
-                ret, frame = self.cap.read()
-                if not ret or not self.is_running:
-                    break
-                
-                fps_counter += 1
-                current_time = time.time()
-                
-                # Calcul FPS
-                if current_time - last_fps_time >= 1.0:
-                    fps = fps_counter / (current_time - last_fps_time)
-                    self.current_fps = fps
-                    if self.is_running:  # Vérifier avant de mettre à jour l'interface
-                        self.fps_label.config(text=f"FPS: {fps:.1f}")
-                    fps_counter = 0
-                    last_fps_time = current_time
-                
-                # Traitement
-                frame = cv2.flip(frame, 1)
-                height, width, _ = frame.shape
-                
-                landmarks = self.detector.get_landmarks(frame)
-                
-                if landmarks and self.is_running:
-                    detected_gesture = self.detector.detect_gesture(landmarks)
-                    
-                    # Filtrer pour ne garder que les 3 gestes autorisés
-                    if detected_gesture in ["fist", "open_hand", "three"]:
-                        # Calculer une confiance basée sur la stabilité de détection
-                        if detected_gesture == self.current_gesture:
-                            gesture_stability_count += 1
-                        else:
-                            gesture_stability_count = 1
-                            self.current_gesture = detected_gesture
-                        
-                        # Confiance basée sur la stabilité
-                        confidence = min(gesture_stability_count / required_stability, 1.0)
-                        
-                        # Seulement exécuter si le geste est stable ET assez de temps s'est écoulé
-                        if (gesture_stability_count >= required_stability and 
-                            current_time - last_gesture_time > self.config.gesture_cooldown and
-                            self.is_running):
-                            
-                            gesture_count += 1
-                            if self.is_running:  # Vérifier avant de mettre à jour
-                                self.gesture_count_label.config(text=f"Gestes: {gesture_count}")
-                            
-                            # Exécution du geste
-                            self.controller.execute_gesture_action(detected_gesture, self.config.gesture_cooldown)
-                            last_gesture_time = current_time
-                            
-                        if self.is_running:  # Vérifier avant de mettre à jour
-                            self.update_gesture_display(detected_gesture, confidence)
-                    else:
-                        # Geste non reconnu ou non autorisé
-                        if self.is_running:
-                            self.update_gesture_display("none", 0.0)
-                        gesture_stability_count = 0
-                        self.current_gesture = "none"
-                    
-                    if self.is_running:
-                        self.add_modern_overlay(frame, detected_gesture if detected_gesture in ["fist", "open_hand", "three"] else "none")
-                        self.detector.draw_landmarks(frame, landmarks, width, height)
-                else:
-                    if self.is_running:
-                        self.update_gesture_display("none", 0.0)
-                        self.add_modern_overlay(frame, "none")
-                    gesture_stability_count = 0
-                    self.current_gesture = "none"
-                
-                # Afficher seulement si on est encore en cours d'exécution
-                if self.is_running:
-                    cv2.imshow('🎯 Gesture Navigator Pro - Caméra (3 Gestes)', frame)
-                    
-                    # Vérifier les touches
-                    key = cv2.waitKey(1) & 0xFF
-                    if key == ord('q') or not self.is_running:
-                        break
-                else:
-                    break
+            self.pipeline.start()
+            while self.is_running and self.pipeline.is_running:
+                time.sleep(0.1)
         
         except Exception as e:
             print(f"Erreur dans la boucle vidéo: {e}")
         
         finally:
             # Nettoyage final
+            self.pipeline.stop()
+            self.grabber.stop()
             if self.cap:
                 self.cap.release()
             cv2.destroyAllWindows()
+    
+    def on_pipeline_gesture(self, gesture, confidence):
+        """Geste classifié par le pipeline"""
+        if self.is_running:  # Vérifier avant de mettre à jour l'interface
+            self.update_gesture_display(gesture, confidence)
+    
+    def on_pipeline_action(self, gesture, count):
+        """Geste validé et exécuté"""
+        if self.is_running:
+            self.gesture_count_label.config(text=f"Gestes: {count}")
+    
+    def on_pipeline_stats(self, fps, stats):
+        """FPS mesuré par le pipeline"""
+        self.current_fps = fps
+        if self.is_running:
+            self.fps_label.config(text=f"FPS: {fps:.1f}")
+    
+    def render_frame(self, packet):
+        """Étape de rendu : overlay et affichage"""
+        # Afficher seulement si on est encore en cours d'exécution
+        if not self.is_running:
+            return False
+        
+        frame = packet.frame
+        height, width = frame.shape[:2]
+        self.add_modern_overlay(frame, packet.gesture, packet.landmarks, width, height)
+        if packet.landmarks is not None:
+            self.detector.draw_landmarks(frame, packet.landmarks, width, height)
+        cv2.imshow('🎯 Gesture Navigator Pro - Caméra (3 Gestes)', frame)
+        
+        # Vérifier les touches
+        key = cv2.waitKey(1) & 0xFF
+        return key != ord('q') and self.is_running
+    
     def add_modern_overlay(self, frame, gesture, landmarks, width, height):
         """Ajoute un overlay moderne à la frame"""
         # Fond semi-transparent pour les infos
@@ -0,0 +1,108 @@
+"""
+Suivi de plusieurs mains avec des identifiants stables d'une frame à l'autre
+
+MediaPipe renvoie les mains dans un ordre quelconque : chaque détection est
+associée à la main suivie la plus proche (centre de la paume), puis une
+politique choisit la main qui contrôle la présentation.
+"""
+import numpy as np
+from typing import List, Optional, Sequence
+from landmark_features import palm_center, palm_size
+
+CONTROL_POLICIES = ("stable", "largest", "right", "left")
+
+class TrackedHand:
+    """Main suivie : identifiant, derniers landmarks, main gauche/droite"""
+    __slots__ = ("id", "landmarks", "handedness", "centroid", "size", "missed", "age")
+
+    def __init__(self, hand_id: int, landmarks: np.ndarray, handedness: Optional[str],
+                 centroid: Optional[np.ndarray] = None):
+        self.id = hand_id
+        self.missed = 0
+        self.age = 0
+        self.observe(landmarks, handedness, centroid)
+
+    def observe(self, landmarks: np.ndarray, handedness: Optional[str], centroid: Optional[np.ndarray] = None):
+        self.landmarks = landmarks
+        self.handedness = handedness
+        self.centroid = palm_center(landmarks) if centroid is None else centroid
+        self.size = float(palm_size(landmarks))
+        self.missed = 0
+        self.age += 1
+
+class HandTracker:
+    """Association par centre de paume le plus proche (glouton, N et M petits)
+
+    max_distance : déplacement maximal d'une frame à l'autre (coordonnées normalisées)
+    max_missed   : frames sans détection avant d'oublier une main
+    """
+
+    def __init__(self, policy: str = "stable", max_distance: float = 0.2, max_missed: int = 3):
+        if policy not in CONTROL_POLICIES:
+            raise ValueError(f"Politique inconnue: {policy} (choix: {', '.join(CONTROL_POLICIES)})")
+        self.policy = policy
+        self.max_distance = max_distance
+        self.max_missed = max_missed
+        self.tracks: List[TrackedHand] = []
+        self.control_id = None
+        self._next_id = 1
+
+    def update(self, hands: Sequence[np.ndarray], handedness: Sequence[Optional[str]] = ()) -> List[TrackedHand]:
+        """Associe les détections de la frame aux mains suivies ; retourne les mains visibles"""
+        labels = list(handedness) + [None] * (len(hands) - len(handedness))
+        matched_tracks, matched_hands = set(), set()
+        centroids = palm_center(np.stack(hands)) if len(hands) else None
+
+        if self.tracks and centroids is not None:
+            previous = np.array([track.centroid for track in self.tracks])
+            distances = np.linalg.norm(previous[:, None, :] - centroids[None, :, :], axis=2)
+            for flat_index in np.argsort(distances, axis=None):
+                track_index, hand_index = divmod(int(flat_index), len(hands))
+                if distances[track_index, hand_index] > self.max_distance:
+                    break
+                if track_index in matched_tracks or hand_index in matched_hands:
+                    continue
+                self.tracks[track_index].observe(hands[hand_index], labels[hand_index], centroids[hand_index])
+                matched_tracks.add(track_index)
+                matched_hands.add(hand_index)
+
+        # Mains non revues : oubliées après max_missed frames
+        for index, track in enumerate(self.tracks):
+            if index not in matched_tracks:
+                track.missed += 1
+        self.tracks = [track for track in self.tracks if track.missed <= self.max_missed]
+
+        for index, hand in enumerate(hands):
+            if index not in matched_hands:
+                self.tracks.append(TrackedHand(self._next_id, hand, labels[index], centroids[index]))
+                self._next_id += 1
+
+        return self.visible()
+
+    def visible(self) -> List[TrackedHand]:
+        return [track for track in self.tracks if track.missed == 0]
+
+    def control_hand(self) -> Optional[TrackedHand]:
+        """Main qui contrôle la présentation selon la politique
+
+        stable  : la main en contrôle le garde tant qu'elle est suivie (sinon la plus grande)
+        largest : la plus grande (la plus proche de la caméra) à chaque frame
+        right / left : uniquement cette main (la plus grande si plusieurs)
+        """
+        visible = self.visible()
+        if self.policy in ("right", "left"):
+            visible = [track for track in visible if track.handedness == self.policy.capitalize()]
+        if not visible:
+            return None
+
+        if self.policy == "stable":
+            for track in visible:
+                if track.id == self.control_id:
+                    return track
+        hand = max(visible, key=lambda track: track.size)
+        self.control_id = hand.id
+        return hand
+
+    def reset(self):
+        self.tracks = []
+        self.control_id = None
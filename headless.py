@@ -0,0 +1,177 @@
+"""
+Mode sans interface : détection et contrôle de présentation sans Tk ni fenêtre OpenCV
+
+Usage:
+    python headless.py --source 0 --stats-interval 5
+    python main.py --headless
+"""
+import argparse
+import signal
+import time
+from threading import Event
+from config import GestureConfig
+from frame_grabber import FrameGrabber
+from frame_sources import open_frame_source
+from gesture_detector import GestureDetector
+from input_backends import INPUT_BACKENDS, backend_from_config
+from pipeline import GesturePipeline
+from presentation_controller import PresentationController
+
+class HeadlessRunner:
+    """Exécute le pipeline de détection sans aucun travail d'affichage"""
+
+    def __init__(self, config: GestureConfig, stats_interval: float = 5.0):
+        self.config = config
+        self.stats_interval = stats_interval
+        self.detector = GestureDetector(config)
+        self.controller = PresentationController(
+            backend_from_config(config), coalesce_window=config.navigation_coalesce_window,
+            slide_count=config.slide_count)
+        self.stop_event = Event()
+        self.pipeline = None
+
+    def handle_signal(self, signum, frame):
+        """SIGINT / SIGTERM : arrêt propre"""
+        print(f"\n⚠️  Signal {signal.Signals(signum).name} reçu, arrêt en cours...")
+        self.stop_event.set()
+
+    def print_stats(self, elapsed: float):
+        """Affiche le débit et l'état de chaque étape"""
+        stats = self.pipeline.get_stats()
+        name, service_ms = self.pipeline.bottleneck()
+        stages = " | ".join(
+            f"{stage}: {values['service_ms']:.1f} ms, file {values['queue_depth']}, perdues {values['dropped']}"
+            for stage, values in stats.items()
+        )
+        print(f"[{elapsed:7.1f}s] {self.pipeline.fps:5.1f} FPS | gestes: {self.pipeline.gesture_count} | "
+              f"goulot: {name} ({service_ms:.1f} ms)", flush=True)
+        print(f"           {stages}", flush=True)
+        print(f"           latence geste -> action: {self.pipeline.action_latency.summary()}", flush=True)
+        if self.pipeline.dispatcher is not None:
+            print(f"           {self.pipeline.dispatcher.summary()}", flush=True)
+        gate = self.pipeline.motion_gate
+        if gate is not None:
+            print(f"           frames sans inférence (scène immobile): {gate.skipped}/{gate.frames} "
+                  f"({gate.skip_fraction:.1%})", flush=True)
+        if self.pipeline.idle is not None:
+            print(f"           {self.pipeline.idle.format()}", flush=True)
+        if self.detector.tuner is not None and not self.config.inference_process:
+            print(f"           MediaPipe: {self.detector.tuner.current.describe()}", flush=True)
+
+    def run(self) -> int:
+        """Lance la détection jusqu'à un signal ou la fin de la source"""
+        source = open_frame_source(self.config.video_source, realtime=True)
+        if not source.isOpened():
+            print(f"❌ Impossible d'ouvrir la source: {self.config.video_source}")
+            return 1
+
+        worker = None
+        if self.config.inference_process:
+            from inference_worker import InferenceWorker
+            worker = InferenceWorker(self.config).start()
+
+        grabber = FrameGrabber(source, reuse_buffers=self.config.reuse_frame_buffers).start()
+        self.pipeline = GesturePipeline(
+            self.config, self.detector, self.controller, grabber,
+            landmark_source=worker,
+            on_action=lambda gesture, count: print(f"✅ Geste #{count}: {gesture}", flush=True),
+            on_stop=self.stop_event.set,
+        )
+
+        previous_handlers = {
+            signum: signal.signal(signum, self.handle_signal)
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+
+        print(f"🚀 Détection sans interface démarrée (source: {self.config.video_source})", flush=True)
+        start_time = time.time()
+        self.pipeline.start()
+        try:
+            while not self.stop_event.wait(self.stats_interval):
+                self.print_stats(time.time() - start_time)
+        finally:
+            self.pipeline.stop()
+            grabber.stop()
+            if worker:
+                worker.stop()
+            source.release()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+        self.print_stats(time.time() - start_time)
+        if self.pipeline.action_latency.count:
+            print(self.pipeline.action_latency.format(), flush=True)
+        print("⏹ Détection arrêtée", flush=True)
+        return 0
+
+def run_headless(source: str = GestureConfig.video_source, stats_interval: float = 5.0,
+                 inference_process: bool = False, swipe_gestures: bool = False,
+                 input_backend: str = GestureConfig.input_backend,
+                 mapping_file: str = GestureConfig.gesture_mapping_file,
+                 max_num_hands: int = GestureConfig.max_num_hands, **settings) -> int:
+    """Construit la configuration (mêmes réglages que l'interface) et lance le mode sans interface
+
+    settings : autres champs de GestureConfig (options de détection activées en ligne de commande)
+    """
+    config = GestureConfig(
+        min_detection_confidence=0.8,
+        min_tracking_confidence=0.8,
+        gesture_cooldown=1.5,
+        video_source=source,
+        inference_process=inference_process,
+        mirror_mode="landmarks",  # Pas d'aperçu : inutile de retourner chaque frame
+        swipe_gestures=swipe_gestures,
+        input_backend=input_backend,
+        gesture_mapping_file=mapping_file,
+        max_num_hands=max_num_hands,
+        **settings,
+    )
+    return HeadlessRunner(config, stats_interval=stats_interval).run()
+
+def main():
+    """Point d'entrée du mode sans interface"""
+    parser = argparse.ArgumentParser(description="Contrôleur gestuel sans interface")
+    parser.add_argument("--source", default=GestureConfig.video_source,
+                        help="Index caméra, fichier vidéo, dossier d'images ou synthetic[:N]")
+    parser.add_argument("--stats-interval", type=float, default=5.0,
+                        help="Intervalle d'affichage des statistiques (secondes)")
+    parser.add_argument("--inference-process", action="store_true",
+                        help="MediaPipe dans un processus séparé")
+    parser.add_argument("--swipes", action="store_true",
+                        help="Balayages gauche / droite pour changer de slide")
+    parser.add_argument("--input-backend", choices=INPUT_BACKENDS, default=GestureConfig.input_backend,
+                        help="Injection des touches (xtest / uinput : sans pause, dépendances optionnelles)")
+    parser.add_argument("--mapping", default=GestureConfig.gesture_mapping_file,
+                        help="Fichier JSON geste -> action, rechargé à chaud quand il change")
+    parser.add_argument("--max-hands", type=int, default=GestureConfig.max_num_hands,
+                        help="Mains suivies (au-delà de 1 : une seule main contrôle, voir control_hand_policy)")
+    parser.add_argument("--adaptive-stability", action="store_true",
+                        help="Frames de validation selon la netteté du geste (au lieu d'un nombre fixe)")
+    parser.add_argument("--smoothing", action="store_true",
+                        help="Filtre One-Euro sur les landmarks (moins de gigue, léger retard)")
+    parser.add_argument("--auto-tune", action="store_true",
+                        help="Allège ou alourdit MediaPipe pendant l'exécution selon le temps d'inférence mesuré")
+    parser.add_argument("--motion-gating", action="store_true",
+                        help="Inférence sautée tant que la scène est immobile et sans main")
+    parser.add_argument("--async-actions", action="store_true",
+                        help="Touches injectées par un thread dédié, hors de la boucle de détection")
+    parser.add_argument("--coalesce-window", type=float, default=0.0,
+                        help="Fenêtre (s) de regroupement des slides suivante / précédente (0 = désactivé)")
+    parser.add_argument("--slide-count", type=int, default=0,
+                        help="Nombre de slides (0 = inconnu) : permet le saut direct d'une rafale après un F5 du contrôleur")
+    parser.add_argument("--idle-mode", action="store_true",
+                        help="Capture ralentie (idle_fps) après idle_after secondes sans main visible")
+    args = parser.parse_args()
+    return run_headless(args.source, args.stats_interval, args.inference_process, args.swipes,
+                        args.input_backend, args.mapping, args.max_hands,
+                        adaptive_stability=args.adaptive_stability,
+                        landmark_smoothing=args.smoothing,
+                        auto_tune_inference=args.auto_tune,
+                        motion_gating=args.motion_gating,
+                        async_actions=args.async_actions,
+                        navigation_coalesce_window=args.coalesce_window,
+                        slide_count=args.slide_count,
+                        idle_mode=args.idle_mode)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
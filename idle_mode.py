@@ -0,0 +1,101 @@
+"""
+Mode veille : cadence de capture réduite quand aucune main n'est visible
+
+Après `idle_after` secondes sans main, la capture (et donc l'inférence)
+descend à `idle_fps` ; la première main détectée rétablit la cadence
+normale. Le temps CPU du processus est comptabilisé séparément dans chaque
+état pour mesurer l'économie réelle.
+"""
+import time
+from threading import Lock
+from typing import Callable, Optional
+
+class IdleController:
+    """Bascule actif / veille de la capture
+
+    grabber : objet exposant set_frame_rate(fps) (FrameGrabber)
+    """
+
+    def __init__(self, grabber, idle_after: float = 10.0, idle_fps: float = 5.0,
+                 active_fps: Optional[float] = None, clock: Callable[[], float] = time.time,
+                 cpu_clock: Callable[[], float] = time.process_time):
+        self.grabber = grabber
+        self.idle_after = idle_after
+        self.idle_fps = idle_fps
+        self.active_fps = active_fps
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+
+        now = clock()
+        self._lock = Lock()  # update() dans l'étape d'inférence, stats() depuis l'interface
+        self.idle = False
+        self.transitions = 0
+        self._last_hand_time = now
+        self._state_start = now
+        self._state_cpu_start = cpu_clock()
+        # Temps écoulé et temps CPU cumulés par état
+        self._wall = {False: 0.0, True: 0.0}
+        self._cpu = {False: 0.0, True: 0.0}
+
+    def update(self, hand_present: bool, now: Optional[float] = None) -> bool:
+        """Met à jour l'état après une frame ; retourne True si l'état a changé"""
+        if now is None:
+            now = self.clock()
+        if hand_present:
+            self._last_hand_time = now
+            if self.idle:
+                self._switch(False, now)
+                return True
+        elif not self.idle and now - self._last_hand_time >= self.idle_after:
+            self._switch(True, now)
+            return True
+        return False
+
+    def _switch(self, idle: bool, now: float):
+        with self._lock:
+            self._close_period(now)
+            self.idle = idle
+            self.transitions += 1
+        self.grabber.set_frame_rate(self.idle_fps if idle else self.active_fps)
+        if idle:
+            print(f"💤 Veille : capture à {self.idle_fps:g} FPS (aucune main depuis {self.idle_after:g} s)", flush=True)
+        else:
+            print("⚡ Main détectée : cadence normale", flush=True)
+
+    def _close_period(self, now: float):
+        """Ajoute la période en cours aux cumuls de l'état courant"""
+        cpu_now = self.cpu_clock()
+        now = max(now, self._state_start)  # Horodatage de frame légèrement antérieur à stats()
+        self._wall[self.idle] += now - self._state_start
+        self._cpu[self.idle] += cpu_now - self._state_cpu_start
+        self._state_start, self._state_cpu_start = now, cpu_now
+
+    def stats(self, now: Optional[float] = None) -> dict:
+        """Part du temps en veille, charge CPU par état et économie estimée"""
+        with self._lock:
+            self._close_period(self.clock() if now is None else now)
+            wall, cpu = dict(self._wall), dict(self._cpu)
+        total = wall[False] + wall[True]
+        load = {state: cpu[state] / wall[state] if wall[state] > 0 else None for state in (False, True)}
+        idle_fraction = wall[True] / total if total > 0 else 0.0
+
+        # Économie : temps de veille qui aurait coûté la charge active
+        saved = 0.0
+        if load[False] and load[True] is not None:
+            saved = idle_fraction * max(0.0, 1.0 - load[True] / load[False])
+        return {
+            "idle": self.idle,
+            "idle_fraction": idle_fraction,
+            "active_cpu": load[False],
+            "idle_cpu": load[True],
+            "cpu_saved": saved,
+            "transitions": self.transitions,
+        }
+
+    def format(self) -> str:
+        stats = self.stats()
+        if stats["idle_cpu"] is None:
+            return "veille jamais atteinte" if not stats["idle"] else "veille en cours"
+        active = f"{stats['active_cpu']:.0%}" if stats["active_cpu"] is not None else "--"
+        return (f"veille {stats['idle_fraction']:.0%} du temps | CPU actif {active}, "
+                f"veille {stats['idle_cpu']:.0%} | économie {stats['cpu_saved']:.0%}")
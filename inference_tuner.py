@@ -0,0 +1,115 @@
+"""
+Réglage automatique de MediaPipe selon le temps d'inférence mesuré
+
+Le détecteur démarre avec les réglages configurés (les plus lourds) ; si le
+temps d'inférence médian dépasse le budget par frame, Hands est reconstruit
+avec un niveau plus léger. Quand la marge redevient confortable pendant
+assez longtemps, le niveau remonte. Chaque changement est journalisé avec
+sa raison.
+"""
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+from config import GestureConfig
+
+@dataclass(frozen=True)
+class TuningLevel:
+    """Réglages passés à mp.solutions.hands.Hands"""
+    name: str
+    model_complexity: int
+    min_detection_confidence: float
+    min_tracking_confidence: float
+
+    def describe(self) -> str:
+        return (f"{self.name} (complexité {self.model_complexity}, détection "
+                f"{self.min_detection_confidence:.2f}, suivi {self.min_tracking_confidence:.2f})")
+
+def tuning_levels(config: GestureConfig) -> List[TuningLevel]:
+    """Niveaux du plus léger au plus lourd ; le plus lourd correspond à la configuration
+
+    Le modèle léger (complexité 0) réduit le coût du modèle de landmarks ; un
+    seuil de suivi plus bas limite les relances du détecteur de paume, l'étape
+    la plus coûteuse.
+    """
+    detection = config.min_detection_confidence
+    tracking = config.min_tracking_confidence
+    levels = [
+        TuningLevel("léger", 0, detection, min(tracking, 0.4)),
+        TuningLevel("intermédiaire", 0, detection, tracking),
+    ]
+    if config.model_complexity > 0:
+        levels.append(TuningLevel("complet", config.model_complexity, detection, tracking))
+    return levels
+
+class InferenceTuner:
+    """Choisit le niveau de réglage à partir des temps d'inférence récents
+
+    budget_ms : temps d'inférence visé par frame
+    window    : nombre de mesures avant une décision (médiane de la fenêtre)
+    headroom  : la médiane doit descendre sous budget * headroom pour remonter
+    hold      : délai minimal (s) entre deux changements vers un niveau plus lourd
+    settle    : mesures ignorées après une reconstruction (premier passage lent)
+    """
+
+    def __init__(self, levels: Sequence[TuningLevel], budget_ms: float, window: int = 15,
+                 headroom: float = 0.6, hold: float = 10.0, settle: int = 3,
+                 clock: Callable[[], float] = time.monotonic):
+        if not levels:
+            raise ValueError("Au moins un niveau de réglage est requis")
+        self.levels = list(levels)
+        self.budget_ms = budget_ms
+        self.headroom = headroom
+        self.hold = hold
+        self.settle = settle
+        self.clock = clock
+        self.samples = deque(maxlen=window)
+        self.level = len(self.levels) - 1
+        self.cost_ratios = {}  # Coût du niveau n+1 / coût du niveau n, mesuré à la descente
+        self._heavier_cost = None
+        self.switches = []  # (instant, ancien niveau, nouveau niveau, raison)
+        self._skip = settle
+        self._last_switch = clock()
+
+    @property
+    def current(self) -> TuningLevel:
+        return self.levels[self.level]
+
+    def record(self, elapsed_ms: float) -> Optional[TuningLevel]:
+        """Ajoute une mesure ; retourne le nouveau niveau à appliquer ou None"""
+        if self._skip:
+            self._skip -= 1
+            return None
+        self.samples.append(elapsed_ms)
+        if len(self.samples) < self.samples.maxlen:
+            return None
+
+        median = sorted(self.samples)[len(self.samples) // 2]
+        now = self.clock()
+        if self._heavier_cost is not None:
+            self.cost_ratios[self.level] = self._heavier_cost / max(median, 1e-3)
+            self._heavier_cost = None
+
+        if median > self.budget_ms and self.level > 0:
+            self._heavier_cost = median
+            return self._switch(self.level - 1, now,
+                                f"médiane {median:.1f} ms > budget {self.budget_ms:.1f} ms")
+
+        if (self.level < len(self.levels) - 1 and median < self.budget_ms * self.headroom
+                and now - self._last_switch >= self.hold):
+            # Coût prévu du niveau supérieur d'après l'écart mesuré à la descente
+            predicted = median * self.cost_ratios.get(self.level, 1.0)
+            if predicted <= self.budget_ms * 0.9:
+                return self._switch(self.level + 1, now,
+                                    f"médiane {median:.1f} ms, {predicted:.1f} ms prévus au niveau supérieur")
+        return None
+
+    def _switch(self, level: int, now: float, reason: str) -> TuningLevel:
+        previous = self.current
+        self.level = level
+        self.samples.clear()
+        self._skip = self.settle
+        self._last_switch = now
+        self.switches.append((now, previous.name, self.current.name, reason))
+        print(f"⚙️  MediaPipe: {previous.name} -> {self.current.describe()} ({reason})", flush=True)
+        return self.current
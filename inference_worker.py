@@ -0,0 +1,191 @@
+"""
+Inférence MediaPipe dans un processus séparé - frames transmises par mémoire partagée
+"""
+import multiprocessing as mp
+import queue
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from threading import Thread
+from typing import Optional, Tuple
+from config import GestureConfig
+
+def _worker_main(config: GestureConfig, shm_name: str, frame_shape: Tuple[int, ...],
+                 slot_count: int, requests, results):
+    """Boucle du processus d'inférence (aucun pixel ne passe par pickle)"""
+    from gesture_detector import GestureDetector
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slots = np.ndarray((slot_count,) + tuple(frame_shape), dtype=np.uint8, buffer=shm.buf)
+    detector = GestureDetector(config)
+    results.put(("ready", None, None, 0.0, None))
+
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            frame_id, slot = request
+
+            start = time.perf_counter()
+            landmarks = detector.get_landmarks(slots[slot])
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            # Résultat compact : le tableau (21, 3) float32 du détecteur et la main qui contrôle
+            results.put((frame_id, slot, landmarks, elapsed_ms, detector.control_hand_id))
+    finally:
+        del slots
+        shm.close()
+
+class InferenceWorker:
+    """Processus d'inférence MediaPipe isolé du GIL de l'interface
+
+    Les frames sont copiées dans des emplacements circulaires de mémoire
+    partagée ; seul l'index de l'emplacement transite par la file de requêtes
+    et seuls les landmarks (21x3 float32) reviennent.
+    """
+
+    def __init__(self, config: GestureConfig, slot_count: int = 3, startup_timeout: float = 30.0):
+        self.config = config
+        self.slot_count = slot_count
+        self.startup_timeout = startup_timeout
+        self.frame_shape = None
+        self.process = None
+        self.shm = None
+        self.slots = None
+        self.requests = None
+        self.results = None
+        self.free_slots = []
+        self.next_frame_id = 0
+        self._restart_thread = None
+        self.control_hand_id = None  # Comme GestureDetector : main de contrôle du dernier résultat
+
+        # Statistiques
+        self.frames_submitted = 0
+        self.frames_rejected = 0
+        self.inference_time_ms = 0.0
+
+    def start(self, frame_shape: Tuple[int, ...] = (480, 640, 3)):
+        """Alloue la mémoire partagée et lance le processus"""
+        if self.process is not None:
+            return self
+
+        self.frame_shape = tuple(frame_shape)
+        frame_size = int(np.prod(self.frame_shape))
+        self.shm = shared_memory.SharedMemory(create=True, size=frame_size * self.slot_count)
+        self.slots = np.ndarray((self.slot_count,) + self.frame_shape, dtype=np.uint8, buffer=self.shm.buf)
+        self.free_slots = list(range(self.slot_count))
+
+        # "spawn" : pas de fork d'un processus qui contient déjà des threads Tk/OpenCV
+        context = mp.get_context("spawn")
+        self.requests = context.Queue()
+        self.results = context.Queue()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(self.config, self.shm.name, self.frame_shape, self.slot_count, self.requests, self.results),
+            daemon=True,
+        )
+        self.process.start()
+
+        try:
+            self.results.get(timeout=self.startup_timeout)
+        except queue.Empty:
+            self.stop()
+            raise RuntimeError("Le processus d'inférence n'a pas démarré")
+        return self
+
+    @property
+    def restarting(self) -> bool:
+        return self._restart_thread is not None and self._restart_thread.is_alive()
+
+    def _restart(self, frame_shape: Tuple[int, ...]):
+        try:
+            self.stop()
+            self.start(frame_shape)
+        except Exception as e:
+            print(f"❌ Relance du processus d'inférence impossible: {e}", flush=True)
+
+    def submit(self, frame) -> Optional[int]:
+        """Copie la frame dans un emplacement libre ; retourne son identifiant (None si tout est occupé)"""
+        if self.restarting:
+            self.frames_rejected += 1
+            return None
+        if self.process is None or frame.shape != self.frame_shape:
+            # (Re)lancement pour cette résolution dans un thread : jusqu'à startup_timeout
+            # secondes, l'étape d'inférence continue sans résultats au lieu de se bloquer
+            self._restart_thread = Thread(target=self._restart, args=(frame.shape,),
+                                          name="inference-restart", daemon=True)
+            self._restart_thread.start()
+            self.frames_rejected += 1
+            return None
+
+        if not self.free_slots:
+            self.frames_rejected += 1
+            return None
+
+        slot = self.free_slots.pop(0)
+        np.copyto(self.slots[slot], frame)
+        frame_id = self.next_frame_id
+        self.next_frame_id += 1
+        self.requests.put((frame_id, slot))
+        self.frames_submitted += 1
+        return frame_id
+
+    def poll(self, timeout: float = 0.0) -> Optional[Tuple[int, Optional[np.ndarray]]]:
+        """Retourne le prochain résultat disponible (frame_id, landmarks) ou None"""
+        try:
+            frame_id, slot, array, elapsed_ms, control_hand_id = self.results.get(timeout=timeout) if timeout > 0 \
+                else self.results.get_nowait()
+        except queue.Empty:
+            if not self.process.is_alive():
+                raise RuntimeError("Le processus d'inférence s'est arrêté")
+            return None
+
+        self.free_slots.append(slot)
+        self.control_hand_id = control_hand_id
+        self.inference_time_ms = 0.8 * self.inference_time_ms + 0.2 * elapsed_ms
+        return frame_id, array
+
+    def _reclaim_slots(self, timeout: float):
+        """Résultats des requêtes abandonnées (délai dépassé) : leur emplacement redevient libre"""
+        while self.poll() is not None:
+            pass
+        deadline = time.time() + timeout
+        while not self.free_slots and time.time() < deadline:
+            self.poll(timeout=max(deadline - time.time(), 0.001))
+
+    def get_landmarks(self, image, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """Équivalent synchrone de GestureDetector.get_landmarks"""
+        if self.process is not None and not self.restarting:
+            # Appel synchrone : tout résultat en attente appartient à une requête abandonnée
+            self._reclaim_slots(timeout)
+        frame_id = self.submit(image)
+        if frame_id is None:
+            return None
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            result = self.poll(timeout=max(deadline - time.time(), 0.001))
+            if result is None or result[0] != frame_id:
+                continue  # Résultat périmé d'une requête abandonnée
+            return result[1]
+        return None
+
+    def stop(self, timeout: float = 2.0):
+        """Arrête proprement le processus et libère la mémoire partagée"""
+        if self.process is not None:
+            try:
+                self.requests.put(None)
+            except (OSError, ValueError):
+                pass
+            self.process.join(timeout=timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout=timeout)
+            self.process = None
+
+        if self.shm is not None:
+            self.slots = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
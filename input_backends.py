@@ -0,0 +1,245 @@
+"""
+Backends d'injection de touches pour PresentationController
+
+Les touches sont nommées comme dans pyautogui ("right", "left", "f5",
+"escape", "enter", "ctrl", un caractère). Chaque backend les traduit :
+- pyautogui : portable, mais PAUSE après chaque appel et surcoût par appel
+- xtest     : extension XTEST du serveur X11 (python-xlib), sans pause
+- uinput    : clavier virtuel du noyau Linux (python-evdev, accès à /dev/uinput)
+- socket    : envoi des commandes à un processus local (tests, démonstrations)
+"""
+import socket
+import time
+from abc import ABC, abstractmethod
+from threading import Condition, Thread
+from typing import List, Optional, Tuple
+from config import GestureConfig
+
+INPUT_BACKENDS = ("pyautogui", "xtest", "uinput", "socket")
+
+class InputBackend(ABC):
+    """Interface commune : press / hotkey / write à partir de key_down / key_up"""
+    name = "abstract"
+
+    @abstractmethod
+    def key_down(self, key: str):
+        """Enfonce une touche (nom pyautogui)"""
+
+    @abstractmethod
+    def key_up(self, key: str):
+        """Relâche une touche (nom pyautogui)"""
+
+    def flush(self):
+        """Garantit que les événements ont quitté le processus"""
+
+    def press(self, key: str):
+        self.key_down(key)
+        self.key_up(key)
+        self.flush()
+
+    def hotkey(self, *keys: str):
+        for key in keys:
+            self.key_down(key)
+        for key in reversed(keys):
+            self.key_up(key)
+        self.flush()
+
+    def write(self, text: str):
+        for char in text:
+            self.key_down(char)
+            self.key_up(char)
+        self.flush()
+
+    def close(self):
+        pass
+
+class PyAutoGUIBackend(InputBackend):
+    """pyautogui ; pause = pyautogui.PAUSE appliquée après chaque appel (None = inchangée)"""
+    name = "pyautogui"
+
+    def __init__(self, pause: Optional[float] = None):
+        import pyautogui
+        self.pyautogui = pyautogui
+        # Désactiver le fail-safe de pyautogui pour éviter les interruptions
+        pyautogui.FAILSAFE = False
+        if pause is not None:
+            pyautogui.PAUSE = pause
+
+    def key_down(self, key: str):
+        self.pyautogui.keyDown(key)
+
+    def key_up(self, key: str):
+        self.pyautogui.keyUp(key)
+
+    def press(self, key: str):
+        self.pyautogui.press(key)
+
+    def hotkey(self, *keys: str):
+        self.pyautogui.hotkey(*keys)
+
+    def write(self, text: str):
+        self.pyautogui.write(text)
+
+# Noms pyautogui -> keysyms X11 (les caractères simples sont leur propre keysym)
+X11_KEYSYMS = {"right": "Right", "left": "Left", "up": "Up", "down": "Down", "enter": "Return",
+               "escape": "Escape", "esc": "Escape", "ctrl": "Control_L", "shift": "Shift_L",
+               "alt": "Alt_L", "space": "space", "f5": "F5"}
+
+class XTestBackend(InputBackend):
+    """Injection directe par l'extension XTEST (un aller-retour X11 par touche, aucune pause)"""
+    name = "xtest"
+
+    def __init__(self, display: Optional[str] = None):
+        from Xlib import X, XK, display as xdisplay
+        from Xlib.ext import xtest
+        self._X, self._XK, self._xtest = X, XK, xtest
+        self.display = xdisplay.Display(display)
+        if not self.display.has_extension("XTEST"):
+            raise RuntimeError("Extension XTEST absente du serveur X")
+        self._keycodes = {}
+
+    def _keycode(self, key: str) -> int:
+        keycode = self._keycodes.get(key)
+        if keycode is None:
+            keysym = self._XK.string_to_keysym(X11_KEYSYMS.get(key.lower(), key))
+            keycode = self.display.keysym_to_keycode(keysym)
+            if not keycode:
+                raise ValueError(f"Touche inconnue pour X11: {key}")
+            self._keycodes[key] = keycode
+        return keycode
+
+    def key_down(self, key: str):
+        self._xtest.fake_input(self.display, self._X.KeyPress, self._keycode(key))
+
+    def key_up(self, key: str):
+        self._xtest.fake_input(self.display, self._X.KeyRelease, self._keycode(key))
+
+    def flush(self):
+        self.display.sync()
+
+    def close(self):
+        self.display.close()
+
+# Noms pyautogui -> codes evdev (positions physiques : les chiffres suivent la disposition du clavier)
+UINPUT_KEYS = {"right": "KEY_RIGHT", "left": "KEY_LEFT", "up": "KEY_UP", "down": "KEY_DOWN",
+               "enter": "KEY_ENTER", "escape": "KEY_ESC", "esc": "KEY_ESC", "ctrl": "KEY_LEFTCTRL",
+               "shift": "KEY_LEFTSHIFT", "alt": "KEY_LEFTALT", "space": "KEY_SPACE", "f5": "KEY_F5"}
+
+class UInputBackend(InputBackend):
+    """Clavier virtuel uinput : fonctionne aussi sous Wayland et en console"""
+    name = "uinput"
+
+    def __init__(self, device_name: str = "gesture-controller"):
+        from evdev import UInput, ecodes
+        self._ecodes = ecodes
+        names = list(UINPUT_KEYS.values()) + [f"KEY_{char}" for char in "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"]
+        self.device = UInput({ecodes.EV_KEY: [ecodes.ecodes[name] for name in names]}, name=device_name)
+
+    def _code(self, key: str) -> int:
+        name = UINPUT_KEYS.get(key.lower(), f"KEY_{key.upper()}")
+        code = self._ecodes.ecodes.get(name)
+        if code is None:
+            raise ValueError(f"Touche inconnue pour uinput: {key}")
+        return code
+
+    def key_down(self, key: str):
+        self.device.write(self._ecodes.EV_KEY, self._code(key), 1)
+
+    def key_up(self, key: str):
+        self.device.write(self._ecodes.EV_KEY, self._code(key), 0)
+
+    def flush(self):
+        self.device.syn()
+
+    def close(self):
+        self.device.close()
+
+class SocketBackend(InputBackend):
+    """Envoie une ligne texte par commande ("press right") à un processus local"""
+    name = "socket"
+
+    def __init__(self, address: str = "127.0.0.1:8765", timeout: float = 1.0):
+        host, port = address.rsplit(":", 1)
+        self.sock = socket.create_connection((host, int(port)), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # Pas d'agrégation de Nagle
+        self._sequence = 0
+
+    def _send(self, command: str, *args: str):
+        self._sequence += 1
+        self.sock.sendall(f"{self._sequence} {command} {' '.join(args)}\n".encode())
+
+    def key_down(self, key: str):
+        self._send("down", key)
+
+    def key_up(self, key: str):
+        self._send("up", key)
+
+    def press(self, key: str):
+        self._send("press", key)
+
+    def hotkey(self, *keys: str):
+        self._send("hotkey", *keys)
+
+    def write(self, text: str):
+        self._send("write", text)
+
+    def close(self):
+        self.sock.close()
+
+class KeyEventServer:
+    """Récepteur local pour SocketBackend : horodate chaque commande reçue (perf_counter)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = socket.create_server((host, port))
+        self.address = "%s:%d" % self.server.getsockname()[:2]
+        self.events: List[Tuple[float, int, str, Tuple[str, ...]]] = []  # (réception, n°, commande, args)
+        self._condition = Condition()
+        self._thread = Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        try:
+            connection, _ = self.server.accept()
+        except OSError:
+            return
+        with connection:
+            buffer = b""
+            while True:
+                try:
+                    data = connection.recv(4096)
+                except OSError:
+                    return
+                if not data:
+                    return
+                received = time.perf_counter()
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                with self._condition:
+                    for line in lines:
+                        sequence, command, *args = line.decode().split(" ")
+                        self.events.append((received, int(sequence), command, tuple(arg for arg in args if arg)))
+                    self._condition.notify_all()
+
+    def wait_for(self, count: int, timeout: float = 1.0) -> bool:
+        """Attend que `count` commandes aient été reçues"""
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self.events) >= count, timeout)
+
+    def close(self):
+        self.server.close()
+
+def create_backend(name: str = "pyautogui", pause: Optional[float] = None,
+                   address: str = "127.0.0.1:8765") -> InputBackend:
+    """Instancie un backend par son nom (les dépendances optionnelles sont importées ici)"""
+    if name == "pyautogui":
+        return PyAutoGUIBackend(pause)
+    if name == "xtest":
+        return XTestBackend()
+    if name == "uinput":
+        return UInputBackend()
+    if name == "socket":
+        return SocketBackend(address)
+    raise ValueError(f"Backend inconnu: {name} (choix: {', '.join(INPUT_BACKENDS)})")
+
+def backend_from_config(config: GestureConfig) -> InputBackend:
+    return create_backend(config.input_backend, config.input_pause, config.input_address)
@@ -0,0 +1,93 @@
+"""
+Lissage des landmarks : filtre One-Euro vectorisé
+
+Passe-bas adaptatif (Casiez et al., 2012) : coupure basse quand la main est
+immobile (supprime la gigue), plus haute quand elle bouge (limite le
+retard). Les 21x3 coordonnées sont filtrées en quelques opérations NumPy
+par frame, dans des tableaux d'état préalloués.
+"""
+import math
+import numpy as np
+from typing import Optional
+
+class OneEuroFilter:
+    """Filtre One-Euro appliqué en bloc à un tableau de landmarks (21, 3)
+
+    min_cutoff : fréquence de coupure au repos (Hz) - plus bas = plus lisse
+    beta       : augmentation de la coupure avec la vitesse (s/unité normalisée)
+    d_cutoff   : coupure appliquée à l'estimation de la vitesse (Hz)
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 10.0, d_cutoff: float = 1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        """Oublie l'état (main perdue) : la prochaine frame passe telle quelle"""
+        self._value = None
+        self._derivative = None
+        self._scratch = None
+        self._alpha = None
+        self._last_time = None
+
+    @staticmethod
+    def _smoothing_factor(dt: float, cutoff):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        """Retourne une copie filtrée des landmarks de la frame (l'entrée n'est pas modifiée)"""
+        if self._value is None:
+            self._value = points.astype(np.float32, copy=True)
+            self._derivative = np.zeros_like(self._value)
+            self._scratch = np.empty_like(self._value)
+            self._alpha = np.empty_like(self._value)
+            self._last_time = timestamp
+            return self._value.copy()
+
+        dt = timestamp - self._last_time
+        if dt <= 0:
+            return self._value.copy()
+        self._last_time = timestamp
+
+        # Vitesse filtrée : d = d + a_d * ((x - x_prev) / dt - d)
+        scratch, alpha = self._scratch, self._alpha
+        np.subtract(points, self._value, out=scratch)
+        scratch /= dt
+        scratch -= self._derivative
+        scratch *= self._smoothing_factor(dt, self.d_cutoff)
+        self._derivative += scratch
+
+        # Coupure adaptative par coordonnée : fc = min_cutoff + beta * |d|
+        np.abs(self._derivative, out=alpha)
+        alpha *= self.beta
+        alpha += self.min_cutoff
+        # alpha = 1 / (1 + 1 / (2 pi fc dt))
+        alpha *= 2 * math.pi * dt
+        np.reciprocal(alpha, out=alpha)
+        alpha += 1.0
+        np.reciprocal(alpha, out=alpha)
+
+        # x = x_prev + alpha * (x_raw - x_prev)
+        np.subtract(points, self._value, out=scratch)
+        scratch *= alpha
+        self._value += scratch
+        return self._value.copy()
+
+class LandmarkSmoother:
+    """Lissage d'un flux de landmarks pouvant disparaître (main perdue = état remis à zéro)"""
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 10.0, d_cutoff: float = 1.0):
+        self.filter = OneEuroFilter(min_cutoff, beta, d_cutoff)
+
+    def reset(self):
+        """Changement de main : la prochaine frame passe telle quelle"""
+        self.filter.reset()
+
+    def __call__(self, landmarks: Optional[np.ndarray], timestamp: float) -> Optional[np.ndarray]:
+        if landmarks is None:
+            self.filter.reset()
+            return None
+        return self.filter.filter(landmarks, timestamp)
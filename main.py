@@ -4,26 +4,20 @@ Navigation de présentation uniquement
 """
 import sys
 import os
-from tkinter import messagebox
+import argparse
 
 # Ajouter le dossier imagerie au path si nécessaire
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-try:
-    from gui import ModernGestureControllerGUI
-except ImportError:
-    # Si l'import échoue, essayer depuis le dossier imagerie
-    imagerie_path = os.path.join(os.path.dirname(__file__), '.')
-    sys.path.insert(0, imagerie_path)
-    from gui import ModernGestureControllerGUI
-
-def check_dependencies():
+def check_dependencies(headless=False):
     """Vérifie les dépendances nécessaires"""
     required_modules = [
-        'cv2', 'mediapipe', 'pyautogui', 'numpy', 'tkinter'
+        'cv2', 'mediapipe', 'pyautogui', 'numpy'
     ]
+    if not headless:
+        required_modules.append('tkinter')
     
     missing_modules = []
     
@@ -41,17 +35,75 @@ def check_dependencies():
     print("✅ Toutes les dépendances sont installées")
     return True
 
+def parse_args():
+    """Options de la ligne de commande"""
+    from input_backends import INPUT_BACKENDS
+    parser = argparse.ArgumentParser(description="Contrôleur gestuel - navigation de présentation")
+    parser.add_argument("--headless", action="store_true",
+                        help="Sans interface : ni Tk ni fenêtre OpenCV, statistiques sur la sortie standard")
+    parser.add_argument("--source", default="0",
+                        help="Index caméra, fichier vidéo, dossier d'images ou synthetic[:N]")
+    parser.add_argument("--stats-interval", type=float, default=5.0,
+                        help="Intervalle d'affichage des statistiques en mode sans interface (secondes)")
+    parser.add_argument("--inference-process", action="store_true",
+                        help="MediaPipe dans un processus séparé")
+    parser.add_argument("--swipes", action="store_true",
+                        help="Balayages gauche / droite pour changer de slide")
+    parser.add_argument("--input-backend", choices=INPUT_BACKENDS, default="pyautogui",
+                        help="Injection des touches (xtest : python-xlib, uinput : python-evdev)")
+    parser.add_argument("--mapping", default="",
+                        help="Fichier JSON geste -> action, rechargé à chaud quand il change")
+    parser.add_argument("--max-hands", type=int, default=1,
+                        help="Mains suivies (au-delà de 1 : une seule main contrôle, voir control_hand_policy)")
+    parser.add_argument("--adaptive-stability", action="store_true",
+                        help="Frames de validation selon la netteté du geste (au lieu d'un nombre fixe)")
+    parser.add_argument("--smoothing", action="store_true",
+                        help="Filtre One-Euro sur les landmarks (moins de gigue, léger retard)")
+    parser.add_argument("--auto-tune", action="store_true",
+                        help="Allège ou alourdit MediaPipe pendant l'exécution selon le temps d'inférence mesuré")
+    parser.add_argument("--motion-gating", action="store_true",
+                        help="Inférence sautée tant que la scène est immobile et sans main")
+    parser.add_argument("--async-actions", action="store_true",
+                        help="Touches injectées par un thread dédié, hors de la boucle de détection")
+    parser.add_argument("--coalesce-window", type=float, default=0.0,
+                        help="Fenêtre (s) de regroupement des slides suivante / précédente (0 = désactivé)")
+    parser.add_argument("--slide-count", type=int, default=0,
+                        help="Nombre de slides (0 = inconnu) : permet le saut direct d'une rafale après un F5 du contrôleur")
+    parser.add_argument("--idle-mode", action="store_true",
+                        help="Capture ralentie (idle_fps) après idle_after secondes sans main visible")
+    return parser.parse_args()
+
 def main():
     """Fonction principale"""
+    args = parse_args()
+    
     print("="*60)
     print("🎯 CONTRÔLEUR GESTUEL - NAVIGATION DE PRÉSENTATION")
     print("="*60)
     
     # Vérification des dépendances
-    if not check_dependencies():
-        input("Appuyez sur Entrée pour quitter...")
+    if not check_dependencies(headless=args.headless):
+        if not args.headless:
+            input("Appuyez sur Entrée pour quitter...")
         return
     
+    # Options de détection désactivées par défaut, communes aux deux modes
+    options = dict(
+        adaptive_stability=args.adaptive_stability,
+        landmark_smoothing=args.smoothing,
+        auto_tune_inference=args.auto_tune,
+        motion_gating=args.motion_gating,
+        async_actions=args.async_actions,
+        navigation_coalesce_window=args.coalesce_window,
+        slide_count=args.slide_count,
+        idle_mode=args.idle_mode,
+    )
+    
+    if args.headless:
+        from headless import run_headless
+        sys.exit(run_headless(args.source, args.stats_interval, args.inference_process, args.swipes,
+                              args.input_backend, args.mapping, args.max_hands, **options))
+    
     print("\n🔧 Configuration requise:")
     print("- Webcam fonctionnelle")
     print("- Présentation ouverte (PowerPoint, PDF, etc.)")
@@ -67,11 +119,24 @@ def main():
     print("- 🖐 Main ouverte → Slide précédente")
     print("- 👆 Index pointé → Slide suivante")
     print("- 👌 Geste OK → Démarrer/Arrêter diaporama")
+    if args.swipes:
+        print("- 👋 Balayage vers la gauche / droite → Slide suivante / précédente")
     
     print("\n🚀 Lancement de l'application...")
     
+    from tkinter import messagebox
+    from gui import ModernGestureControllerGUI
+    
     try:
-        app = ModernGestureControllerGUI()
+        app = ModernGestureControllerGUI(
+            video_source=args.source,
+            inference_process=args.inference_process,
+            swipe_gestures=args.swipes,
+            gesture_mapping_file=args.mapping,
+            max_num_hands=args.max_hands,
+            input_backend=args.input_backend,
+            **options,
+        )
         app.run()
         
     except KeyboardInterrupt:
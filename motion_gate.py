@@ -0,0 +1,87 @@
+"""
+Filtrage des frames statiques avant l'inférence MediaPipe
+
+Chaque frame est réduite à une vignette en niveaux de gris (32x24 par
+défaut) et comparée à la précédente. Tant que la scène ne bouge pas et
+qu'aucune main n'est suivie, l'inférence peut être sautée ; le premier
+mouvement la relance dès la frame où il apparaît.
+"""
+import cv2
+import numpy as np
+from typing import Tuple
+
+class MotionGate:
+    """Différence de vignettes successives
+
+    pixel_threshold : écart de niveau de gris (0-255) comptant comme un pixel changé
+    min_fraction    : part de pixels changés signalant un mouvement
+    linger          : frames encore traitées après le dernier mouvement
+    heartbeat       : intervalle (s) d'une inférence de contrôle même sans mouvement
+    """
+
+    def __init__(self, size: Tuple[int, int] = (32, 24), pixel_threshold: int = 12,
+                 min_fraction: float = 0.005, linger: int = 5, heartbeat: float = 1.0):
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.min_changed = max(1, int(round(min_fraction * size[0] * size[1])))
+        self.linger = linger
+        self.heartbeat = heartbeat
+
+        # Vignettes préallouées : réductions, gris courant, gris précédent, différence
+        self._middle = None
+        self._small = None
+        self._gray = np.zeros(size[::-1], np.uint8)
+        self._previous = np.zeros(size[::-1], np.uint8)
+        self._diff = np.zeros(size[::-1], np.uint8)
+        self._primed = False
+        self._quiet_frames = linger
+        self._last_open = float("-inf")
+
+        self.frames = 0
+        self.skipped = 0
+        self.motion = False  # Mouvement détecté sur la dernière frame
+
+    @property
+    def skip_fraction(self) -> float:
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def reset_stats(self):
+        self.frames = 0
+        self.skipped = 0
+
+    def _detect_motion(self, frame: np.ndarray) -> bool:
+        """Compare la vignette de la frame à celle de la frame précédente"""
+        small_shape = self.size[::-1] + frame.shape[2:]
+        if self._small is None or self._small.shape != small_shape:
+            self._small = np.empty(small_shape, np.uint8)
+            self._middle = np.empty((small_shape[0] * 4, small_shape[1] * 4) + frame.shape[2:], np.uint8)
+        # INTER_AREA sur l'image complète coûte ~0.5 ms : réduction bilinéaire x4 d'abord,
+        # puis moyenne par zones (64 échantillons par pixel de vignette, ~75 us en 640x480)
+        cv2.resize(frame, self._middle.shape[1::-1], dst=self._middle, interpolation=cv2.INTER_LINEAR)
+        cv2.resize(self._middle, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        if self._small.ndim == 3:
+            cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        else:
+            np.copyto(self._gray, self._small)
+
+        if not self._primed:
+            self._primed = True
+            moved = True
+        else:
+            cv2.absdiff(self._gray, self._previous, dst=self._diff)
+            moved = cv2.countNonZero(cv2.threshold(
+                self._diff, self.pixel_threshold, 255, cv2.THRESH_BINARY, dst=self._diff)[1]) >= self.min_changed
+        self._gray, self._previous = self._previous, self._gray
+        return moved
+
+    def update(self, frame: np.ndarray, hand_tracked: bool, timestamp: float) -> bool:
+        """True si l'inférence doit tourner sur cette frame"""
+        self.frames += 1
+        self.motion = self._detect_motion(frame)
+        self._quiet_frames = 0 if self.motion else self._quiet_frames + 1
+
+        if hand_tracked or self._quiet_frames <= self.linger or timestamp - self._last_open >= self.heartbeat:
+            self._last_open = timestamp
+            return True
+        self.skipped += 1
+        return False
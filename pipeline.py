@@ -0,0 +1,458 @@
+"""
+Pipeline de détection en étapes concurrentes
+
+capture (FrameGrabber) | prétraitement + inférence | classification + action | rendu
+
+Chaque étape a son thread et une file d'entrée bornée avec une politique de
+perte configurable ; la profondeur des files et le temps de service de chaque
+étape indiquent où se trouve le goulot d'étranglement.
+"""
+import time
+from collections import deque
+from threading import Thread, Condition, Lock, current_thread
+from typing import Callable, Optional, Sequence
+import cv2
+from action_dispatcher import ActionDispatcher
+from config import GestureConfig
+from gesture_debouncer import GestureDebouncer
+from gesture_mapping import GestureMapping, MappingFile, default_mapping
+from idle_mode import IdleController
+from landmark_filter import LandmarkSmoother
+from motion_gate import MotionGate
+from swipe_detector import SwipeDetector
+from utils import FrameBufferRing, LatencyHistogram
+
+DROP_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+class BoundedQueue:
+    """File bornée entre deux étapes
+
+    drop_oldest : une nouvelle entrée remplace la plus ancienne (fraîcheur)
+    drop_newest : la nouvelle entrée est refusée si la file est pleine
+    block       : le producteur attend qu'une place se libère
+    """
+
+    def __init__(self, maxsize: int = 2, drop_policy: str = "drop_oldest"):
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Politique inconnue: {drop_policy} (choix: {', '.join(DROP_POLICIES)})")
+        self.maxsize = max(1, maxsize)
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self._items = deque()
+        self._condition = Condition()
+        self._closed = False
+
+    def put(self, item) -> bool:
+        """Ajoute une entrée ; retourne False si elle a été perdue"""
+        with self._condition:
+            if len(self._items) >= self.maxsize:
+                if self.drop_policy == "drop_newest":
+                    self.dropped += 1
+                    return False
+                if self.drop_policy == "drop_oldest":
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._items) >= self.maxsize and not self._closed:
+                        self._condition.wait()
+            if self._closed:
+                return False
+            self._items.append(item)
+            self._condition.notify_all()
+            return True
+
+    def get(self, timeout: float = 0.1):
+        """Retire l'entrée la plus ancienne (None si rien n'arrive avant le délai)"""
+        with self._condition:
+            if not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._condition.notify_all()
+            return item
+
+    def close(self):
+        """Débloque producteurs et consommateurs en attente"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._items)
+
+class PipelineStage:
+    """Étape du pipeline : un thread, une entrée, un temps de service mesuré
+
+    L'entrée est soit une BoundedQueue, soit une fonction read() retournant
+    (ok, item) comme cv2.VideoCapture.read.
+    """
+
+    def __init__(self, name: str, handler: Callable, input_queue: Optional[BoundedQueue] = None,
+                 read: Optional[Callable] = None, on_error: Optional[Callable] = None):
+        self.name = name
+        self.handler = handler
+        self.input_queue = input_queue
+        self.read = read
+        self.on_error = on_error
+        self.output_queue = None
+        self.is_running = False
+        self._thread = None
+
+        # Statistiques
+        self.processed = 0
+        self.service_time_ms = 0.0
+
+    def start(self):
+        self.is_running = True
+        self._thread = Thread(target=self._run, name=f"pipeline-{self.name}", daemon=True)
+        self._thread.start()
+
+    def _next_item(self):
+        if self.read is not None:
+            ret, item = self.read()
+            return item if ret else None
+        return self.input_queue.get(timeout=0.1)
+
+    def _run(self):
+        while self.is_running:
+            item = self._next_item()
+            if item is None or not self.is_running:
+                continue
+
+            start = time.perf_counter()
+            try:
+                result = self.handler(item)
+            except Exception as e:
+                print(f"Erreur dans l'étape {self.name}: {e}")
+                if self.on_error:
+                    self.on_error(e)
+                break
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.service_time_ms = elapsed_ms if not self.processed else \
+                0.9 * self.service_time_ms + 0.1 * elapsed_ms
+            self.processed += 1
+
+            if result is not None and self.output_queue is not None:
+                self.output_queue.put(result)
+
+    def stop(self, timeout: float = 2.0):
+        self.is_running = False
+        if self._thread and self._thread.is_alive() and self._thread is not current_thread():
+            self._thread.join(timeout=timeout)
+
+    def get_stats(self) -> dict:
+        return {
+            "queue_depth": len(self.input_queue) if self.input_queue is not None else 0,
+            "dropped": self.input_queue.dropped if self.input_queue is not None else 0,
+            "processed": self.processed,
+            "service_ms": self.service_time_ms,
+        }
+
+class FramePacket:
+    """Frame et résultats associés, transmis d'étape en étape"""
+    __slots__ = ("frame_id", "frame", "capture_time", "landmarks", "gesture", "confidence",
+                 "detection_confidence", "hand_switched")
+
+    def __init__(self, frame_id: int, frame, capture_time: float):
+        self.frame_id = frame_id
+        self.frame = frame
+        self.capture_time = capture_time
+        self.landmarks = None
+        self.gesture = "none"
+        self.confidence = 0.0  # Progression de la validation (stabilité)
+        self.detection_confidence = 0.0  # Confiance du détecteur sur cette frame
+        self.hand_switched = False  # Une autre main a pris le contrôle sur cette frame
+
+class GesturePipeline:
+    """Pipeline capture | inférence | classification + action | rendu
+
+    Les callbacks permettent à l'interface (ou au mode sans interface) de
+    réagir sans que la logique de détection soit dupliquée :
+    - on_gesture(gesture, confidence) à chaque frame classifiée
+    - on_action(gesture, count) quand un geste déclenche une action
+    - on_stats(fps, stats) une fois par seconde
+    - renderer(packet) -> bool dans l'étape de rendu (False = arrêt)
+    - on_stop() une seule fois, quand le pipeline s'arrête de lui-même
+    """
+
+    def __init__(self, config: GestureConfig, detector, controller, grabber,
+                 landmark_source=None, allowed_gestures: Optional[Sequence[str]] = None,
+                 required_stability: int = 5, mapping: Optional[GestureMapping] = None,
+                 on_gesture: Optional[Callable] = None, on_action: Optional[Callable] = None,
+                 on_stats: Optional[Callable] = None, renderer: Optional[Callable] = None,
+                 on_stop: Optional[Callable] = None):
+        self.config = config
+        self.detector = detector
+        self.controller = controller
+        self.grabber = grabber
+        self.landmark_source = landmark_source or detector
+        self._allowed_override = tuple(allowed_gestures) if allowed_gestures is not None else None
+        self.required_stability = required_stability
+        self.on_gesture = on_gesture
+        self.on_action = on_action
+        self.on_stats = on_stats
+        self.renderer = renderer
+        self.on_stop = on_stop
+
+        self.is_running = False
+        self._stop_lock = Lock()
+        self._stop_notified = False
+        self._frame_id = 0
+
+        self.smoother = (LandmarkSmoother(config.smoothing_min_cutoff, config.smoothing_beta)
+                         if config.landmark_smoothing else None)
+        self.swipes = SwipeDetector(
+            min_distance=config.swipe_min_distance, min_speed=config.swipe_min_speed,
+            window=config.swipe_window, cooldown=config.swipe_cooldown,
+        ) if config.swipe_gestures else None
+        self.motion_gate = MotionGate(
+            pixel_threshold=config.motion_pixel_threshold, min_fraction=config.motion_min_fraction,
+            heartbeat=config.motion_heartbeat,
+        ) if config.motion_gating else None
+        self._hand_tracked = False
+        self._control_hand_id = None  # Main de contrôle du détecteur multi-mains
+        self.idle = (IdleController(grabber, config.idle_after, config.idle_fps)
+                     if config.idle_mode and grabber is not None else None)
+        # Actions exécutées hors de la boucle de détection (file + thread dédié)
+        self.dispatcher = ActionDispatcher(self._run_action) if config.async_actions else None
+        self.gesture_count = 0
+        self.action_latency = LatencyHistogram()  # Première frame du geste -> action
+        self.fps = 0.0
+        self._fps_counter = 0
+        self._last_fps_time = time.time()
+
+        # Correspondance geste -> action : fichier rechargé à chaud, sinon correspondance par défaut
+        self.mapping_file = MappingFile(config.gesture_mapping_file) if config.gesture_mapping_file else None
+        self._mapping_checked = time.time()
+        if mapping is None:
+            mapping = self.mapping_file.mapping if self.mapping_file is not None else default_mapping()
+        self.apply_mapping(mapping)
+
+        size, policy = config.pipeline_queue_size, config.pipeline_drop_policy
+
+        # Tampons du miroir : assez pour toutes les frames encore dans les files en aval
+        self.flip_buffers = FrameBufferRing(2 * size + 4) if config.reuse_frame_buffers else None
+        # La frame livrée par le grabber est réécrite au read() suivant : avec les tampons réutilisés,
+        # l'aperçu est retourné dans l'anneau dès l'inférence au lieu de rester dans la file de rendu
+        self._early_preview_flip = (config.mirror_mode == "landmarks" and renderer is not None
+                                    and self.flip_buffers is not None)
+        self.stages = [
+            PipelineStage("inference", self._infer, read=self._read_frame, on_error=self._on_stage_error),
+            PipelineStage("classification", self._classify, BoundedQueue(size, policy), on_error=self._on_stage_error),
+        ]
+        if renderer is not None:
+            self.stages.append(
+                PipelineStage("rendu", self._render, BoundedQueue(size, policy), on_error=self._on_stage_error))
+        for stage, next_stage in zip(self.stages, self.stages[1:]):
+            stage.output_queue = next_stage.input_queue
+
+    def start(self):
+        """Démarre toutes les étapes (la capture doit déjà tourner)"""
+        self.is_running = True
+        self._last_fps_time = time.time()
+        if self.dispatcher is not None:
+            self.dispatcher.start()
+        for stage in self.stages:
+            stage.start()
+        return self
+
+    def request_stop(self):
+        """Demande l'arrêt sans attendre les threads (utilisable depuis une étape)"""
+        self.is_running = False
+        for stage in self.stages:
+            stage.is_running = False
+            if stage.input_queue is not None:
+                stage.input_queue.close()
+
+        with self._stop_lock:
+            if self._stop_notified:
+                return
+            self._stop_notified = True
+        if self.on_stop:
+            self.on_stop()
+
+    def stop(self, timeout: float = 2.0):
+        """Arrête le pipeline et attend la fin des étapes"""
+        with self._stop_lock:
+            self._stop_notified = True
+        self.request_stop()
+        for stage in self.stages:
+            stage.stop(timeout)
+        if self.dispatcher is not None:
+            self.dispatcher.stop(timeout)
+
+    def apply_mapping(self, mapping: GestureMapping):
+        """Installe une correspondance : filtrage des gestes, validation, table du contrôleur, regroupements"""
+        self.mapping = mapping
+        self.allowed_gestures = self._allowed_override or mapping.allowed
+        # Validation des gestes : seule source de stabilité et de cooldown (état remis à zéro)
+        required = self.required_stability
+        self.debouncer = GestureDebouncer(
+            window=max(required, self.config.max_stability_frames, *mapping.stability.values()),
+            required=required,
+            release=min(self.config.stability_release_frames, required, self.config.min_stability_frames),
+            cooldown=self.config.gesture_cooldown,
+            cooldowns={**self.config.gesture_cooldowns, **mapping.cooldowns},
+            allowed=self.allowed_gestures,
+            clock=time.time,
+        )
+        if hasattr(self.controller, "load_mapping"):
+            self.controller.load_mapping(mapping)
+        if self.dispatcher is not None:
+            self.dispatcher.groups = dict(mapping.action_groups)
+            self.dispatcher.toggles = frozenset(mapping.toggles)
+
+    def _on_stage_error(self, error: Exception):
+        self.request_stop()
+
+    # Étapes ----------------------------------------------------------------
+
+    def _read_frame(self):
+        """Entrée de l'étape d'inférence : dernière frame capturée"""
+        ret, frame = self.grabber.read(timeout=0.1)
+        if not ret:
+            if self.grabber.has_ended:
+                self.request_stop()
+            return False, None
+        self._frame_id += 1
+        return True, FramePacket(self._frame_id, frame, time.time())
+
+    def _infer(self, packet: FramePacket) -> FramePacket:
+        """Prétraitement + inférence MediaPipe"""
+        # En mode "landmarks", le détecteur applique lui-même le miroir aux coordonnées
+        if self.config.mirror_mode == "image":
+            packet.frame = self._flip(packet.frame)
+        # Scène immobile sans main suivie : MediaPipe n'a rien de nouveau à trouver
+        if self.motion_gate is None or self.motion_gate.update(packet.frame, self._hand_tracked,
+                                                                packet.capture_time):
+            packet.landmarks = self.landmark_source.get_landmarks(packet.frame)
+            packet.hand_switched = self._control_hand_changed()
+        if self._early_preview_flip:
+            packet.frame = self._flip(packet.frame)
+        self._hand_tracked = packet.landmarks is not None
+        if self.idle is not None:
+            self.idle.update(self._hand_tracked, packet.capture_time)
+        if self.smoother is not None:
+            if packet.hand_switched:
+                self.smoother.reset()
+            packet.landmarks = self.smoother(packet.landmarks, packet.capture_time)
+        return packet
+
+    def _control_hand_changed(self) -> bool:
+        """Passage direct d'une main de contrôle à une autre (sans perte de main entre les deux)"""
+        control_id = getattr(self.landmark_source, "control_hand_id", None)
+        previous, self._control_hand_id = self._control_hand_id, control_id
+        return previous is not None and control_id is not None and control_id != previous
+
+    def _classify(self, packet: FramePacket) -> FramePacket:
+        """Classification, validation par stabilité et exécution de l'action"""
+        now = time.time()
+        self._update_fps(now)
+        # Rechargement à chaud dans le thread qui utilise la correspondance (au plus une fois par seconde)
+        if self.mapping_file is not None and now - self._mapping_checked >= 1.0:
+            self._mapping_checked = now
+            mapping = self.mapping_file.poll()
+            if mapping is not None:
+                self.apply_mapping(mapping)
+
+        detected_gesture = "none"
+        if packet.landmarks is not None:
+            detected_gesture = self.detector.detect_gesture(packet.landmarks)
+            packet.detection_confidence = self.detector.gesture_confidence
+
+        # Geste dynamique : pendant un mouvement rapide, la pose statique n'est pas validée
+        swipe = None
+        if self.swipes is not None:
+            if packet.hand_switched:
+                self.swipes.reset()  # La trajectoire de l'ancienne main ne continue pas sur la nouvelle
+            swipe = self.swipes.update(packet.landmarks, packet.capture_time)
+            if swipe is not None or self.swipes.in_motion:
+                detected_gesture = "none"
+
+        # Horloge du débouncer : instant de capture (les gestes non autorisés comptent comme "none")
+        debouncer = self.debouncer
+        required_stability = (self.mapping.stability.get(detected_gesture)
+                              or self.required_stability_frames(packet.detection_confidence))
+        action = debouncer.update(detected_gesture, required_stability, now=packet.capture_time)
+        if detected_gesture in self.allowed_gestures:
+            packet.gesture = detected_gesture
+            packet.confidence = debouncer.progress
+
+        if swipe is not None and swipe in self.allowed_gestures:
+            packet.gesture, packet.confidence = swipe, 1.0
+            self._execute(swipe, self.swipes.swipe_onset)
+        elif action is not None:
+            self._execute(action, None if debouncer.fired_repeat else debouncer.fired_onset)
+
+        if self.on_gesture:
+            self.on_gesture(packet.gesture, packet.confidence)
+        return packet
+
+    def _execute(self, gesture: str, onset: Optional[float]):
+        """Action d'un geste validé (onset : apparition du geste, None pour une répétition)"""
+        if self.dispatcher is not None:
+            self.dispatcher.submit(gesture, onset)  # Ne bloque jamais sur l'injection de touches
+        else:
+            self._run_action(gesture, onset)
+
+    def _run_action(self, gesture: str, onset: Optional[float]):
+        """Exécute l'action ; la latence mesurée va jusqu'à l'injection effective des touches"""
+        self.gesture_count += 1
+        # Le cooldown est déjà appliqué en amont (débouncer, balayages) : pas de second filtrage
+        self.controller.execute_gesture_action(gesture, cooldown=0.0)
+        if onset is not None:
+            self.action_latency.record((time.time() - onset) * 1000)
+        if self.on_action:
+            self.on_action(gesture, self.gesture_count)
+
+    def required_stability_frames(self, detection_confidence: float) -> int:
+        """Frames du geste exigées dans la fenêtre : fixe, ou de max à min selon la confiance du détecteur"""
+        if not self.config.adaptive_stability:
+            return self.required_stability
+        low, high = self.config.min_stability_frames, self.config.max_stability_frames
+        return max(1, round(high - (high - low) * detection_confidence))
+
+    def _render(self, packet: FramePacket):
+        """Rendu (overlay, affichage) délégué à l'interface"""
+        # L'aperçu reste vu du point de vue de l'utilisateur, retourné hors du chemin critique
+        if self.config.mirror_mode == "landmarks" and not self._early_preview_flip:
+            packet.frame = self._flip(packet.frame)
+        if self.renderer(packet) is False:
+            self.request_stop()
+        return None
+
+    def _flip(self, frame):
+        flipped = self.flip_buffers.next(frame.shape) if self.flip_buffers else None
+        return cv2.flip(frame, 1, flipped)
+
+    # Statistiques ----------------------------------------------------------
+
+    def _update_fps(self, current_time: float):
+        self._fps_counter += 1
+        if current_time - self._last_fps_time >= 1.0:
+            self.fps = self._fps_counter / (current_time - self._last_fps_time)
+            self._fps_counter = 0
+            self._last_fps_time = current_time
+            if self.on_stats:
+                self.on_stats(self.fps, self.get_stats())
+
+    def get_stats(self) -> dict:
+        """Profondeur de file, pertes et temps de service par étape"""
+        capture = self.grabber.get_stats()
+        stats = {"capture": {
+            "queue_depth": capture["pending"],
+            "dropped": capture["dropped"],
+            "processed": capture["captured"],
+            "service_ms": capture["read_ms"],
+        }}
+        for stage in self.stages:
+            stats[stage.name] = stage.get_stats()
+        return stats
+
+    def bottleneck(self):
+        """Étape dont le temps de service est le plus long"""
+        stats = self.get_stats()
+        name = max(stats, key=lambda stage: stats[stage]["service_ms"])
+        return name, stats[name]["service_ms"]
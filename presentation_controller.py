@@ -1,112 +1,248 @@
 """
 Contrôleur simplifié pour les actions de présentation - Avec gestion intelligente du diaporama
 """
-import pyautogui
 import time
+from threading import RLock, Timer
+from typing import Optional
+from gesture_mapping import GestureMapping, default_mapping
+from input_backends import InputBackend, PyAutoGUIBackend
+
+GO_TO_DIALOG_DELAY = 0.2  # Ouverture de la boîte "Aller à la slide" (Ctrl+G) en mode édition
 
 class PresentationController:
-    """Contrôleur simplifié pour les actions de présentation uniquement"""
+    """Contrôleur simplifié pour les actions de présentation uniquement
+    
+    Regroupement de la navigation (coalesce_window > 0) : la première slide suivante /
+    précédente part aussitôt ; celles qui suivent dans la fenêtre sont cumulées en un
+    déplacement net, envoyé à la fin de la fenêtre en touches successives ou en un saut
+    direct ("aller à la slide") selon le moins coûteux. L'index de slide est suivi
+    localement à partir des actions envoyées (chaque touche compte pour une slide,
+    F5 repart de la première).
+    
+    Le présentateur peut aussi changer de slide au clavier ou à la télécommande :
+    le saut direct n'est utilisé que si l'index est sûr (diaporama lancé par le
+    contrôleur ou slide atteinte par un saut, nombre de slides connu). Sinon le
+    déplacement net est envoyé en flèches, correct quelle que soit la slide affichée.
+    """
     
-    def __init__(self):
-        # Désactiver le fail-safe de pyautogui pour éviter les interruptions
-        pyautogui.FAILSAFE = False
+    # Regroupement dans ActionDispatcher pour la correspondance par défaut : seule la dernière
+    # slide demandée compte, deux bascules du diaporama consécutives s'annulent
+    ACTION_GROUPS = default_mapping().action_groups
+    TOGGLE_ACTIONS = default_mapping().toggles
+    
+    def __init__(self, backend: Optional[InputBackend] = None, mapping: Optional[GestureMapping] = None,
+                 coalesce_window: float = 0.0, slide_count: int = 0,
+                 key_cost: float = 0.01, redraw_cost: float = 0.05):
+        # Injection des touches : pyautogui par défaut (voir input_backends)
+        self.backend = backend if backend is not None else PyAutoGUIBackend()
         self.last_gesture_time = 0
         self.is_in_slideshow = False  # Track slideshow state
+        self.load_mapping(mapping if mapping is not None else default_mapping())
+        
+        # Regroupement des rafales de navigation
+        self.coalesce_window = coalesce_window
+        self.slide_count = slide_count  # 0 = inconnu : l'index n'est borné qu'en bas
+        self.key_cost = key_cost  # Coût estimé d'une touche injectée (s)
+        self.redraw_cost = redraw_cost  # Coût estimé d'un changement de slide affiché (s)
+        self.current_slide = 1  # Index suivi localement
+        self.slide_known = False  # current_slide fixé par une action absolue du contrôleur (F5, saut)
+        self.coalesced = 0  # Déplacements fusionnés dans un envoi groupé
+        self.jumps = 0  # Envois groupés réalisés par un saut direct
+        self._lock = RLock()  # Thread des actions et minuterie de fin de fenêtre
+        self._pending_offset = 0
+        self._pending_steps = 0
+        self._window_end = 0.0
+        self._flush_timer = None
+    
+    def load_mapping(self, mapping: GestureMapping):
+        """Compile la correspondance en table geste -> méthode liée (remplacée d'un bloc au rechargement)"""
+        self.dispatch_table = mapping.compile(self)
+        self.navigation_gestures = frozenset(mapping.navigation)
         
     def execute_gesture_action(self, gesture: str, cooldown: float = 1.0):
-        """Exécute l'action correspondant au geste détecté"""
+        """Exécute l'action correspondant au geste détecté
+        
+        cooldown=0 désactive ce filtrage (le pipeline valide déjà les gestes avec GestureDebouncer).
+        """
         current_time = time.time()
         
         # Vérifier le cooldown
         if current_time - self.last_gesture_time < cooldown:
             return
         
-        action_map = {
-            "fist": self.next_slide,
-            "open_hand": self.previous_slide,
-            "three": self.smart_slideshow_toggle,  # Smart toggle instead of F5
-            "two": lambda: self.go_to_slide(2),
-            "four": lambda: self.go_to_slide(4),
-        }
-        
-        if gesture in action_map:
-            action_map[gesture]()
+        action = self.dispatch_table.get(gesture)
+        if action is not None:
+            with self._lock:
+                # Les déplacements encore cumulés passent avant toute autre action
+                if gesture not in self.navigation_gestures:
+                    self.flush_navigation()
+                action()
             self.last_gesture_time = current_time
             print(f"Geste exécuté: {gesture}")
     
     def next_slide(self):
         """Passer à la slide suivante"""
-        pyautogui.press('right')
-        print("→ Slide suivante")
+        self._navigate(1)
     
     def previous_slide(self):
         """Revenir à la slide précédente"""
-        pyautogui.press('left')
-        print("← Slide précédente")
+        self._navigate(-1)
+    
+    @property
+    def pending_navigation(self) -> int:
+        """Déplacements cumulés pas encore envoyés"""
+        with self._lock:
+            return self._pending_steps
+    
+    def _navigate(self, step: int):
+        """Touche immédiate hors rafale, sinon cumul jusqu'à la fin de la fenêtre"""
+        with self._lock:
+            now = time.monotonic()
+            if self.coalesce_window <= 0 or (now >= self._window_end and self._flush_timer is None):
+                self._press_step(step)
+                self._window_end = now + self.coalesce_window
+                return
+            self._pending_offset += step
+            self._pending_steps += 1
+            if self._flush_timer is None:
+                self._flush_timer = Timer(max(self._window_end - now, 0.0), self.flush_navigation)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _press_step(self, step: int):
+        if step > 0:
+            self.backend.press('right')
+            self.current_slide = self._clamp(self.current_slide + 1)
+            print("→ Slide suivante")
+        else:
+            self.backend.press('left')
+            self.current_slide = self._clamp(self.current_slide - 1)
+            print("← Slide précédente")
+    
+    def _clamp(self, slide: int) -> int:
+        slide = max(1, slide)
+        return min(slide, self.slide_count) if self.slide_count > 0 else slide
+    
+    def jump_cost(self, target: int) -> float:
+        """Coût estimé d'un saut direct : chiffres + Entrée (+ Ctrl+G et la boîte de dialogue en édition)"""
+        keys = len(str(target)) + 1
+        if self.is_in_slideshow:
+            return keys * self.key_cost + self.redraw_cost
+        return (keys + 1) * self.key_cost + GO_TO_DIALOG_DELAY + self.redraw_cost
+    
+    @property
+    def can_jump(self) -> bool:
+        """Un saut direct arrive sur la bonne slide : index sûr et nombre de slides connu"""
+        return self.slide_known and self.slide_count > 0
+    
+    def steps_cost(self, steps: int) -> float:
+        """Coût estimé de `steps` touches flèche : chacune redessine une slide"""
+        return steps * (self.key_cost + self.redraw_cost)
+    
+    def flush_navigation(self):
+        """Envoie le déplacement net cumulé (fin de fenêtre, ou avant une autre action)"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            offset, steps = self._pending_offset, self._pending_steps
+            if steps == 0:
+                return
+            self._pending_offset = self._pending_steps = 0
+            # Rafale prolongée : les déplacements qui suivent sont de nouveau cumulés
+            self._window_end = time.monotonic() + self.coalesce_window
+            self.coalesced += steps
+            if not self.can_jump:
+                # Slide affichée incertaine : déplacement relatif, sans borne supposée
+                for _ in range(abs(offset)):
+                    self._press_step(1 if offset > 0 else -1)
+                return
+            target = self._clamp(self.current_slide + offset)
+            distance = abs(target - self.current_slide)
+            if distance == 0:
+                return
+            if self.jump_cost(target) < self.steps_cost(distance):
+                self.jumps += 1
+                print(f"⏩ {steps} déplacements regroupés : saut direct", flush=True)
+                self.go_to_slide(target)
+            else:
+                for _ in range(distance):
+                    self._press_step(1 if target > self.current_slide else -1)
     
     def smart_slideshow_toggle(self):
         """Gestion intelligente du diaporama - démarre ou quitte selon le contexte"""
         if not self.is_in_slideshow:
             # Démarrer le diaporama
-            pyautogui.press('f5')
+            self.backend.press('f5')
             self.is_in_slideshow = True
+            self.current_slide = 1
+            self.slide_known = True
             print("🎥 Démarrage du diaporama")
         else:
             # Quitter le diaporama
-            pyautogui.press('escape')
+            self.backend.press('escape')
             self.is_in_slideshow = False
+            self.slide_known = False
             print("🚪 Sortie du diaporama")
     
     def force_start_slideshow(self):
         """Force le démarrage du diaporama"""
-        pyautogui.press('f5')
+        self.backend.press('f5')
         self.is_in_slideshow = True
+        self.current_slide = 1
+        self.slide_known = True
         print("🎥 Diaporama forcé")
     
     def force_exit_slideshow(self):
         """Force la sortie du diaporama"""
-        pyautogui.press('escape')
+        self.backend.press('escape')
         self.is_in_slideshow = False
+        self.slide_known = False
         print("🚪 Sortie forcée du diaporama")
     
     def go_to_slide(self, slide_number: int):
         """Aller à une slide spécifique"""
         if self.is_in_slideshow:
             # En mode diaporama, utiliser les numéros + Enter
-            pyautogui.press(str(slide_number))
-            pyautogui.press('enter')
+            self.backend.write(str(slide_number))  # Un appui par chiffre (slides >= 10)
+            self.backend.press('enter')
         else:
             # En mode édition, utiliser Ctrl+G (PowerPoint "Go to slide")
-            pyautogui.hotkey('ctrl', 'g')
-            time.sleep(0.2)
-            pyautogui.type(str(slide_number))
-            pyautogui.press('enter')
+            self.backend.hotkey('ctrl', 'g')
+            time.sleep(GO_TO_DIALOG_DELAY)
+            self.backend.write(str(slide_number))
+            self.backend.press('enter')
+        self.current_slide = self._clamp(slide_number)
+        self.slide_known = True
         print(f"📄 Slide {slide_number}")
     
     def toggle_fullscreen_only(self):
         """Basculer uniquement le mode plein écran (F5 simple)"""
-        pyautogui.press('f5')
+        self.backend.press('f5')
+        self.slide_known = False  # Entrée ou sortie du plein écran : état inconnu
         print("🖥️ Basculer plein écran")
     
     def end_slideshow(self):
         """Terminer le diaporama"""
-        pyautogui.press('esc')
+        self.backend.press('esc')
         self.is_in_slideshow = False
+        self.slide_known = False
         print("⏹ Fin du diaporama")
     
     def black_screen(self):
         """Écran noir pendant la présentation"""
         if self.is_in_slideshow:
-            pyautogui.press('b')
+            self.backend.press('b')
             print("⬛ Écran noir")
     
     def white_screen(self):
         """Écran blanc pendant la présentation"""
         if self.is_in_slideshow:
-            pyautogui.press('w')
+            self.backend.press('w')
             print("⬜ Écran blanc")
     
     def reset_slideshow_state(self):
         """Remet à zéro l'état du diaporama (utile en cas de désynchronisation)"""
         self.is_in_slideshow = False
+        self.slide_known = False
         print("🔄 État du diaporama réinitialisé")
\ No newline at end of file
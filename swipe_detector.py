@@ -0,0 +1,97 @@
+"""
+Gestes dynamiques : balayage gauche / droite de la main
+
+La trajectoire du centre de la paume est gardée dans un anneau de taille
+fixe couvrant les dernières `window` secondes. Le déplacement sur la
+fenêtre et la vitesse (moyenne exponentielle) sont mis à jour à chaque
+frame, sans jamais reparcourir l'historique.
+"""
+import numpy as np
+from typing import Optional
+from landmark_features import palm_center
+
+class SwipeDetector:
+    """Détecte "swipe_left" / "swipe_right" (du point de vue de l'utilisateur)
+
+    Un balayage est reconnu quand, sur la fenêtre, la paume a parcouru au
+    moins `min_distance` (fraction de la largeur d'image) horizontalement,
+    à plus de `min_speed` (largeurs par seconde), avec une trajectoire
+    principalement horizontale.
+    """
+
+    def __init__(self, min_distance: float = 0.25, min_speed: float = 1.0, window: float = 0.4,
+                 max_vertical_ratio: float = 0.6, cooldown: float = 0.4, capacity: int = 32,
+                 min_frames: int = 4):
+        self.min_distance = min_distance
+        self.min_speed = min_speed
+        self.window = window
+        self.max_vertical_ratio = max_vertical_ratio
+        self.cooldown = cooldown
+        self.min_frames = min_frames
+        self.capacity = capacity
+
+        # Anneau (t, x, y) : head = prochaine écriture, count = positions valides
+        self._times = np.zeros(capacity)
+        self._xs = np.zeros(capacity)
+        self._ys = np.zeros(capacity)
+        self._head = 0
+        self._count = 0
+        self.velocity_x = 0.0  # Vitesse horizontale lissée (largeurs/s)
+        self._last_swipe_time = float("-inf")
+        self.swipe_count = 0
+        self.swipe_onset = 0.0  # Début de la trajectoire du dernier balayage
+
+    def reset(self):
+        """Main perdue : la trajectoire recommence"""
+        self._count = 0
+        self.velocity_x = 0.0
+
+    @property
+    def in_motion(self) -> bool:
+        """La main se déplace assez vite pour qu'une pose statique soit douteuse"""
+        return abs(self.velocity_x) > self.min_speed / 2
+
+    def _oldest(self) -> int:
+        return (self._head - self._count) % self.capacity
+
+    def update(self, landmarks: Optional[np.ndarray], timestamp: float) -> Optional[str]:
+        """Ajoute la position de la frame ; retourne le balayage reconnu ou None"""
+        if landmarks is None:
+            self.reset()
+            return None
+
+        palm = palm_center(landmarks)
+        x, y = float(palm[0]), float(palm[1])
+
+        # Vitesse instantanée par rapport à la frame précédente, lissée
+        if self._count:
+            last = (self._head - 1) % self.capacity
+            dt = timestamp - self._times[last]
+            if dt > 0:
+                self.velocity_x += 0.5 * ((x - self._xs[last]) / dt - self.velocity_x)
+
+        # Écriture dans l'anneau (la plus ancienne position est écrasée s'il est plein)
+        self._times[self._head], self._xs[self._head], self._ys[self._head] = timestamp, x, y
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+        # Les positions sorties de la fenêtre temporelle quittent l'anneau par l'arrière
+        while self._count > 1 and timestamp - self._times[self._oldest()] > self.window:
+            self._count -= 1
+
+        if self._count < self.min_frames or timestamp - self._last_swipe_time < self.cooldown:
+            return None
+
+        oldest = self._oldest()
+        dx, dy = x - self._xs[oldest], y - self._ys[oldest]
+        duration = timestamp - self._times[oldest]
+        if (abs(dx) < self.min_distance or abs(dy) > self.max_vertical_ratio * abs(dx)
+                or duration <= 0 or abs(dx) / duration < self.min_speed
+                or self.velocity_x * dx <= 0):
+            return None
+
+        self.swipe_onset = float(self._times[oldest])
+        self._last_swipe_time = timestamp
+        self.swipe_count += 1
+        self._count = 1  # Un mouvement = un seul balayage
+        return "swipe_right" if dx > 0 else "swipe_left"
@@ -4,6 +4,8 @@ Tests unitaires pour le contrôleur gestuel
 import unittest
 import sys
 import os
+import tempfile
+import time
 
 # Ajouter le dossier parent au path pour les imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -11,6 +13,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from config import GestureConfig
 from gesture_detector import GestureDetector
 from presentation_controller import PresentationController
+from frame_grabber import FrameGrabber
+from frame_sources import SyntheticSource, ImageSequenceSource, open_frame_source
 
 class TestGestureConfig(unittest.TestCase):
     """Tests pour la configuration"""
@@ -65,6 +69,684 @@ class TestGestureDetector(unittest.TestCase):
         """Test de détection avec landmarks vides"""
         gesture = self.detector.detect_gesture(None)
         self.assertEqual(gesture, "none")
+    
+    def test_roi_tracking(self):
+        """Le recadrage suit la main et les landmarks reviennent en coordonnées image"""
+        from types import SimpleNamespace
+        import numpy as np
+        
+        processed_shapes = []
+        
+        class MockHands:
+            def __init__(self, visible_in_crop=True):
+                self.visible_in_crop = visible_in_crop
+            
+            def process(self, image):
+                processed_shapes.append(image.shape[:2])
+                if image.shape[:2] != (480, 640) and not self.visible_in_crop:
+                    return SimpleNamespace(multi_hand_landmarks=None)
+                points = [SimpleNamespace(x=0.5, y=0.5, z=0.1) for _ in range(21)]
+                return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=points)])
+        
+        config = GestureConfig(roi_tracking=True, roi_min_size=160)
+        detector = GestureDetector(config)
+        detector.hands = MockHands()
+        frame = np.zeros((480, 640, 3), np.uint8)
+        
+        detector.get_landmarks(frame)
+        self.assertEqual(detector.roi, (240, 160, 400, 320))
+        
+        landmarks = detector.get_landmarks(frame)
+        self.assertEqual(processed_shapes[-1], (160, 160))
+        self.assertEqual(landmarks.shape, (21, 3))
+        self.assertAlmostEqual(landmarks[0, 0], 0.5)
+        self.assertAlmostEqual(landmarks[0, 1], 0.5)
+        self.assertAlmostEqual(landmarks[0, 2], 0.1 * 160 / 640, places=6)
+        
+        # Main perdue dans le recadrage : nouvelle tentative sur l'image complète
+        detector.hands = MockHands(visible_in_crop=False)
+        landmarks = detector.get_landmarks(frame)
+        self.assertIsNotNone(landmarks)
+        self.assertEqual(processed_shapes[-2:], [(160, 160), (480, 640)])
+        self.assertEqual(detector.roi_fallbacks, 1)
+    
+    def test_inference_decimation(self):
+        """Entre deux inférences, les landmarks prolongent le mouvement observé"""
+        import numpy as np
+        
+        config = GestureConfig(inference_interval=2)
+        detector = GestureDetector(config)
+        calls = []
+        
+        def fake_detect(image):
+            calls.append(image)
+            x = 0.1 * len(calls)
+            return np.tile(np.float32([x, 0.5, 0.0]), (21, 1))
+        
+        detector._detect_landmarks = fake_detect
+        xs = [detector.get_landmarks(i)[0, 0] for i in range(5)]
+        
+        # Inférence sur les frames 0, 2, 4 ; frame 1 maintenue, frame 3 extrapolée
+        self.assertEqual(calls, [0, 2, 4])
+        for expected, value in zip([0.1, 0.1, 0.2, 0.25, 0.3], xs):
+            self.assertAlmostEqual(value, expected, places=6)
+        self.assertEqual(detector.interpolated_count, 2)
+    
+    def test_inference_scale(self):
+        """Seule la copie envoyée à MediaPipe est réduite"""
+        from types import SimpleNamespace
+        import numpy as np
+        
+        shapes = []
+        detector = GestureDetector(GestureConfig(inference_scale=0.5))
+        detector.hands = SimpleNamespace(
+            process=lambda image: shapes.append(image.shape) or SimpleNamespace(multi_hand_landmarks=None))
+        frame = np.zeros((480, 640, 3), np.uint8)
+        
+        self.assertIsNone(detector.get_landmarks(frame))
+        self.assertEqual(shapes, [(240, 320, 3)])
+        self.assertEqual(frame.shape, (480, 640, 3))
+    
+    def test_mirror_landmarks_matches_flip(self):
+        """Le miroir des landmarks donne les mêmes coordonnées que cv2.flip"""
+        import cv2
+        import numpy as np
+        from types import SimpleNamespace
+        
+        class BrightSpotHands:
+            """Place tous les landmarks sur le pixel le plus lumineux"""
+            def process(self, image):
+                row, col = np.unravel_index(np.argmax(image[:, :, 0]), image.shape[:2])
+                height, width = image.shape[:2]
+                points = [SimpleNamespace(x=(col + 0.5) / width, y=(row + 0.5) / height, z=0.0)
+                          for _ in range(21)]
+                handedness = SimpleNamespace(classification=[SimpleNamespace(label="Left")])
+                return SimpleNamespace(multi_hand_landmarks=[SimpleNamespace(landmark=points)],
+                                       multi_handedness=[handedness])
+        
+        frame = np.zeros((48, 64, 3), np.uint8)
+        frame[10, 7] = 255
+        
+        image_detector = GestureDetector(GestureConfig(mirror_mode="image"))
+        image_detector.hands = BrightSpotHands()
+        flipped = image_detector.get_landmarks(cv2.flip(frame, 1))
+        
+        landmark_detector = GestureDetector(GestureConfig(mirror_mode="landmarks"))
+        landmark_detector.hands = BrightSpotHands()
+        mirrored = landmark_detector.get_landmarks(frame)
+        
+        np.testing.assert_allclose(mirrored, flipped, atol=1e-6)
+        self.assertEqual(image_detector.handedness, "Left")
+        self.assertEqual(landmark_detector.handedness, "Right")
+        self.assertRaises(ValueError, GestureDetector, GestureConfig(mirror_mode="landmark"))
+    
+    def test_detect_gesture_array_matches_objects(self):
+        """detect_gesture donne le même résultat sur le tableau (21, 3) et sur les objets x/y/z"""
+        from types import SimpleNamespace
+        import numpy as np
+        
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            points = rng.random((21, 3)).astype(np.float32)
+            objects = [SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in points]
+            self.assertEqual(self.detector.detect_gesture(points), self.detector.detect_gesture(objects))
+            self.assertEqual(self.detector.count_extended_fingers(points),
+                             self.detector.count_extended_fingers(objects))
+        self.assertEqual(self.detector.detect_gesture(np.empty((0, 3), np.float32)), "none")
+    
+    def test_classify_batch_matches_detect_gesture(self):
+        """classify_batch donne exactement les libellés de detect_gesture"""
+        import numpy as np
+        from gesture_detector import GESTURE_NAMES
+        
+        rng = np.random.default_rng(1)
+        hands = rng.random((500, 21, 3)).astype(np.float32)
+        # Pouce et index rapprochés : cas "ok" et seuil de distance
+        hands[:100, 8, :2] = hands[:100, 4, :2] + rng.normal(0, 0.03, (100, 2))
+        
+        codes = self.detector.classify_batch(hands)
+        self.assertEqual(codes.shape, (500,))
+        self.assertEqual([GESTURE_NAMES[code] for code in codes],
+                         [self.detector.detect_gesture(hand) for hand in hands])
+        self.assertEqual(self.detector.classify_batch(np.empty((0, 21, 3))).shape, (0,))
+    
+    def test_adaptive_inference_interval(self):
+        """L'intervalle suit le temps d'inférence mesuré, borné par le maximum"""
+        config = GestureConfig(adaptive_inference_interval=True, inference_budget_ms=30, max_inference_interval=3)
+        detector = GestureDetector(config)
+        self.assertEqual(detector.current_inference_interval(), 1)
+        
+        detector.keyframe_count = 1
+        detector.inference_time_ms = 45
+        self.assertEqual(detector.current_inference_interval(), 2)
+        detector.inference_time_ms = 500
+        self.assertEqual(detector.current_inference_interval(), 3)
+
+class TestGestureClassifier(unittest.TestCase):
+    """Tests des classifieurs entraînables"""
+    
+    def setUp(self):
+        from gesture_classifier import synthetic_hands
+        self.train_hands, self.train_labels = synthetic_hands(1500, max_tilt_degrees=30, seed=0)
+        self.test_hands, self.test_labels = synthetic_hands(300, max_tilt_degrees=30, seed=1)
+    
+    def test_engines_handle_tilted_and_left_hands(self):
+        """kNN et MLP reconnaissent les mains inclinées et les mains gauches"""
+        import numpy as np
+        from gesture_classifier import KNNClassifier, MLPClassifier
+        
+        for classifier in (KNNClassifier(), MLPClassifier(epochs=40)):
+            classifier.fit(self.train_hands, self.train_labels)
+            labels, probabilities = classifier.predict(self.test_hands)
+            self.assertGreater(np.mean(labels == self.test_labels), 0.95)
+            np.testing.assert_allclose(classifier.predict_proba(self.test_hands).sum(axis=1), 1.0, rtol=1e-5)
+            self.assertTrue(np.all((probabilities > 0) & (probabilities <= 1.0 + 1e-6)))
+    
+    def test_detector_model_engine(self):
+        """Le détecteur charge un modèle sauvegardé et expose sa probabilité"""
+        import numpy as np
+        from gesture_classifier import KNNClassifier
+        from gesture_detector import GESTURE_NAMES
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model.npz")
+            KNNClassifier().fit(self.train_hands, self.train_labels).save(path)
+            detector = GestureDetector(GestureConfig(gesture_engine="model", gesture_model_path=path))
+        
+        labels = [detector.detect_gesture(hand) for hand in self.test_hands[:50]]
+        self.assertGreater(np.mean(np.array(labels) == self.test_labels[:50]), 0.95)
+        self.assertGreater(detector.gesture_probability, 0.0)
+        codes = detector.classify_batch(self.test_hands[:50])
+        self.assertEqual([GESTURE_NAMES[code] for code in codes], labels)
+        self.assertRaises(ValueError, GestureDetector, GestureConfig(gesture_engine="magic"))
+
+class TestGestureDebouncer(unittest.TestCase):
+    """Tests du débouncer de gestes (horloge simulée)"""
+    
+    def setUp(self):
+        from gesture_debouncer import GestureDebouncer
+        self.now = 0.0
+        self.debouncer = GestureDebouncer(window=6, required=3, release=2, cooldown=1.0,
+                                          cooldowns={"three": 5.0}, allowed=("fist", "open_hand", "three"),
+                                          clock=lambda: self.now)
+    
+    def feed(self, gestures, step=0.1):
+        fired = []
+        for gesture in gestures:
+            self.now += step
+            fired.append(self.debouncer.update(gesture))
+        return fired
+    
+    def test_entry_and_hysteresis(self):
+        """Entrée après `required` frames, une frame parasite ne relance pas la validation"""
+        self.assertEqual(self.feed(["fist", "fist", "fist"]), [None, None, "fist"])
+        self.assertFalse(self.debouncer.fired_repeat)
+        self.assertAlmostEqual(self.debouncer.fired_onset, 0.1)
+        
+        self.feed(["none", "fist"])
+        self.assertEqual(self.debouncer.active, "fist")
+        self.feed(["none"] * 5)
+        self.assertEqual(self.debouncer.active, "none")
+        self.assertEqual(self.feed(["point", "two", "point"]), [None] * 3)
+    
+    def test_per_gesture_cooldowns(self):
+        """Un geste maintenu se répète au rythme de son propre cooldown"""
+        fired = self.feed(["fist"] * 25)
+        self.assertEqual([index for index, gesture in enumerate(fired) if gesture], [2, 12, 22])
+        self.assertTrue(self.debouncer.fired_repeat)
+        
+        self.feed(["none"] * 6)
+        fired = self.feed(["three"] * 40)
+        self.assertEqual(fired.count("three"), 1)
+    
+    def test_invalid_thresholds(self):
+        from gesture_debouncer import GestureDebouncer
+        self.assertRaises(ValueError, GestureDebouncer, window=4, required=5)
+
+class TestLandmarkFilter(unittest.TestCase):
+    """Tests du filtre One-Euro vectorisé"""
+    
+    def test_matches_scalar_reference(self):
+        """Le filtre vectorisé reproduit la formule scalaire sur chaque coordonnée"""
+        import math
+        import numpy as np
+        from landmark_filter import OneEuroFilter
+        
+        def alpha(dt, cutoff):
+            return 1.0 / (1.0 + 1.0 / (2 * math.pi * cutoff * dt))
+        
+        rng = np.random.default_rng(0)
+        frames = np.cumsum(rng.normal(0, 0.01, (30, 21, 3)), axis=0).astype(np.float32) + 0.5
+        one_euro = OneEuroFilter(min_cutoff=1.0, beta=10.0, d_cutoff=1.0)
+        value, derivative = float(frames[0, 8, 1]), 0.0
+        for index, points in enumerate(frames):
+            raw = points.copy()
+            filtered = one_euro.filter(points, index / 30.0)
+            np.testing.assert_array_equal(points, raw)
+            if index:
+                dt = 1 / 30.0
+                derivative += alpha(dt, 1.0) * ((float(raw[8, 1]) - value) / dt - derivative)
+                value += alpha(dt, 1.0 + 10.0 * abs(derivative)) * (float(raw[8, 1]) - value)
+            self.assertAlmostEqual(float(filtered[8, 1]), value, places=4)
+    
+    def test_smoother_reduces_jitter_and_resets(self):
+        """La gigue d'une main immobile diminue ; une main perdue remet l'état à zéro"""
+        import numpy as np
+        from landmark_filter import LandmarkSmoother
+        
+        rng = np.random.default_rng(1)
+        smoother = LandmarkSmoother(min_cutoff=1.0, beta=10.0)
+        still = np.full((21, 3), 0.5, np.float32)
+        outputs = [smoother(still + rng.normal(0, 0.01, (21, 3)).astype(np.float32), index / 30.0)
+                   for index in range(60)]
+        self.assertLess(np.std(np.array(outputs[30:]) - still), 0.005)
+        
+        self.assertIsNone(smoother(None, 2.0))
+        fresh = np.full((21, 3), 0.2, np.float32)
+        np.testing.assert_array_equal(smoother(fresh, 2.1), fresh)
+
+class TestSwipeDetector(unittest.TestCase):
+    """Tests des balayages (trajectoires synthétiques de la paume)"""
+    
+    def run_trajectory(self, detector, positions, fps=30.0, start=0.0):
+        import numpy as np
+        events = []
+        for index, (x, y) in enumerate(positions):
+            hand = np.zeros((21, 3), np.float32)
+            hand[:, 0], hand[:, 1] = x, y
+            events.append(detector.update(hand, start + index / fps))
+        return [event for event in events if event]
+    
+    def test_fast_horizontal_motion(self):
+        """Un mouvement rapide donne un seul balayage dans le bon sens"""
+        from swipe_detector import SwipeDetector
+        
+        detector = SwipeDetector()
+        right = [(0.2 + 0.05 * i, 0.5) for i in range(10)]
+        self.assertEqual(self.run_trajectory(detector, right), ["swipe_right"])
+        self.assertLess(detector.swipe_onset, 10 / 30.0)
+        
+        detector.update(None, 1.0)
+        left = [(0.8 - 0.05 * i, 0.5) for i in range(10)]
+        self.assertEqual(self.run_trajectory(detector, left, start=2.0), ["swipe_left"])
+    
+    def test_slow_or_vertical_motion_ignored(self):
+        """Dérive lente et mouvement vertical ne déclenchent rien"""
+        from swipe_detector import SwipeDetector
+        
+        slow = [(0.2 + 0.005 * i, 0.5) for i in range(120)]
+        self.assertEqual(self.run_trajectory(SwipeDetector(), slow), [])
+        vertical = [(0.5 + 0.02 * i, 0.2 + 0.05 * i) for i in range(12)]
+        self.assertEqual(self.run_trajectory(SwipeDetector(), vertical), [])
+
+class TestHandTracker(unittest.TestCase):
+    """Tests du suivi multi-mains"""
+    
+    @staticmethod
+    def hand(x, y=0.5, size=0.1):
+        import numpy as np
+        points = np.zeros((21, 3), np.float32)
+        points[:, 0], points[:, 1] = x, y
+        points[9, 1] = y - size  # Taille de paume = distance poignet - base du majeur
+        return points
+    
+    def test_ids_follow_hands(self):
+        """Les identifiants suivent les mains quel que soit l'ordre de détection"""
+        from hand_tracker import HandTracker
+        
+        tracker = HandTracker()
+        first = {track.id: track.centroid[0] for track in tracker.update([self.hand(0.2), self.hand(0.8)])}
+        # Ordre inversé et léger déplacement
+        second = tracker.update([self.hand(0.82), self.hand(0.22)])
+        self.assertEqual({track.id: round(float(track.centroid[0]), 2) for track in second},
+                         {id_: round(float(x) + 0.02, 2) for id_, x in first.items()})
+        
+        # Une main trop loin de toutes les mains suivies reçoit un nouvel identifiant
+        tracker.update([self.hand(0.22), self.hand(0.5, y=0.1)])
+        self.assertEqual(sorted(track.id for track in tracker.visible()), [1, 3])
+    
+    def test_control_policies(self):
+        """stable garde la main en contrôle, largest / right / left choisissent à chaque frame"""
+        from hand_tracker import HandTracker
+        
+        stable = HandTracker("stable")
+        stable.update([self.hand(0.2, size=0.1)])
+        self.assertEqual(stable.control_hand().id, 1)
+        stable.update([self.hand(0.2, size=0.1), self.hand(0.8, size=0.2)])
+        self.assertEqual(stable.control_hand().id, 1)
+        
+        largest = HandTracker("largest")
+        largest.update([self.hand(0.2, size=0.1), self.hand(0.8, size=0.2)])
+        self.assertEqual(largest.control_hand().id, 2)
+        
+        right = HandTracker("right")
+        right.update([self.hand(0.2), self.hand(0.8)], ["Left", "Right"])
+        self.assertEqual(right.control_hand().handedness, "Right")
+        right.update([self.hand(0.2)], ["Left"])
+        self.assertIsNone(right.control_hand())
+        
+        with self.assertRaises(ValueError):
+            HandTracker("middle")
+    
+    def test_detector_keeps_control_hand(self):
+        """Le détecteur retourne la même main quand MediaPipe inverse l'ordre des détections"""
+        from types import SimpleNamespace
+        
+        class TwoHands:
+            def __init__(self):
+                self.calls = 0
+            
+            def process(self, image):
+                self.calls += 1
+                hands = [(0.3, "Left"), (0.7, "Right")]
+                if self.calls % 2 == 0:
+                    hands.reverse()
+                landmarks = [SimpleNamespace(landmark=[SimpleNamespace(x=x, y=0.5, z=0.0) for _ in range(21)])
+                             for x, _ in hands]
+                handedness = [SimpleNamespace(classification=[SimpleNamespace(label=label)]) for _, label in hands]
+                return SimpleNamespace(multi_hand_landmarks=landmarks, multi_handedness=handedness)
+        
+        import numpy as np
+        detector = GestureDetector(GestureConfig(max_num_hands=2, mirror_mode="landmarks"))
+        detector.hands = TwoHands()
+        frame = np.zeros((48, 64, 3), np.uint8)
+        positions = [round(float(detector.get_landmarks(frame)[0, 0]), 4) for _ in range(4)]
+        # Main gauche de la caméra à x=0.3, miroir -> x=0.7 et main droite de l'utilisateur
+        self.assertEqual(positions, [0.7] * 4)
+        self.assertEqual(detector.handedness, "Right")
+        self.assertEqual(len(detector.candidates), 2)
+        
+    def test_control_switch_resets_pipeline_state(self):
+        """Alternance de la main de contrôle : lissage et trajectoire repartent de zéro"""
+        from types import SimpleNamespace
+        import numpy as np
+        from pipeline import FramePacket, GesturePipeline
+        
+        hand = self.hand
+        
+        class AlternatingHands:
+            """Deux mains immobiles dont la plus grande change à chaque frame"""
+            def __init__(self):
+                self.calls = 0
+            
+            def process(self, image):
+                self.calls += 1
+                big_left = self.calls % 2 == 1
+                hands = [hand(0.2, size=0.2 if big_left else 0.1), hand(0.8, size=0.1 if big_left else 0.2)]
+                landmarks = [SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=0.0)
+                                                       for x, y, _ in points]) for points in hands]
+                handedness = [SimpleNamespace(classification=[SimpleNamespace(label=label)])
+                              for label in ("Right", "Left")]
+                return SimpleNamespace(multi_hand_landmarks=landmarks, multi_handedness=handedness)
+        
+        class MockController:
+            def execute_gesture_action(self, gesture, cooldown=1.0):
+                pass
+        
+        config = GestureConfig(max_num_hands=2, control_hand_policy="largest",
+                               landmark_smoothing=True, swipe_gestures=True)
+        detector = GestureDetector(config)
+        detector.hands = AlternatingHands()
+        pipeline = GesturePipeline(config, detector, MockController(), grabber=None)
+        frame = np.zeros((48, 64, 3), np.uint8)
+        positions, switches = [], 0
+        for index in range(8):
+            packet = pipeline._classify(pipeline._infer(FramePacket(index, frame, index / 30)))
+            positions.append(round(float(packet.landmarks[0, 0]), 4))
+            switches += packet.hand_switched
+        
+        # Sans remise à zéro, le filtre ferait glisser les positions d'une main vers l'autre
+        self.assertEqual(positions, [0.2, 0.8] * 4)
+        self.assertEqual(switches, 7)
+        self.assertEqual(pipeline.swipes.swipe_count, 0)
+
+class TestInferenceTuner(unittest.TestCase):
+    """Tests du réglage automatique de MediaPipe"""
+    
+    def test_steps_down_then_back_up(self):
+        """Trop lent : niveau plus léger ; marge confortable après le délai : retour au niveau complet"""
+        from inference_tuner import InferenceTuner, tuning_levels
+        
+        now = [0.0]
+        levels = tuning_levels(GestureConfig(model_complexity=1))
+        tuner = InferenceTuner(levels, budget_ms=30.0, window=5, settle=1, hold=10.0, clock=lambda: now[0])
+        self.assertEqual(tuner.current.name, "complet")
+        
+        changes = [tuner.record(40.0) for _ in range(6)]
+        self.assertEqual([level.name for level in changes if level], ["intermédiaire"])
+        self.assertEqual(tuner.current.model_complexity, 0)
+        
+        # 10 ms au niveau léger, 40 ms au complet : 40 ms prévus, on reste
+        for _ in range(30):
+            now[0] += 1.0
+            self.assertIsNone(tuner.record(10.0))
+        
+        # La machine se libère : 5 ms -> 20 ms prévus au niveau complet
+        changes = [tuner.record(5.0) for _ in range(5)]
+        self.assertEqual([level.name for level in changes if level], ["complet"])
+        self.assertEqual([switch[1:3] for switch in tuner.switches],
+                         [("complet", "intermédiaire"), ("intermédiaire", "complet")])
+    
+    def test_detector_rebuilds_hands(self):
+        """Le détecteur reconstruit Hands avec le niveau choisi"""
+        from types import SimpleNamespace
+        import numpy as np
+        
+        created = []
+        
+        def fake_hands(level=None):
+            if level is not None:
+                created.append(level)
+            return SimpleNamespace(process=lambda image: SimpleNamespace(multi_hand_landmarks=None),
+                                   close=lambda: None)
+        
+        detector = GestureDetector(GestureConfig(auto_tune_inference=True, inference_budget_ms=1e-6))
+        detector.hands = fake_hands()
+        detector._create_hands = fake_hands
+        frame = np.zeros((48, 64, 3), np.uint8)
+        for _ in range(60):
+            detector.get_landmarks(frame)
+        self.assertEqual([level.name for level in created], ["intermédiaire", "léger"])
+        self.assertEqual(detector.tuner.current.min_tracking_confidence, 0.4)
+
+class TestMotionGate(unittest.TestCase):
+    """Tests du filtrage des frames statiques"""
+    
+    def test_skips_static_scene_and_wakes_on_motion(self):
+        """Scène immobile (bruit capteur) sautée ; le mouvement réveille l'inférence sur la même frame"""
+        import cv2
+        import numpy as np
+        from motion_gate import MotionGate
+        
+        rng = np.random.default_rng(0)
+        background = np.tile(np.linspace(40, 160, 160, dtype=np.uint8), (120, 1))[:, :, None].repeat(3, axis=2)
+        
+        def noisy(frame):
+            return np.clip(frame + rng.normal(0, 3, frame.shape), 0, 255).astype(np.uint8)
+        
+        gate = MotionGate(linger=2, heartbeat=10.0)
+        opened = [gate.update(noisy(background), False, index / 30) for index in range(30)]
+        self.assertEqual(opened[:3], [True] * 3)
+        self.assertFalse(any(opened[4:]))
+        
+        moving = background.copy()
+        cv2.circle(moving, (80, 60), 25, (120, 160, 210), -1)
+        self.assertTrue(gate.update(noisy(moving), False, 1.0))
+        self.assertTrue(gate.motion)
+        
+        # Main suivie : jamais sautée, même immobile
+        self.assertTrue(all(gate.update(noisy(moving), True, 1.0 + index / 30) for index in range(10)))
+        self.assertGreater(gate.skip_fraction, 0.5)
+    
+    def test_heartbeat_and_pipeline(self):
+        """Inférence de contrôle périodique ; le pipeline n'appelle pas le détecteur sur les frames sautées"""
+        import numpy as np
+        from pipeline import FramePacket, GesturePipeline
+        
+        class CountingSource:
+            calls = 0
+            
+            def get_landmarks(self, frame):
+                self.calls += 1
+                return None
+        
+        source = CountingSource()
+        config = GestureConfig(motion_gating=True, motion_heartbeat=0.45, mirror_mode="landmarks")
+        pipeline = GesturePipeline(config, None, None, grabber=None, landmark_source=source)
+        frame = np.full((48, 64, 3), 90, np.uint8)
+        for index in range(60):
+            pipeline._infer(FramePacket(index, frame, index / 30))
+        
+        # Première frame + 5 frames de maintien, puis une inférence toutes les 14 frames (0.45 s)
+        self.assertEqual(source.calls, 6 + 3)
+        self.assertEqual(pipeline.motion_gate.skipped, 60 - source.calls)
+
+class TestActionDispatcher(unittest.TestCase):
+    """Tests de la file d'actions asynchrone"""
+    
+    def test_order_and_non_blocking_submit(self):
+        """submit() ne bloque pas ; les actions s'exécutent dans l'ordre de soumission"""
+        from action_dispatcher import ActionDispatcher
+        
+        executed = []
+        dispatcher = ActionDispatcher(lambda gesture, onset: time.sleep(0.03) or executed.append(gesture)).start()
+        gestures = ["fist", "open_hand", "fist", "fist", "open_hand"]
+        start = time.perf_counter()
+        for gesture in gestures:
+            self.assertTrue(dispatcher.submit(gesture))
+        self.assertLess(time.perf_counter() - start, 0.02)
+        
+        self.assertTrue(dispatcher.wait_idle(timeout=2.0))
+        dispatcher.stop()
+        self.assertEqual(executed, gestures)
+        self.assertEqual(dispatcher.timings["fist"].count, 3)
+        self.assertGreaterEqual(dispatcher.timings["fist"].mean_ms, 25)
+    
+    def test_coalescing(self):
+        """Slide absolue : seule la dernière attend encore ; deux bascules consécutives s'annulent"""
+        from threading import Event
+        from action_dispatcher import ActionDispatcher
+        from presentation_controller import PresentationController
+        
+        release, executed = Event(), []
+        
+        def handler(gesture, onset):
+            release.wait(2.0)
+            executed.append(gesture)
+        
+        dispatcher = ActionDispatcher(handler, groups=PresentationController.ACTION_GROUPS,
+                                      toggles=PresentationController.TOGGLE_ACTIONS).start()
+        dispatcher.submit("three")  # En cours d'exécution : jamais regroupée
+        while dispatcher.pending:
+            time.sleep(0.001)
+        for gesture in ["two", "fist", "four", "three", "three", "fist"]:
+            dispatcher.submit(gesture)
+        release.set()
+        self.assertTrue(dispatcher.wait_idle(timeout=2.0))
+        dispatcher.stop()
+        
+        self.assertEqual(executed, ["three", "fist", "four", "fist"])
+        self.assertEqual(dispatcher.coalesced, 3)
+    
+    def test_pipeline_async_actions(self):
+        """Le pipeline confie l'action au dispatcher et compte la latence jusqu'à son exécution"""
+        from pipeline import GesturePipeline
+        
+        class SlowController:
+            ACTION_GROUPS = {}
+            
+            def __init__(self):
+                self.actions = []
+            
+            def execute_gesture_action(self, gesture, cooldown=1.0):
+                time.sleep(0.1)
+                self.actions.append(gesture)
+        
+        controller = SlowController()
+        pipeline = GesturePipeline(GestureConfig(async_actions=True), None, controller, grabber=None)
+        pipeline.dispatcher.start()
+        start = time.perf_counter()
+        pipeline._execute("fist", time.time())
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertTrue(pipeline.dispatcher.wait_idle(timeout=2.0))
+        pipeline.dispatcher.stop()
+        
+        self.assertEqual(controller.actions, ["fist"])
+        self.assertEqual(pipeline.gesture_count, 1)
+        self.assertGreaterEqual(pipeline.action_latency.max_ms, 100)
+
+class TestGestureMapping(unittest.TestCase):
+    """Tests de la correspondance geste -> action"""
+
+    def test_shipped_file_matches_default(self):
+        """gestures.json décrit exactement la correspondance par défaut"""
+        from gesture_mapping import GestureMapping, default_mapping
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gestures.json")
+        mapping = GestureMapping.load(path)
+        self.assertEqual(mapping.bindings, default_mapping().bindings)
+        self.assertEqual(mapping.allowed, ("fist", "open_hand", "three", "swipe_left", "swipe_right"))
+        self.assertEqual(mapping.action_groups, PresentationController.ACTION_GROUPS)
+        self.assertEqual(mapping.toggles, PresentationController.TOGGLE_ACTIONS)
+
+    def test_validation(self):
+        """Forme courte acceptée ; geste, action, arguments ou champ inconnus refusés"""
+        from gesture_mapping import GestureMapping
+        mapping = GestureMapping.from_dict({"fist": "black_screen",
+                                            "two": {"action": "go_to_slide", "args": [7], "stability": 6,
+                                                    "cooldown": 0.5}})
+        self.assertEqual(mapping.labels, {"fist": "fist", "two": "two"})
+        self.assertEqual(mapping.stability, {"two": 6})
+        self.assertEqual(mapping.cooldowns, {"two": 0.5})
+        for data in ({"wave": "next_slide"}, {"fist": "reboot"}, {"two": "go_to_slide"},
+                     {"fist": {"action": "next_slide", "delay": 1}}, {"fist": {"action": "next_slide", "stability": 0}},
+                     {"fist": {"action": "next_slide", "stability": True}},
+                     {"fist": {"action": "next_slide", "cooldown": False}},
+                     {"swipe_left": {"action": "next_slide", "cooldown": 2.0}},
+                     {"swipe_right": {"action": "previous_slide", "stability": 3}}):
+            with self.assertRaises(ValueError):
+                GestureMapping.from_dict(data)
+
+    def test_hot_reload(self):
+        """Le pipeline recharge le fichier modifié ; un fichier invalide laisse l'ancienne version"""
+        import json
+        from input_backends import InputBackend
+        from pipeline import FramePacket, GesturePipeline
+
+        class RecordingBackend(InputBackend):
+            def __init__(self):
+                self.keys = []
+
+            def key_down(self, key):
+                self.keys.append(key)
+
+            def key_up(self, key):
+                pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "gestures.json")
+            with open(path, "w") as f:
+                json.dump({"fist": "next_slide"}, f)
+            backend = RecordingBackend()
+            controller = PresentationController(backend)
+            pipeline = GesturePipeline(GestureConfig(gesture_mapping_file=path), None, controller, grabber=None)
+            self.assertEqual(pipeline.allowed_gestures, ("fist",))
+
+            with open(path, "w") as f:
+                json.dump({"fist": "previous_slide", "four": {"action": "go_to_slide", "args": [4],
+                                                              "cooldown": 3.0}}, f)
+            pipeline._mapping_checked = 0.0
+            pipeline._classify(FramePacket(1, None, time.time()))
+            self.assertEqual(pipeline.allowed_gestures, ("fist", "four"))
+            self.assertEqual(pipeline.debouncer.cooldown_for("four"), 3.0)
+            controller.execute_gesture_action("fist", cooldown=0.0)
+            self.assertEqual(backend.keys, ["left"])
+
+            with open(path, "w") as f:
+                f.write("{")
+            pipeline._mapping_checked = 0.0
+            pipeline._classify(FramePacket(2, None, time.time()))
+            self.assertEqual(pipeline.mapping_file.errors, 1)
+            self.assertEqual(pipeline.allowed_gestures, ("fist", "four"))
 
 class TestPresentationController(unittest.TestCase):
     """Tests pour le contrôleur de présentation"""
@@ -88,6 +770,425 @@ class TestPresentationController(unittest.TestCase):
         self.controller.toggle_laser_mode()
         self.assertEqual(self.controller.current_mode, initial_mode)
 
+class TestNavigationCoalescing(unittest.TestCase):
+    """Tests du regroupement des rafales de navigation"""
+
+    def setUp(self):
+        from input_backends import InputBackend
+
+        class RecordingBackend(InputBackend):
+            def __init__(self):
+                self.keys = []
+
+            def key_down(self, key):
+                self.keys.append(key)
+
+            def key_up(self, key):
+                pass
+
+            def hotkey(self, *keys):
+                self.keys.append("+".join(keys))
+
+            def write(self, text):
+                self.keys.append(text)
+
+        self.backend = RecordingBackend()
+        self.controller = PresentationController(self.backend, coalesce_window=0.1)
+
+    def start_slideshow(self, slide_count=20):
+        """Diaporama lancé par le contrôleur : l'index de slide est sûr"""
+        self.controller.slide_count = slide_count
+        self.controller.smart_slideshow_toggle()
+        self.backend.keys.clear()
+
+    def test_burst_becomes_jump(self):
+        """Première touche immédiate ; le reste de la rafale devient un saut direct"""
+        self.start_slideshow()
+        self.controller.current_slide = 3
+        for gesture in ["fist"] * 6 + ["open_hand"]:
+            self.controller.execute_gesture_action(gesture, cooldown=0.0)
+        self.assertEqual(self.backend.keys, ["right"])
+
+        self.controller.flush_navigation()
+        self.assertEqual(self.backend.keys, ["right", "8", "enter"])
+        self.assertEqual(self.controller.current_slide, 8)
+        self.assertEqual((self.controller.coalesced, self.controller.jumps), (6, 1))
+
+    def test_jump_beyond_nine(self):
+        """Saut vers une slide à deux chiffres : un appui par chiffre"""
+        self.start_slideshow()
+        self.controller.current_slide = 9
+        for _ in range(5):
+            self.controller.execute_gesture_action("fist", cooldown=0.0)
+        self.controller.flush_navigation()
+        self.assertEqual(self.backend.keys, ["right", "14", "enter"])
+        self.assertEqual(self.controller.current_slide, 14)
+
+    def test_unknown_slide_uses_arrows(self):
+        """Diaporama lancé à la main (slide affichée inconnue) : la rafale part en flèches, jamais en saut"""
+        self.controller.is_in_slideshow = True
+        self.controller.slide_count = 20
+        for _ in range(3):
+            self.controller.execute_gesture_action("fist", cooldown=0.0)
+        self.controller.flush_navigation()
+        self.assertEqual(self.backend.keys, ["right"] * 3)
+        
+        # Recul au-delà de la première slide supposée : aucune borne appliquée
+        for _ in range(5):
+            self.controller.execute_gesture_action("open_hand", cooldown=0.0)
+        self.controller.flush_navigation()
+        self.assertEqual(self.backend.keys, ["right"] * 3 + ["left"] * 5)
+        self.assertEqual(self.controller.jumps, 0)
+
+    def test_window_end_and_ordering(self):
+        """Petit déplacement en flèches à la fin de la fenêtre ; une autre action passe après la navigation"""
+        for gesture in ["fist", "fist", "fist"]:
+            self.controller.execute_gesture_action(gesture, cooldown=0.0)
+        time.sleep(0.3)
+        self.assertEqual(self.backend.keys, ["right"] * 3)
+        self.assertEqual(self.controller.current_slide, 4)
+
+        # Aller-retour dans la rafale : déplacement net nul, aucune touche
+        for gesture in ["fist", "open_hand", "fist", "three"]:
+            self.controller.execute_gesture_action(gesture, cooldown=0.0)
+        self.assertEqual(self.backend.keys, ["right"] * 4 + ["f5"])
+        self.assertEqual(self.controller.current_slide, 1)
+        self.assertEqual(self.controller.coalesced, 4)
+
+class TestInputBackends(unittest.TestCase):
+    """Tests des backends d'injection de touches"""
+
+    def test_socket_backend_delivers_actions_in_order(self):
+        """Les actions du contrôleur arrivent au récepteur local, dans l'ordre"""
+        from input_backends import KeyEventServer, SocketBackend
+        server = KeyEventServer()
+        backend = SocketBackend(server.address)
+        controller = PresentationController(backend)
+        try:
+            controller.next_slide()
+            controller.smart_slideshow_toggle()
+            controller.go_to_slide(4)
+            controller.smart_slideshow_toggle()
+            controller.previous_slide()
+            self.assertTrue(server.wait_for(6))
+        finally:
+            backend.close()
+            server.close()
+
+        events = [(command, args) for _, _, command, args in server.events]
+        self.assertEqual(events, [("press", ("right",)), ("press", ("f5",)), ("write", ("4",)),
+                                  ("press", ("enter",)), ("press", ("escape",)), ("press", ("left",))])
+        self.assertEqual([sequence for _, sequence, _, _ in server.events], list(range(1, 7)))
+
+    def test_unknown_backend(self):
+        """Un nom de backend inconnu est refusé"""
+        from input_backends import create_backend
+        with self.assertRaises(ValueError):
+            create_backend("clavier")
+
+class TestFrameGrabber(unittest.TestCase):
+    """Tests pour le thread de capture"""
+    
+    class MockCapture:
+        """Caméra simulée retournant des entiers croissants"""
+        def __init__(self, count):
+            self.count = count
+            self.index = 0
+        
+        def read(self):
+            if self.index >= self.count:
+                return False, None
+            self.index += 1
+            return True, self.index
+    
+    def test_keeps_only_latest_frame(self):
+        """Les frames non consommées sont écrasées et comptées comme perdues"""
+        grabber = FrameGrabber(self.MockCapture(50)).start()
+        grabber._thread.join(timeout=2.0)
+        
+        ret, frame = grabber.read()
+        self.assertTrue(ret)
+        self.assertEqual(frame, 50)
+        self.assertEqual(grabber.get_stats()["dropped"], 49)
+        
+        # Plus de nouvelle frame : la lecture échoue
+        ret, frame = grabber.read(timeout=0.1)
+        self.assertFalse(ret)
+        grabber.stop()
+    
+    def test_reuse_buffers(self):
+        """En mode tampons réutilisés, la capture n'alloue plus de nouvelles frames"""
+        source = SyntheticSource(frame_count=30, width=32, height=24, fps=300, realtime=True)
+        grabber = FrameGrabber(source, reuse_buffers=True).start()
+        frames = []
+        while True:
+            ret, frame = grabber.read(timeout=0.5)
+            if not ret:
+                break
+            frames.append(frame)
+        grabber.stop()
+        
+        # Première frame allouée par la source, puis trois tampons en rotation
+        self.assertGreater(len(frames), 10)
+        self.assertLessEqual(len({id(frame) for frame in frames}), 4)
+    
+    def test_frame_rate_limit(self):
+        """Cadence réduite respectée ; le retour au rythme normal interrompt l'attente"""
+        source = SyntheticSource(frame_count=0, width=32, height=24)
+        grabber = FrameGrabber(source)
+        grabber.set_frame_rate(20)
+        grabber.start()
+        time.sleep(0.5)
+        limited = grabber.get_stats()["captured"]
+        self.assertLessEqual(limited, 12)
+        
+        grabber.set_frame_rate(None)
+        time.sleep(0.1)
+        self.assertGreater(grabber.get_stats()["captured"] - limited, 50)
+        grabber.stop()
+        
+        # La source ne reçoit la cadence que depuis le thread de capture, entre deux lectures
+        from threading import current_thread
+        calls = []
+        source.set = lambda prop_id, value: calls.append((current_thread(), value)) or True
+        grabber.set_frame_rate(10)
+        self.assertEqual(calls, [])
+        grabber.start()
+        time.sleep(0.05)
+        grabber.stop()
+        self.assertEqual([value for _, value in calls], [10])
+        self.assertIsNot(calls[0][0], current_thread())
+
+class TestIdleController(unittest.TestCase):
+    """Tests du mode veille"""
+    
+    def test_enters_and_leaves_idle(self):
+        """Veille après idle_after secondes sans main, retour immédiat à la première main"""
+        from idle_mode import IdleController
+        
+        class MockGrabber:
+            rates = []
+            
+            def set_frame_rate(self, fps):
+                self.rates.append(fps)
+        
+        now, cpu = [0.0], [0.0]
+        grabber = MockGrabber()
+        idle = IdleController(grabber, idle_after=2.0, idle_fps=5.0,
+                              clock=lambda: now[0], cpu_clock=lambda: cpu[0])
+        
+        # 4 s actives (main visible puis absente) à 50% CPU, 6 s de veille à 5% CPU
+        for step in range(100):
+            now[0], cpu[0] = step * 0.04, step * 0.02
+            idle.update(step < 50, now[0])
+        self.assertTrue(idle.idle)
+        self.assertEqual(grabber.rates, [5.0])
+        now[0] = 4.0 + 6.0
+        cpu[0] = 2.0 + 0.3
+        self.assertTrue(idle.update(True, now[0]))
+        self.assertEqual(grabber.rates, [5.0, None])
+        
+        stats = idle.stats(now[0])
+        self.assertAlmostEqual(stats["idle_fraction"], 0.6, places=2)
+        self.assertAlmostEqual(stats["active_cpu"], 0.5, places=2)
+        self.assertAlmostEqual(stats["idle_cpu"], 0.05, places=2)
+        self.assertAlmostEqual(stats["cpu_saved"], 0.6 * 0.9, places=2)
+
+class TestFrameSources(unittest.TestCase):
+    """Tests pour les sources de frames sans caméra"""
+    
+    def test_synthetic_source(self):
+        """La source synthétique produit exactement N frames"""
+        source = open_frame_source("synthetic:5")
+        self.assertIsInstance(source, SyntheticSource)
+        frames = []
+        while True:
+            ret, frame = source.read()
+            if not ret:
+                break
+            frames.append(frame)
+        self.assertEqual(len(frames), 5)
+        self.assertEqual(frames[0].shape, (480, 640, 3))
+    
+    def test_realtime_pacing(self):
+        """En mode temps réel, la lecture respecte le FPS nominal"""
+        source = SyntheticSource(frame_count=4, width=32, height=24, fps=50, realtime=True)
+        start = time.perf_counter()
+        while source.read()[0]:
+            pass
+        self.assertGreaterEqual(time.perf_counter() - start, 3 / 50 * 0.9)
+    
+    def test_image_sequence_source(self):
+        """Un dossier d'images est lu dans l'ordre"""
+        import cv2
+        import numpy as np
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(3):
+                cv2.imwrite(os.path.join(directory, f"{i:03d}.png"), np.full((8, 8, 3), i * 50, np.uint8))
+            source = open_frame_source(directory)
+            self.assertIsInstance(source, ImageSequenceSource)
+            values = []
+            while True:
+                ret, frame = source.read()
+                if not ret:
+                    break
+                values.append(int(frame[0, 0, 0]))
+            self.assertEqual(values, [0, 50, 100])
+
+class TestInferenceWorker(unittest.TestCase):
+    """Tests pour le processus d'inférence isolé"""
+    
+    def test_worker_roundtrip(self):
+        """Une frame transite par la mémoire partagée et les ressources sont libérées"""
+        import numpy as np
+        from inference_worker import InferenceWorker
+        
+        worker = InferenceWorker(GestureConfig(), slot_count=2).start((120, 160, 3))
+        try:
+            self.assertIsNone(worker.get_landmarks(np.zeros((120, 160, 3), np.uint8), timeout=10.0))
+            self.assertEqual(worker.frames_submitted, 1)
+            self.assertEqual(sorted(worker.free_slots), [0, 1])
+        finally:
+            worker.stop()
+        self.assertIsNone(worker.process)
+        self.assertIsNone(worker.shm)
+    
+    def test_timed_out_requests_release_slots(self):
+        """Le résultat d'une requête abandonnée libère son emplacement à l'appel suivant"""
+        import numpy as np
+        from inference_worker import InferenceWorker
+        
+        worker = InferenceWorker(GestureConfig(), slot_count=1).start((120, 160, 3))
+        frame = np.zeros((120, 160, 3), np.uint8)
+        try:
+            self.assertIsNone(worker.get_landmarks(frame, timeout=1e-6))
+            self.assertEqual(worker.free_slots, [])
+            for _ in range(3):
+                worker.get_landmarks(frame, timeout=10.0)
+            self.assertEqual(worker.frames_submitted, 4)
+            self.assertEqual(worker.frames_rejected, 0)
+            self.assertEqual(worker.free_slots, [0])
+        finally:
+            worker.stop()
+
+class TestPipeline(unittest.TestCase):
+    """Tests pour le pipeline en étapes concurrentes"""
+    
+    def test_bounded_queue_policies(self):
+        """Les politiques de perte gardent les entrées attendues"""
+        from pipeline import BoundedQueue
+        
+        oldest = BoundedQueue(2, "drop_oldest")
+        newest = BoundedQueue(2, "drop_newest")
+        for i in range(4):
+            oldest.put(i)
+            newest.put(i)
+        self.assertEqual([oldest.get(), oldest.get()], [2, 3])
+        self.assertEqual([newest.get(), newest.get()], [0, 1])
+        self.assertEqual((oldest.dropped, newest.dropped), (2, 2))
+        self.assertIsNone(oldest.get(timeout=0.01))
+        self.assertRaises(ValueError, BoundedQueue, 2, "random")
+    
+    def test_pipeline_end_to_end(self):
+        """Un geste stable traverse toutes les étapes et déclenche une seule action"""
+        from threading import Event
+        from pipeline import GesturePipeline
+        
+        class MockDetector:
+            gesture_confidence = 1.0
+            
+            def get_landmarks(self, frame):
+                return [object()] * 21
+            
+            def detect_gesture(self, landmarks):
+                return "fist"
+        
+        class MockController:
+            def __init__(self):
+                self.actions = []
+            
+            def execute_gesture_action(self, gesture, cooldown=1.0):
+                self.actions.append(gesture)
+        
+        rendered = []
+        stopped = Event()
+        controller = MockController()
+        config = GestureConfig(gesture_cooldown=60, pipeline_drop_policy="block")
+        grabber = FrameGrabber(SyntheticSource(frame_count=20, width=64, height=48, fps=200, realtime=True)).start()
+        pipeline = GesturePipeline(config, MockDetector(), controller, grabber,
+                                   renderer=lambda packet: rendered.append(packet.gesture),
+                                   on_stop=stopped.set).start()
+        
+        self.assertTrue(stopped.wait(timeout=5.0))
+        pipeline.stop()
+        grabber.stop()
+        
+        self.assertEqual(controller.actions, ["fist"])
+        self.assertIn("fist", rendered)
+        self.assertEqual(set(pipeline.get_stats()), {"capture", "inference", "classification", "rendu"})
+        self.assertEqual(pipeline.action_latency.count, 1)
+    
+    def test_reused_capture_buffer_not_rendered(self):
+        """Tampons réutilisés + miroir des landmarks : l'aperçu ne dépend plus du tampon du grabber"""
+        import numpy as np
+        from pipeline import FramePacket, GesturePipeline
+        
+        class MockSource:
+            def get_landmarks(self, frame):
+                return None
+        
+        rendered = []
+        config = GestureConfig(reuse_frame_buffers=True, mirror_mode="landmarks")
+        pipeline = GesturePipeline(config, None, None, grabber=None, landmark_source=MockSource(),
+                                   renderer=lambda packet: rendered.append(packet.frame.copy()))
+        capture_buffer = np.zeros((4, 6, 3), np.uint8)
+        capture_buffer[:, 0] = 255  # Colonne gauche de la caméra
+        packet = pipeline._infer(FramePacket(1, capture_buffer, 0.0))
+        capture_buffer[:] = 7  # Le grabber réécrit son tampon pour la frame suivante
+        pipeline._render(packet)
+        
+        self.assertIsNot(packet.frame, capture_buffer)
+        self.assertEqual(int(rendered[0][0, -1, 0]), 255)  # Retournée une seule fois
+        self.assertEqual(int(rendered[0][0, 0, 0]), 0)
+    
+    def test_adaptive_stability(self):
+        """Un geste net est validé en moins de frames qu'un geste ambigu"""
+        from pipeline import FramePacket, GesturePipeline
+        from utils import LatencyHistogram
+        
+        class ConfidenceDetector:
+            gesture_confidence = 1.0
+            
+            def detect_gesture(self, landmarks):
+                return "fist"
+        
+        class MockController:
+            def execute_gesture_action(self, gesture, cooldown=1.0):
+                pass
+        
+        def frames_until_action(confidence):
+            detector = ConfidenceDetector()
+            detector.gesture_confidence = confidence
+            config = GestureConfig(adaptive_stability=True, min_stability_frames=2, max_stability_frames=8)
+            pipeline = GesturePipeline(config, detector, MockController(), grabber=None)
+            for frame_id in range(1, 20):
+                packet = FramePacket(frame_id, None, time.time())
+                packet.landmarks = [object()] * 21
+                pipeline._classify(packet)
+                if pipeline.gesture_count:
+                    return frame_id
+        
+        self.assertEqual(frames_until_action(1.0), 2)
+        self.assertEqual(frames_until_action(0.0), 8)
+        self.assertEqual(GesturePipeline(GestureConfig(), None, None, None).required_stability_frames(1.0), 5)
+        
+        histogram = LatencyHistogram(bin_ms=10, bin_count=5)
+        for latency in (5, 15, 18, 200):
+            histogram.record(latency)
+        self.assertEqual(histogram.counts, [1, 2, 0, 0, 0, 1])
+        self.assertEqual(histogram.percentile(0.5), 20)
+        self.assertEqual(histogram.percentile(1.0), 200)
+
 class TestIntegration(unittest.TestCase):
     """Tests d'intégration"""
     
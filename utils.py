@@ -111,6 +111,84 @@ class PerformanceMonitor:
             "max_frame_time": max(self.frame_times) * 1000,  # en ms
         }
 
+class FrameBufferRing:
+    """Anneau de tampons préalloués, réutilisés de frame en frame
+
+    Le nombre de tampons doit couvrir toutes les frames encore en cours
+    d'utilisation (files du pipeline comprises) : un tampon n'est réécrit
+    qu'après un tour complet de l'anneau.
+    """
+    
+    def __init__(self, size: int = 3):
+        self.size = max(1, size)
+        self.buffers = []
+        self.index = 0
+    
+    def next(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Retourne le prochain tampon (réalloué seulement si la taille change)"""
+        shape = tuple(shape)
+        if not self.buffers or self.buffers[0].shape != shape or self.buffers[0].dtype != dtype:
+            self.buffers = [np.empty(shape, dtype=dtype) for _ in range(self.size)]
+            self.index = 0
+        buffer = self.buffers[self.index]
+        self.index = (self.index + 1) % self.size
+        return buffer
+
+class LatencyHistogram:
+    """Histogramme de latences (ms) à classes fixes, sans stocker les mesures"""
+    
+    def __init__(self, bin_ms: float = 25.0, bin_count: int = 20):
+        self.bin_ms = bin_ms
+        self.counts = [0] * (bin_count + 1)  # Dernière classe : au-delà de bin_ms * bin_count
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def record(self, latency_ms: float):
+        """Ajoute une mesure"""
+        index = min(int(max(latency_ms, 0.0) // self.bin_ms), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+    
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+    
+    def percentile(self, fraction: float) -> float:
+        """Borne haute de la classe contenant le percentile demandé (0-1)"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                if index == len(self.counts) - 1:
+                    return self.max_ms
+                return min((index + 1) * self.bin_ms, self.max_ms)
+        return self.max_ms
+    
+    def summary(self) -> str:
+        """Résumé sur une ligne : nombre, moyenne, p50, p95"""
+        if not self.count:
+            return "aucune mesure"
+        return (f"{self.count} mesures | moyenne {self.mean_ms:.0f} ms | "
+                f"p50 ≤{self.percentile(0.5):.0f} ms | p95 ≤{self.percentile(0.95):.0f} ms")
+    
+    def format(self, width: int = 30) -> str:
+        """Histogramme texte, une ligne par classe non vide"""
+        peak = max(self.counts) or 1
+        lines = []
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            low = index * self.bin_ms
+            label = f"≥{low:.0f} ms" if index == len(self.counts) - 1 else f"{low:5.0f}-{low + self.bin_ms:.0f} ms"
+            lines.append(f"{label:>14} | {'█' * max(1, round(width * count / peak)):<{width}} {count}")
+        return "\n".join(lines)
+
 class ColorPalette:
     """Palette de couleurs pour l'interface"""
     